@@ -3,40 +3,79 @@ FastAPI Main Application for Project NEXT Intelligence
 REST API endpoints and background task management
 """
 
-from fastapi import FastAPI, BackgroundTasks, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, BackgroundTasks, HTTPException, WebSocket, WebSocketDisconnect, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any, Set
 import uuid
 import logging
 from datetime import datetime
+from contextlib import asynccontextmanager
 import asyncio
+import hmac
 import json
+import threading
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import API_HOST, API_PORT, CORS_ORIGINS, LOG_FILE, TARGET_DOMAIN
-from scrapers.discovery_engine import DiscoveryOrchestrator
+from config import (
+    API_HOST, API_PORT, CORS_ORIGINS, TARGET_DOMAIN,
+    MONITORED_DOMAINS, ENABLE_EVIDENCE_SCREENSHOTS, ENABLE_PASTE_STORE,
+    ENABLE_EXPOSURE_FILTER, ENABLE_DB_SINK, ENABLE_RESULT_LOG, ADMIN_TOKEN,
+    PROFILE_MAX_SECONDS, ENABLE_MONITOR, HIGH_PRIORITY_SCORE
+)
+from scrapers import get_scraper
+from scrapers.log_setup import setup_logging
+from scrapers.source_registry import get_source_registry
+from scrapers.frontier import get_yield_history
+from scrapers.email_index import get_email_index
+from scrapers.exposure_filter import get_exposure_filter
+from scrapers.findings import findings_to_dicts
+from scrapers.exporters import EXPORT_FORMATS, export
+from scrapers.result_log import LazyScanResults, get_result_log
+from scrapers.metrics import (
+    ACTIVE_SCANS, QUEUE_DEPTH, WEBSOCKET_CLIENTS, METRICS_CONTENT_TYPE, render_metrics
+)
+from scrapers.tracing import span, profile
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Rebuild the scan list from the result log index (result bodies load lazily)
+    and start the feed monitor when ENABLE_MONITOR is set
+    """
+    log = None
+    if ENABLE_RESULT_LOG:
+        log = get_result_log()
+        scan_results.attach(log)
+        for scan_id, scan in log.scans().items():
+            active_scans.setdefault(scan_id, scan)
+        logger.info(f"✓ Loaded {len(log)} scans from the result log")
+    if ENABLE_MONITOR:
+        get_feed_monitor().start()
+    yield
+    if feed_monitor is not None:
+        # Off the loop: a poll may be waiting for its scan to be recorded on it
+        await asyncio.to_thread(feed_monitor.stop)
+    if log is not None:
+        log.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Project NEXT Intelligence API",
     description="OSINT platform for detecting leaked Universitas Indonesia credentials",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -48,9 +87,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage (replace with database in production)
+# In-memory storage; completed scans are also kept in the result log
 active_scans: Dict[str, Dict] = {}
-scan_results: Dict[str, Dict] = {}
+scan_results = LazyScanResults()
+
 
 # WebSocket connection manager
 class ConnectionManager:
@@ -82,6 +122,7 @@ class ConnectionManager:
                 self.active_connections.remove(conn)
 
 manager = ConnectionManager()
+WEBSOCKET_CLIENTS.set_function(lambda: len(manager.active_connections))
 
 
 # Pydantic models
@@ -123,6 +164,148 @@ class ScanResult(BaseModel):
     timestamp: str
 
 
+def make_orchestrator():
+    """Discovery orchestrator wired to the stores enabled in config"""
+    # Scan-time backends are imported on first use, keeping them out of API startup
+    screenshot_queue = paste_store = None
+    if ENABLE_EVIDENCE_SCREENSHOTS:
+        from scrapers.evidence_screenshots import get_screenshot_queue
+        screenshot_queue = get_screenshot_queue()
+    if ENABLE_PASTE_STORE:
+        from scrapers.paste_store import get_paste_store
+        paste_store = get_paste_store()
+    return get_scraper('clearnet')(
+        screenshot_queue=screenshot_queue,
+        paste_store=paste_store,
+        exposure_filter=get_exposure_filter() if ENABLE_EXPOSURE_FILTER else None,
+        on_screenshot=record_evidence
+    )
+
+
+def get_sink():
+    """The database sink, or None when it is disabled or cannot be opened"""
+    if not ENABLE_DB_SINK:
+        return None
+    try:
+        from scrapers.db_sink import get_db_sink
+        return get_db_sink()
+    except Exception as e:
+        logger.error(f"✗ Database sink unavailable: {e}")
+        return None
+
+
+def to_sink(scan_id: str, write: Callable, *args, **kwargs):
+    """
+    Run one database sink write (blocking)
+    
+    Postgres is an extra output: a failed write is logged and the scan and
+    its local persistence go ahead.
+    """
+    try:
+        write(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"✗ Database sink {getattr(write, '__name__', 'write')} failed for scan {scan_id}: {e}")
+
+
+# Evidence captures usually finish after their scan was stored; the stored
+# findings are updated when they do (paste URL -> IDs of the scans waiting for it)
+pending_evidence: Dict[str, Set[str]] = {}
+evidence_lock = threading.Lock()
+
+
+def record_evidence(url: str, path: str):
+    """Attach a finished evidence capture (None if it failed) to the stored findings of its paste"""
+    with evidence_lock:
+        waiting = pending_evidence.pop(url, set())
+        if not path:
+            return
+        sink = get_sink()
+        for scan_id in waiting:
+            try:
+                scan_results.amend(scan_id, url, screenshot=path)
+            except Exception as e:
+                logger.error(f"Could not attach screenshot of {url} to scan {scan_id}: {e}")
+            if sink:
+                to_sink(scan_id, sink.record_screenshot, scan_id, url, path)
+
+
+def _awaiting_evidence(results: List) -> List:
+    """High-priority findings whose screenshot may still be captured"""
+    if not ENABLE_EVIDENCE_SCREENSHOTS:
+        return []
+    return [
+        result for result in results
+        if result.get('screenshot') is None and result['relevance_score'] >= HIGH_PRIORITY_SCORE
+    ]
+
+
+def store_scan(scan_id: str, results: Dict, sink, scan_options: Dict, scan: Dict):
+    """
+    Store the results of a finished scan (blocking; run off the event loop)
+    
+    Args:
+        scan_id: Scan identifier
+        results: Packaged discovery results
+        sink: ScanResultSink, or None when the database sink is disabled
+        scan_options: Scan URLs and options, as recorded in the database
+        scan: Final status of the scan, as logged with its results
+    """
+    # Captures finishing meanwhile wait for the lock, then amend what was stored
+    with evidence_lock:
+        awaiting = _awaiting_evidence(results['results'])
+        with span('store_results', total_results=len(results['results'])):
+            if ENABLE_EXPOSURE_FILTER:
+                # Recorded only now, so a scan that fails never uses up an email's novelty
+                results['summary']['new_target_emails'] = \
+                    get_exposure_filter().record_findings(results['results'])
+            scan_results[scan_id] = results
+            get_source_registry().save()
+            get_yield_history().save()
+            get_email_index().add_scan(scan_id, results['results'])
+            if ENABLE_EXPOSURE_FILTER:
+                get_exposure_filter().save()
+            if sink:
+                to_sink(scan_id, sink.add_many, scan_id, results['results'])
+                to_sink(scan_id, sink.flush)
+                to_sink(scan_id, sink.record_scan, scan_id, status='completed', progress=1.0,
+                        total_results=len(results['results']), **scan_options)
+        try:
+            scan_results.persist(scan_id, scan)
+        except OSError as log_error:
+            logger.error(f"Could not log results of scan {scan_id}: {log_error}")
+        
+        if awaiting:
+            from scrapers.evidence_screenshots import get_screenshot_queue
+            screenshots = get_screenshot_queue()
+            for result in awaiting:
+                # Captured while storing, or still in flight: amend once it lands
+                if result.get('screenshot') is not None or screenshots.is_pending(result['url']):
+                    pending_evidence.setdefault(result['url'], set()).add(scan_id)
+
+
+async def complete_scan(scan_id: str, results: Dict, sink, scan_options: Dict):
+    """
+    Store the results of a finished scan on a worker thread and mark it completed
+    
+    Args:
+        scan_id: Scan identifier (already in active_scans)
+        results: Packaged discovery results
+        sink: ScanResultSink, or None when the database sink is disabled
+        scan_options: Scan URLs and options, as recorded in the database
+    """
+    scan = dict(active_scans[scan_id])
+    scan.update({
+        'status': 'completed',
+        'progress': 1.0,
+        'total_results': len(results['results']),
+        'completed_at': datetime.now().isoformat()
+    })
+    await asyncio.to_thread(store_scan, scan_id, results, sink, scan_options, scan)
+    
+    # Update final status
+    active_scans[scan_id].update(scan)
+
+
 # Background task function
 async def run_scan_task(scan_id: str, scan_request: ScanRequest):
     """
@@ -132,74 +315,166 @@ async def run_scan_task(scan_id: str, scan_request: ScanRequest):
         scan_id: Unique identifier for this scan
         scan_request: Scan configuration
     """
-    try:
-        logger.info(f"Starting scan {scan_id}")
+    sink = get_sink()
+    scan_options = {
+        'urls': scan_request.urls,
+        'enable_clearnet': scan_request.enable_clearnet,
+        'enable_darknet': scan_request.enable_darknet,
+        'crawl_authors': scan_request.crawl_authors
+    }
+    QUEUE_DEPTH.labels('scans').dec()
+    ACTIVE_SCANS.inc()
+    with span('run_scan_task', scan_id=scan_id):
+        try:
+            logger.info(f"Starting scan {scan_id}")
         
-        # Update status
-        active_scans[scan_id]['status'] = 'running'
-        active_scans[scan_id]['progress'] = 0.1
+            # Update status
+            active_scans[scan_id]['status'] = 'running'
+            active_scans[scan_id]['progress'] = 0.1
+            if sink:
+                await asyncio.to_thread(to_sink, scan_id, sink.record_scan, scan_id,
+                                        status='running', progress=0.1, **scan_options)
         
-        # Broadcast status update
-        await manager.broadcast({
-            'type': 'scan_started',
-            'scan_id': scan_id,
-            'timestamp': datetime.now().isoformat()
-        })
+            # Broadcast status update
+            await manager.broadcast({
+                'type': 'scan_started',
+                'scan_id': scan_id,
+                'timestamp': datetime.now().isoformat()
+            })
         
-        # Initialize discovery orchestrator
-        orchestrator = DiscoveryOrchestrator()
+            # Initialize discovery orchestrator
+            orchestrator = make_orchestrator()
         
-        # Update progress
-        active_scans[scan_id]['progress'] = 0.3
-        await manager.broadcast({
-            'type': 'scan_progress',
-            'scan_id': scan_id,
-            'progress': 0.3
-        })
+            # Update progress
+            active_scans[scan_id]['progress'] = 0.3
+            await manager.broadcast({
+                'type': 'scan_progress',
+                'scan_id': scan_id,
+                'progress': 0.3
+            })
         
-        # Run discovery
-        results = orchestrator.run_full_discovery(
-            clearnet_urls=scan_request.urls,
-            enable_clearnet=scan_request.enable_clearnet,
-            enable_darknet=scan_request.enable_darknet,
-            crawl_authors=scan_request.crawl_authors
-        )
+            # Run discovery (on a worker thread, so the API stays responsive during scans)
+            with span('discovery'):
+                results = await asyncio.to_thread(
+                    orchestrator.run_full_discovery,
+                    clearnet_urls=scan_request.urls,
+                    enable_clearnet=scan_request.enable_clearnet,
+                    enable_darknet=scan_request.enable_darknet,
+                    crawl_authors=scan_request.crawl_authors
+                )
         
-        # Update progress
-        active_scans[scan_id]['progress'] = 0.9
+            # Update progress
+            active_scans[scan_id]['progress'] = 0.9
         
-        # Store results
-        scan_results[scan_id] = results
+            # Store results and mark the scan completed
+            await complete_scan(scan_id, results, sink, scan_options)
         
-        # Update final status
-        active_scans[scan_id]['status'] = 'completed'
-        active_scans[scan_id]['progress'] = 1.0
-        active_scans[scan_id]['total_results'] = len(results['results'])
-        active_scans[scan_id]['completed_at'] = datetime.now().isoformat()
+            logger.info(f"Scan {scan_id} completed with {len(results['results'])} results")
         
-        logger.info(f"Scan {scan_id} completed with {len(results['results'])} results")
+            # Broadcast completion
+            await manager.broadcast({
+                'type': 'scan_completed',
+                'scan_id': scan_id,
+                'total_results': len(results['results']),
+                'new_target_emails': results['summary'].get('new_target_emails', 0),
+                'timestamp': datetime.now().isoformat()
+            })
         
-        # Broadcast completion
-        await manager.broadcast({
-            'type': 'scan_completed',
-            'scan_id': scan_id,
-            'total_results': len(results['results']),
-            'timestamp': datetime.now().isoformat()
-        })
+        except Exception as e:
+            logger.error(f"Error in scan {scan_id}: {str(e)}")
+            active_scans[scan_id]['status'] = 'failed'
+            active_scans[scan_id]['error'] = str(e)
+            active_scans[scan_id]['completed_at'] = datetime.now().isoformat()
+            if sink:
+                await asyncio.to_thread(to_sink, scan_id, sink.record_scan, scan_id,
+                                        status='failed', error=str(e), **scan_options)
         
-    except Exception as e:
-        logger.error(f"Error in scan {scan_id}: {str(e)}")
-        active_scans[scan_id]['status'] = 'failed'
-        active_scans[scan_id]['error'] = str(e)
-        active_scans[scan_id]['completed_at'] = datetime.now().isoformat()
+            # Broadcast error
+            await manager.broadcast({
+                'type': 'scan_failed',
+                'scan_id': scan_id,
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            })
+        finally:
+            ACTIVE_SCANS.dec()
+
+
+# Continuous feed monitor (scrapers/monitor.py), created on first use
+feed_monitor = None
+
+
+def record_monitor_scan(source: str, results: Dict, loop: asyncio.AbstractEventLoop) -> str:
+    """
+    Store the relevant pastes of one monitor poll as a completed scan
+    
+    Storage runs on the calling polling thread; only registering the scan
+    and notifying clients is handed to the event loop.
+    
+    Args:
+        source: Monitored feed the pastes came from
+        results: Packaged results of the poll
+        loop: Event loop serving the API
         
-        # Broadcast error
-        await manager.broadcast({
-            'type': 'scan_failed',
-            'scan_id': scan_id,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        })
+    Returns:
+        ID of the recorded scan
+    """
+    scan_id = str(uuid.uuid4())
+    urls = [result['url'] for result in results['results']]
+    scan_options = {
+        'urls': urls,
+        'enable_clearnet': True,
+        'enable_darknet': False,
+        'crawl_authors': False
+    }
+    now = datetime.now().isoformat()
+    scan = {
+        'scan_id': scan_id,
+        'status': 'completed',
+        'progress': 1.0,
+        'total_results': len(urls),
+        'created_at': now,
+        'completed_at': now,
+        'urls': urls,
+        'options': {'monitor_source': source}
+    }
+    sink = get_sink()
+    if sink:
+        to_sink(scan_id, sink.record_scan, scan_id, status='running', progress=0.9, **scan_options)
+    
+    store_scan(scan_id, results, sink, scan_options, scan)
+    logger.info(f"Monitor scan {scan_id} recorded {len(urls)} results from {source}")
+    
+    asyncio.run_coroutine_threadsafe(publish_monitor_scan(source, scan, results), loop).result()
+    return scan_id
+
+
+async def publish_monitor_scan(source: str, scan: Dict, results: Dict):
+    """Register a stored monitor scan and notify connected clients"""
+    active_scans[scan['scan_id']] = scan
+    await manager.broadcast({
+        'type': 'monitor_findings',
+        'scan_id': scan['scan_id'],
+        'source': source,
+        'total_results': scan['total_results'],
+        'new_target_emails': results['summary'].get('new_target_emails', 0),
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+def get_feed_monitor():
+    """Return the feed monitor, feeding its findings into the scan pipeline (call on the event loop)"""
+    global feed_monitor
+    if feed_monitor is None:
+        from scrapers.monitor import get_monitor
+        loop = asyncio.get_running_loop()
+        
+        def on_results(source: str, results: Dict):
+            # Called on a polling thread, which also does the storing
+            record_monitor_scan(source, results, loop)
+        
+        feed_monitor = get_monitor(orchestrator_factory=make_orchestrator, on_results=on_results)
+    return feed_monitor
 
 
 # API Endpoints
@@ -210,7 +485,8 @@ async def root():
         "name": "Project NEXT Intelligence API",
         "version": "1.0.0",
         "status": "operational",
-        "target_domain": TARGET_DOMAIN
+        "target_domain": TARGET_DOMAIN,
+        "monitored_domains": MONITORED_DOMAINS
     }
 
 
@@ -250,6 +526,7 @@ async def start_scan(scan_request: ScanRequest, background_tasks: BackgroundTask
     
     # Add to background tasks
     background_tasks.add_task(run_scan_task, scan_id, scan_request)
+    QUEUE_DEPTH.labels('scans').inc()
     
     logger.info(f"Created new scan: {scan_id}")
     
@@ -309,6 +586,23 @@ async def get_scan_status(scan_id: str):
     )
 
 
+def _completed_scan_results(scan_id: str) -> Dict:
+    """Stored results of a completed scan, or the matching HTTP error"""
+    if scan_id not in active_scans:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    
+    if active_scans[scan_id]['status'] != 'completed':
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Scan is not completed yet. Current status: {active_scans[scan_id]['status']}"
+        )
+    
+    if scan_id not in scan_results:
+        raise HTTPException(status_code=404, detail="Results not found")
+    
+    return scan_results[scan_id]
+
+
 @app.get("/api/results/{scan_id}")
 async def get_scan_results(scan_id: str):
     """
@@ -320,19 +614,122 @@ async def get_scan_results(scan_id: str):
     Returns:
         Scan results with metadata and discovered items
     """
-    if scan_id not in active_scans:
-        raise HTTPException(status_code=404, detail="Scan not found")
-    
-    if active_scans[scan_id]['status'] != 'completed':
+    # Findings are kept compact in memory and only expanded for the response
+    results = _completed_scan_results(scan_id)
+    return {**results, 'results': findings_to_dicts(results['results'])}
+
+
+@app.get("/api/results/{scan_id}/export")
+async def export_scan_results(scan_id: str, format: str = "jsonl"):
+    """
+    Stream the findings of a completed scan as a file
+
+    Args:
+        scan_id: Unique scan identifier
+        format: jsonl, csv or parquet
+
+    Returns:
+        Streaming download, generated batch by batch
+    """
+    if format not in EXPORT_FORMATS:
         raise HTTPException(
-            status_code=400, 
-            detail=f"Scan is not completed yet. Current status: {active_scans[scan_id]['status']}"
+            status_code=400,
+            detail=f"Unknown format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
         )
+    results = _completed_scan_results(scan_id)
+    return StreamingResponse(
+        export(results['results'], format),
+        media_type=EXPORT_FORMATS[format],
+        headers={'Content-Disposition': f'attachment; filename="scan_{scan_id}.{format}"'}
+    )
+
+
+@app.get("/api/sources")
+async def get_source_stats():
+    """
+    Get live per-source statistics
+
+    Returns:
+        List of sources (best first) with latency percentiles, error rate,
+        bytes per hit and relevant-hit yield
+    """
+    return get_source_registry().snapshot()
+
+
+@app.get("/api/emails")
+async def search_emails(prefix: str, limit: int = 50, domain: Optional[str] = None):
+    """
+    Prefix search over every leaked email address seen across scans
+
+    Args:
+        prefix: Address prefix (at least 2 characters)
+        limit: Maximum number of addresses (1-1000)
+        domain: Only return addresses at this domain
+
+    Returns:
+        List of {'email', 'findings'}
+    """
+    if len(prefix.strip()) < 2:
+        raise HTTPException(status_code=400, detail="Prefix must be at least 2 characters")
+    limit = max(1, min(limit, 1000))
+    return get_email_index().prefix_search(prefix, limit=limit, domain=domain)
+
+
+@app.get("/api/emails/{email}")
+async def lookup_email(email: str):
+    """
+    Where has an email address leaked?
+
+    Args:
+        email: Full address, or a bare local part to match any domain
+
+    Returns:
+        Postings (finding ID, scan ID, paste URL, content hash), newest first
+    """
+    return {
+        'email': email,
+        'postings': get_email_index().lookup(email)
+    }
+
+
+@app.get("/api/monitor")
+async def monitor_status():
+    """
+    Feed monitor state
     
-    if scan_id not in scan_results:
-        raise HTTPException(status_code=404, detail="Results not found")
+    Returns:
+        Whether it is running, the poll interval and per-source cursors
+        (last paste seen, last poll, new and relevant paste counts)
+    """
+    return get_feed_monitor().status()
+
+
+@app.post("/api/monitor/start")
+async def start_monitor():
+    """Start polling the monitored feeds"""
+    monitor = get_feed_monitor()
+    monitor.start()
+    return monitor.status()
+
+
+@app.post("/api/monitor/stop")
+async def stop_monitor():
+    """Stop polling after the current poll of each feed"""
+    monitor = get_feed_monitor()
+    await asyncio.to_thread(monitor.stop)
+    return monitor.status()
+
+
+@app.get("/api/monitor/findings")
+async def monitor_findings(limit: int = 50):
+    """
+    Most recent relevant pastes found by the monitor
     
-    return scan_results[scan_id]
+    Args:
+        limit: Maximum number of findings, newest first
+    """
+    recent = list(get_feed_monitor().recent)[-limit:][::-1] if limit > 0 else []
+    return findings_to_dicts(recent)
 
 
 @app.websocket("/ws")
@@ -371,6 +768,41 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (request latency, stage timings, queue depths)"""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/api/admin/profile")
+async def profile_scan(seconds: float = 10, scan_id: Optional[str] = None,
+                       x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Sample running threads and return folded stacks for a flame graph
+
+    Args:
+        seconds: Sampling duration (at most PROFILE_MAX_SECONDS)
+        scan_id: Only sample threads working on this scan (needs ENABLE_TRACING)
+        x_admin_token: Must match ADMIN_TOKEN
+
+    Returns:
+        Folded stacks as text/plain (flamegraph.pl, speedscope)
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if not hmac.compare_digest((x_admin_token or '').encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    if scan_id is not None and scan_id not in active_scans:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400, detail=f"seconds must be between 0 and {PROFILE_MAX_SECONDS}"
+        )
+
+    stacks = await asyncio.to_thread(profile, seconds, scan_id)
+    return Response(content=stacks, media_type="text/plain")
+
+
 # Run the application
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,81 @@
+"""
+Analysis hot path benchmarks for Project NEXT Intelligence
+Relevance scoring, email extraction, credential detection and analyze_paste
+
+Each case is grouped by function and labelled with its paste shape and
+size; bytes per round are kept in extra_info so throughput can be
+compared across sizes.
+"""
+
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from conftest import make_paste, paste_cases, parse_size, rounds_for
+
+PASTE_URL = "https://pastebin.com/AbCdEf12"
+
+_PASTE_PAGE = """<html><head><title>leak</title></head><body>
+<div class="info-top">UI staff dump</div>
+<div class="username"><a href="/u/anon">anon</a></div>
+<div class="date">2024-01-01</div>
+</body></html>"""
+
+
+def _run(benchmark, group, shape, size, func, *args):
+    benchmark.group = group
+    benchmark.extra_info.update(shape=shape, size=size, bytes=parse_size(size))
+    return benchmark.pedantic(func, args=args, rounds=rounds_for(shape, size), iterations=1)
+
+
+@pytest.mark.parametrize("shape,size", paste_cases())
+def bench_calculate_relevance_score(benchmark, engine, shape, size):
+    text = make_paste(shape, size)
+    score = _run(benchmark, "relevance_score", shape, size, engine._calculate_relevance_score, text)
+    assert 0.0 <= score <= 1.0
+
+
+@pytest.mark.parametrize("shape,size", paste_cases())
+def bench_extract_emails(benchmark, engine, shape, size):
+    text = make_paste(shape, size)
+    _run(benchmark, "extract_emails", shape, size, engine._extract_emails, text)
+
+
+@pytest.mark.parametrize("shape,size", paste_cases())
+def bench_extract_target_domain_emails(benchmark, engine, shape, size):
+    text = make_paste(shape, size)
+    _run(benchmark, "extract_target_domain_emails", shape, size,
+         engine._extract_target_domain_emails, text)
+
+
+@pytest.mark.parametrize("shape,size", paste_cases())
+def bench_contains_credentials(benchmark, engine, shape, size):
+    text = make_paste(shape, size)
+    _run(benchmark, "contains_credentials", shape, size, engine._contains_credentials, text)
+
+
+def _response(url: str, body: bytes, content_type: str) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response.headers['Content-Type'] = content_type
+    response._content = body
+    return response
+
+
+@pytest.mark.parametrize("shape,size", paste_cases(('combo', 'single_line', 'binary')))
+def bench_analyze_paste(benchmark, engine, shape, size):
+    """Fetch-to-finding with canned responses: decoding, metadata parsing and analysis"""
+    raw = _response(PASTE_URL, make_paste(shape, size).encode('utf-8'), 'text/plain; charset=utf-8')
+    page = _response(PASTE_URL, _PASTE_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def fake_request(url, retries=None):
+        return raw if '/raw/' in url else page
+
+    def analyze():
+        engine.visited_urls.clear()
+        return engine.analyze_paste(PASTE_URL)
+
+    with patch.object(engine, "_make_request", side_effect=fake_request):
+        _run(benchmark, "analyze_paste", shape, size, analyze)
@@ -0,0 +1,113 @@
+"""
+Benchmark fixtures for Project NEXT Intelligence
+Synthetic pastes of every size and shape the analysis hot path sees
+
+Sizes run from 1 KB up to BENCH_MAX_SIZE (default 16M; set 500M for the
+full range). Every paste is generated from a fixed seed, so a run on one
+commit compares like for like with a run on another.
+"""
+
+import functools
+import os
+import random
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+SIZES = ['1K', '64K', '1M', '16M', '500M']
+
+_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_size(size: str) -> int:
+    """Byte count of a size such as "64K" or "500M" """
+    match = re.fullmatch(r'(\d+)([KMG]?)', size.strip().upper())
+    if not match:
+        raise ValueError(f"Invalid size: {size}")
+    return int(match.group(1)) * _UNITS.get(match.group(2), 1)
+
+
+MAX_SIZE = parse_size(os.getenv("BENCH_MAX_SIZE", "16M"))
+
+
+def _combo_line(rng: random.Random, i: int) -> str:
+    domain = rng.choice(['ui.ac.id', 'cs.ui.ac.id', 'gmail.com', 'yahoo.com', 'itb.ac.id'])
+    return f"user{i}.{rng.randrange(10 ** 6)}@{domain}:Passw0rd{rng.randrange(10 ** 4)}!\n"
+
+
+def _prose_line(rng: random.Random, i: int) -> str:
+    words = ['the', 'server', 'config', 'was', 'updated', 'after', 'review', 'of', 'logs',
+             'database', 'backup', 'leak', 'password', 'universitas', 'indonesia', 'ui.ac.id']
+    return ' '.join(rng.choice(words) for _ in range(14)) + '.\n'
+
+
+def _repeat_lines(make_line, size: int, seed: int) -> str:
+    """Unique lines up to 1 MB, repeated to fill larger sizes (keeps generation fast)"""
+    rng = random.Random(seed)
+    block, length, i = [], 0, 0
+    while length < min(size, 1024 ** 2):
+        line = make_line(rng, i)
+        block.append(line)
+        length += len(line)
+        i += 1
+    block = ''.join(block)
+    return (block * (size // len(block) + 1))[:size]
+
+
+def _single_line(size: int) -> str:
+    # One giant line: credentials and emails separated by spaces, no newline at all
+    unit = "budi.s@ui.ac.id:rahasia123; leaked password dump x@gmail.com token=abcdef "
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def _binary(size: int) -> str:
+    # Random bytes read as Latin-1, as an undetected binary attachment would be
+    rng = random.Random(7)
+    chunk = rng.randbytes(min(size, 1024 ** 2)).decode('latin-1')
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+
+def _dotted_run(size: int) -> str:
+    # One long "a.a.a..." token: every position is a word boundary, no "@" follows
+    return ('a.' * (size // 2 + 1))[:size]
+
+
+SHAPES = {
+    'combo': lambda size: _repeat_lines(_combo_line, size, seed=1),
+    'prose': lambda size: _repeat_lines(_prose_line, size, seed=2),
+    'single_line': _single_line,
+    'binary': _binary,
+    'dotted_run': _dotted_run,
+}
+
+@functools.lru_cache(maxsize=4)
+def make_paste(shape: str, size: str) -> str:
+    """Synthetic paste text of a shape and size (cached per session)"""
+    return SHAPES[shape](parse_size(size))
+
+
+def paste_cases(shapes=tuple(SHAPES)):
+    """(shape, size) parameters up to BENCH_MAX_SIZE"""
+    return [
+        pytest.param(shape, size, id=f"{shape}-{size}")
+        for shape in shapes
+        for size in SIZES
+        if parse_size(size) <= MAX_SIZE
+    ]
+
+
+def rounds_for(shape: str, size: str) -> int:
+    """Enough rounds for a stable mean without spending minutes on large pastes"""
+    return max(1, min(50, parse_size('64M') // parse_size(size)))
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Orchestrator with no persistent side effects"""
+    from scrapers.discovery_engine import DiscoveryOrchestrator
+    from scrapers.source_registry import SourceRegistry
+
+    return DiscoveryOrchestrator(source_registry=SourceRegistry(path=None))
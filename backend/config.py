@@ -13,6 +13,13 @@ BASE_DIR = Path(__file__).parent.absolute()
 # Target domain to search for
 TARGET_DOMAIN = os.getenv("TARGET_DOMAIN", "ui.ac.id")
 
+# Additional organizations monitored in the same pass, comma-separated
+# ("*.example.ac.id" covers the apex and every subdomain). When set, each
+# finding carries per-domain scores and target emails.
+MONITORED_DOMAINS = [
+    d.strip() for d in os.getenv("MONITORED_DOMAINS", "").split(",") if d.strip()
+]
+
 # Relevance scoring thresholds
 MIN_RELEVANCE_SCORE = float(os.getenv("MIN_RELEVANCE_SCORE", "0.3"))
 HIGH_PRIORITY_SCORE = float(os.getenv("HIGH_PRIORITY_SCORE", "0.7"))
@@ -21,6 +28,30 @@ HIGH_PRIORITY_SCORE = float(os.getenv("HIGH_PRIORITY_SCORE", "0.7"))
 REQUEST_DELAY = float(os.getenv("REQUEST_DELAY", "2"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 
+# Retry policy: only transient errors (timeouts, 429, 5xx) are retried, with
+# jittered exponential backoff or the server's Retry-After; 404/410/451 URLs
+# are remembered as dead. Each host has a token bucket of retries.
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "60"))
+RETRY_AFTER_MAX = float(os.getenv("RETRY_AFTER_MAX", "300"))  # give up on longer Retry-After
+RETRY_BUDGET_PER_HOST = float(os.getenv("RETRY_BUDGET_PER_HOST", "10"))
+RETRY_BUDGET_REFILL = float(os.getenv("RETRY_BUDGET_REFILL", "0.1"))  # tokens per second
+DEAD_URL_TTL = float(os.getenv("DEAD_URL_TTL", str(24 * 3600)))
+DEAD_URL_CACHE_SIZE = int(os.getenv("DEAD_URL_CACHE_SIZE", "100000"))
+
+# Shared HTTP transport: one set of keep-alive connection pools per backend for
+# the whole process, so handshakes are paid once per host rather than per scan
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "32"))  # host pools kept open
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))  # connections per host
+# Per-host pool sizes, e.g. "pastebin.com=64,paste.ee=8"
+HTTP_POOL_SIZES = {
+    host.strip(): int(size)
+    for host, _, size in (
+        entry.partition("=") for entry in os.getenv("HTTP_POOL_SIZES", "").split(",") if "=" in entry
+    )
+}
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))  # seconds; 0 disables
+
 # Tor configuration
 TOR_PROXY = {
     'http': os.getenv("TOR_PROXY_HTTP", "socks5h://localhost:9050"),
@@ -57,18 +88,115 @@ USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0'
 ]
 
+# JavaScript-rendered paste sites
+# Pastes whose plain HTTP response is empty or a script shell are escalated
+# to a pooled headless browser; everything else stays on the cheap HTTP path
+ENABLE_JS_RENDER = os.getenv("ENABLE_JS_RENDER", "true").lower() == "true"
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_RETRY_COOLDOWN = float(os.getenv("BROWSER_RETRY_COOLDOWN", "60"))  # seconds after a failed browser start
+JS_RENDER_MIN_TEXT = int(os.getenv("JS_RENDER_MIN_TEXT", "200"))
+
+# CSS selector of the rendered paste body for each JS-rendered site
+JS_CONTENT_SELECTORS = {
+    "privatebin.net": "#prettymessage",
+    "justpaste.it": "#articleContent",
+}
+
+# Evidence screenshots for high-priority findings
+ENABLE_EVIDENCE_SCREENSHOTS = os.getenv("ENABLE_EVIDENCE_SCREENSHOTS", "true").lower() == "true"
+SCREENSHOT_QUEUE_SIZE = int(os.getenv("SCREENSHOT_QUEUE_SIZE", "100"))
+SCREENSHOT_WEBP_QUALITY = int(os.getenv("SCREENSHOT_WEBP_QUALITY", "80"))
+
+# CSS selector of the paste content region captured as evidence
+EVIDENCE_SELECTORS = {
+    "pastebin.com": ".source",
+    **JS_CONTENT_SELECTORS,
+}
+
+# Raw paste body storage (zstd, content-addressed under OUTPUT_DIR/pastes)
+ENABLE_PASTE_STORE = os.getenv("ENABLE_PASTE_STORE", "true").lower() == "true"
+PASTE_STORE_LEVEL = int(os.getenv("PASTE_STORE_LEVEL", "10"))
+PASTE_STORE_DICT_SIZE = int(os.getenv("PASTE_STORE_DICT_SIZE", str(112 * 1024)))
+PASTE_STORE_DICT_SAMPLES = int(os.getenv("PASTE_STORE_DICT_SAMPLES", "1000"))
+
+# Known-exposure filter: findings flag target emails not seen in earlier leaks
+ENABLE_EXPOSURE_FILTER = os.getenv("ENABLE_EXPOSURE_FILTER", "true").lower() == "true"
+EXPOSURE_FILTER_CAPACITY = int(os.getenv("EXPOSURE_FILTER_CAPACITY", "1000000"))
+EXPOSURE_FILTER_ERROR_RATE = float(os.getenv("EXPOSURE_FILTER_ERROR_RATE", "0.001"))
+
+# Number of recent request latencies kept per source for percentiles
+SOURCE_LATENCY_WINDOW = int(os.getenv("SOURCE_LATENCY_WINDOW", "256"))
+
+# Pastes fetched per scan by the best-first frontier (0 = no limit); under
+# strict rate limits the budget goes to the pastes most likely to be leaks
+FRONTIER_FETCH_BUDGET = int(os.getenv("FRONTIER_FETCH_BUDGET", "0"))
+
+# Bytes of a body used to guess its charset when the server declares none
+DECODE_SNIFF_BYTES = int(os.getenv("DECODE_SNIFF_BYTES", str(64 * 1024)))
+
+# Process-pool content analysis for large pastes (split into line-aligned chunks)
+ENABLE_ANALYSIS_POOL = os.getenv("ENABLE_ANALYSIS_POOL", "true").lower() == "true"
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0"))  # 0 = one per CPU
+ANALYSIS_POOL_MIN_BYTES = int(os.getenv("ANALYSIS_POOL_MIN_BYTES", str(1024 * 1024)))
+ANALYSIS_CHUNK_BYTES = int(os.getenv("ANALYSIS_CHUNK_BYTES", str(512 * 1024)))
+
+# Postgres/Supabase persistence of scans and findings (supabase/schema.sql)
+ENABLE_DB_SINK = os.getenv("ENABLE_DB_SINK", "false").lower() == "true"
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+DB_SINK_OWNER_ID = os.getenv("DB_SINK_OWNER_ID", "")  # user_profiles.id owning API scans
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+DB_SINK_BATCH_SIZE = int(os.getenv("DB_SINK_BATCH_SIZE", "1000"))
+DB_SINK_FLUSH_INTERVAL = float(os.getenv("DB_SINK_FLUSH_INTERVAL", "5"))
+
+# Segmented log of completed scans (OUTPUT_DIR/result_log), reloaded on API startup
+ENABLE_RESULT_LOG = os.getenv("ENABLE_RESULT_LOG", "true").lower() == "true"
+RESULT_LOG_SEGMENT_BYTES = int(os.getenv("RESULT_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "16"))  # scan results kept in memory
+
+# Stage-level tracing spans exported as OTLP/JSON (e.g. http://localhost:4318/v1/traces)
+ENABLE_TRACING = os.getenv("ENABLE_TRACING", "false").lower() == "true"
+TRACE_EXPORT_URL = os.getenv("TRACE_EXPORT_URL", "")
+TRACE_EXPORT_INTERVAL = float(os.getenv("TRACE_EXPORT_INTERVAL", "5"))
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "next-intelligence")
+
+# Admin endpoints (sampling profiler) are disabled unless a token is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS = int(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.01"))
+
+# Base URL of Pastebin pages, raw bodies and user profiles; point it at the
+# local paste-site simulator (loadtest/paste_site.py) for load tests
+PASTEBIN_BASE_URL = os.getenv("PASTEBIN_BASE_URL", "https://pastebin.com").rstrip("/")
+
+# Continuous monitoring of paste-site recent feeds (scrapers/monitor.py).
+# Sources are feed adapter names, comma-separated; "pastebin_api" needs an
+# IP whitelisted for the Pastebin scraping API.
+ENABLE_MONITOR = os.getenv("ENABLE_MONITOR", "false").lower() == "true"  # start with the API
+MONITOR_SOURCES = [
+    s.strip() for s in os.getenv("MONITOR_SOURCES", "pastebin").split(",") if s.strip()
+]
+MONITOR_POLL_INTERVAL = float(os.getenv("MONITOR_POLL_INTERVAL", "60"))  # seconds between polls of a feed
+MONITOR_SEEN_WINDOW = int(os.getenv("MONITOR_SEEN_WINDOW", "2000"))  # paste URLs remembered per source
+MONITOR_RECENT_FINDINGS = int(os.getenv("MONITOR_RECENT_FINDINGS", "500"))  # kept for /api/monitor/findings
+PASTEBIN_SCRAPING_URL = os.getenv("PASTEBIN_SCRAPING_URL", "https://scrape.pastebin.com/api_scraping.php")
+
 # Known darknet paste sites (examples - may not be active)
 DARKNET_SOURCES = [
     "http://nzxj65x32vh2fkhk.onion",  # Stronghold Paste (example)
     "http://thehiddenwiki.onion",     # Hidden Wiki (example)
 ]
 
-# Output configuration
+# Output configuration (created by the stores that write to it, not at import)
 OUTPUT_DIR = BASE_DIR / "scan_results"
-LOG_FILE = BASE_DIR / "discovery.log"
+LOG_FILE = os.getenv("LOG_FILE", str(BASE_DIR / "discovery.log"))
 
-# Create directories if they don't exist
-OUTPUT_DIR.mkdir(exist_ok=True)
+# Logging pipeline (records are queued; a background thread formats and writes them)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FILE_FORMAT = os.getenv("LOG_FILE_FORMAT", "json").lower()  # json or text
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # records beyond this are dropped
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))  # share of per-URL INFO lines kept
 
 # API Configuration
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
@@ -0,0 +1,171 @@
+"""
+Load Scenario for Project NEXT Intelligence
+Sustained scan load against the API, backed by the paste-site simulator
+
+ScanUser starts scans (POST /api/scan) on simulator pastes and polls them
+until they finish; WebSocketUser holds /ws subscriptions and counts the
+broadcast updates. At the end of the run the scenario reports completed
+scans per minute, API p99 latency and the API's peak resident memory
+(sampled from /metrics).
+
+Usage:
+    python loadtest/paste_site.py --port 8081 &
+    PASTEBIN_BASE_URL=http://127.0.0.1:8081 uvicorn api.main:app --port 8000 &
+    locust -f loadtest/locustfile.py --host http://127.0.0.1:8000 \\
+        --headless -u 50 -r 5 -t 10m
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import requests
+from locust import HttpUser, User, between, events, task
+from websockets.sync.client import connect
+
+from paste_site import paste_ids
+
+SIMULATOR_URL = os.getenv("PASTEBIN_BASE_URL", "http://127.0.0.1:8081").rstrip("/")
+PASTES_PER_SCAN = int(os.getenv("LOAD_PASTES_PER_SCAN", "5"))
+POLL_INTERVAL = float(os.getenv("LOAD_POLL_INTERVAL", "2"))
+SCAN_TIMEOUT = float(os.getenv("LOAD_SCAN_TIMEOUT", "600"))
+MEMORY_SAMPLE_INTERVAL = float(os.getenv("LOAD_MEMORY_INTERVAL", "5"))
+
+# A large pool keeps the scan cache and per-URL dedup from flattering the numbers
+_PASTE_POOL = paste_ids("loadtest", 10000)
+
+_RSS_RE = re.compile(r'^process_resident_memory_bytes (\S+)$', re.MULTILINE)
+
+
+class _RunStats:
+    """Scan completions and API memory samples across all users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = None
+        self.completed = 0
+        self.failed = 0
+        self.ws_messages = 0
+        self.rss_samples = []
+
+    def scans_per_minute(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return self.completed / max((time.time() - self.started_at) / 60, 1e-9)
+
+
+run_stats = _RunStats()
+
+
+class ScanUser(HttpUser):
+    """Starts a scan, polls it to completion, repeats"""
+
+    wait_time = between(1, 3)
+
+    @task
+    def scan(self):
+        urls = [f"{SIMULATOR_URL}/{paste_id}" for paste_id in random.sample(_PASTE_POOL, PASTES_PER_SCAN)]
+        started = time.time()
+        with self.client.post("/api/scan", json={
+            'urls': urls,
+            'enable_clearnet': True,
+            'enable_darknet': False,
+            'crawl_authors': True,
+        }, catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure(f"HTTP {response.status_code}")
+                return
+            scan_id = response.json()['scan_id']
+
+        status = 'pending'
+        while status in ('pending', 'running') and time.time() - started < SCAN_TIMEOUT:
+            time.sleep(POLL_INTERVAL)
+            response = self.client.get(f"/api/scans/{scan_id}", name="/api/scans/[id]")
+            if response.status_code == 200:
+                status = response.json()['status']
+
+        # Scan turnaround as its own row next to the HTTP endpoints
+        events.request.fire(
+            request_type="SCAN", name="scan_completed" if status == 'completed' else f"scan_{status}",
+            response_time=(time.time() - started) * 1000, response_length=0,
+            exception=None if status == 'completed' else RuntimeError(status), context={}
+        )
+        with run_stats.lock:
+            if status == 'completed':
+                run_stats.completed += 1
+            else:
+                run_stats.failed += 1
+
+
+class WebSocketUser(User):
+    """Keeps a /ws subscription open and counts scan updates"""
+
+    weight = 1
+    wait_time = between(5, 10)
+
+    @task
+    def subscribe(self):
+        ws_url = re.sub(r'^http', 'ws', self.host.rstrip('/')) + '/ws'
+        started = time.time()
+        try:
+            with connect(ws_url, open_timeout=10) as websocket:
+                deadline = time.time() + 30
+                websocket.send("ping")
+                while time.time() < deadline:
+                    try:
+                        message = websocket.recv(timeout=deadline - time.time())
+                    except TimeoutError:
+                        break
+                    if message != "pong":
+                        json.loads(message)
+                        with run_stats.lock:
+                            run_stats.ws_messages += 1
+            exception = None
+        except Exception as e:
+            exception = e
+        events.request.fire(
+            request_type="WS", name="/ws", response_time=(time.time() - started) * 1000,
+            response_length=0, exception=exception, context={}
+        )
+
+
+def _sample_memory(environment):
+    while environment.runner is not None and environment.runner.state != "stopped":
+        try:
+            text = requests.get(f"{environment.host.rstrip('/')}/metrics", timeout=5).text
+            match = _RSS_RE.search(text)
+            if match:
+                with run_stats.lock:
+                    run_stats.rss_samples.append(float(match.group(1)))
+        except requests.RequestException:
+            pass
+        time.sleep(MEMORY_SAMPLE_INTERVAL)
+
+
+@events.test_start.add_listener
+def on_test_start(environment, **kwargs):
+    run_stats.started_at = time.time()
+    threading.Thread(target=_sample_memory, args=(environment,), daemon=True).start()
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    api_entries = [
+        entry for entry in environment.stats.entries.values()
+        if entry.method not in ("SCAN", "WS")
+    ]
+    p99 = max((entry.get_response_time_percentile(0.99) or 0 for entry in api_entries), default=0)
+    rss = run_stats.rss_samples
+    print("\n=== NEXT Intelligence load summary ===")
+    print(f"Scans completed:     {run_stats.completed} ({run_stats.failed} failed or timed out)")
+    print(f"Scans per minute:    {run_stats.scans_per_minute():.2f}")
+    print(f"API p99 latency:     {p99:.0f} ms (worst endpoint)")
+    print(f"WebSocket messages:  {run_stats.ws_messages}")
+    if rss:
+        print(f"API RSS:             start {rss[0] / 2 ** 20:.0f} MB, "
+              f"peak {max(rss) / 2 ** 20:.0f} MB, end {rss[-1] / 2 ** 20:.0f} MB")
+    else:
+        print("API RSS:             unavailable (no process metrics at /metrics)")
@@ -0,0 +1,212 @@
+"""
+Paste Site Simulator for Project NEXT Intelligence
+Local stand-in for the Pastebin layouts DiscoveryOrchestrator parses
+
+Serves paste pages (/{id}), raw bodies (/raw/{id}), user profiles
+(/u/{user}) and a recent-pastes feed (/archive, a new paste every
+--post-interval seconds) with configurable latency, error rate and body
+size. Pastes
+are generated deterministically from their ID, so repeated runs fetch
+identical content. Point the API at it with PASTEBIN_BASE_URL.
+
+Usage:
+    python loadtest/paste_site.py --port 8081 --latency-ms 50 --error-rate 0.02 --body-kb 4-256
+    PASTEBIN_BASE_URL=http://localhost:8081 uvicorn api.main:app
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import string
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_PASTE_ID_RE = re.compile(r'^/(raw/)?([A-Za-z0-9]{8})$')
+_USER_RE = re.compile(r'^/u/([A-Za-z0-9_-]+)$')
+
+_TITLES = ['db backup', 'config dump', 'notes', 'combo list', 'leak ui.ac.id', 'export']
+_WORDS = ['server', 'config', 'updated', 'review', 'database', 'backup', 'deploy', 'cache']
+_DOMAINS = ['ui.ac.id', 'cs.ui.ac.id', 'gmail.com', 'yahoo.com']
+
+
+class SiteConfig:
+    """Behaviour of the simulated site"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 body_min: int = 4096, body_max: int = 4096, leak_rate: float = 0.3,
+                 pastes_per_user: int = 10, authors: int = 50, post_interval: float = 10.0,
+                 archive_size: int = 50):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.body_min = body_min
+        self.body_max = max(body_min, body_max)
+        self.leak_rate = leak_rate
+        self.pastes_per_user = pastes_per_user
+        self.authors = authors
+        self.post_interval = post_interval
+        self.archive_size = archive_size
+
+
+def paste_ids(seed: str, count: int):
+    """Deterministic 8-character paste IDs"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    return [''.join(rng.choice(alphabet) for _ in range(8)) for _ in range(count)]
+
+
+def _rng(paste_id: str) -> random.Random:
+    return random.Random(hashlib.sha256(paste_id.encode()).digest())
+
+
+def paste_author(paste_id: str, config: SiteConfig) -> str:
+    return f"user{_rng(paste_id).randrange(config.authors)}"
+
+
+def paste_body(paste_id: str, config: SiteConfig) -> bytes:
+    """Raw paste: a credential dump for leaking pastes, log-like noise otherwise"""
+    rng = _rng(paste_id)
+    size = rng.randint(config.body_min, config.body_max)
+    leaking = rng.random() < config.leak_rate
+    lines = []
+    length = 0
+    i = 0
+    while length < size:
+        if leaking:
+            line = f"mhs{i}.{rng.randrange(10 ** 5)}@{rng.choice(_DOMAINS)}:Passw0rd{rng.randrange(10 ** 4)}"
+        else:
+            line = ' '.join(rng.choice(_WORDS) for _ in range(10))
+        lines.append(line)
+        length += len(line) + 1
+        i += 1
+    header = "password dump ui.ac.id leak\n" if leaking else ""
+    return (header + '\n'.join(lines))[:size].encode('utf-8')
+
+
+def paste_page(paste_id: str, config: SiteConfig) -> bytes:
+    """Paste HTML page with the elements _extract_paste_metadata reads"""
+    rng = _rng(paste_id)
+    author = paste_author(paste_id, config)
+    return f"""<!DOCTYPE html>
+<html><head><title>Pastebin {paste_id}</title></head><body>
+<div class="info-top">{rng.choice(_TITLES)}</div>
+<div class="username"><a href="/u/{author}">{author}</a></div>
+<div class="date">2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T12:00:00</div>
+<textarea class="source">(see /raw/{paste_id})</textarea>
+</body></html>""".encode('utf-8')
+
+
+def user_page(username: str, config: SiteConfig) -> bytes:
+    """Profile page linking the user's pastes as /XXXXXXXX"""
+    links = '\n'.join(
+        f'<a href="/{paste_id}">paste {paste_id}</a>'
+        for paste_id in paste_ids(username, config.pastes_per_user)
+    )
+    return f"<!DOCTYPE html><html><body><h1>{username}</h1>\n{links}\n</body></html>".encode('utf-8')
+
+
+def archive_ids(config: SiteConfig, now: float = None):
+    """Newest-first IDs of the feed: paste n is posted at n * post_interval"""
+    newest = int((time.time() if now is None else now) / config.post_interval)
+    return [paste_ids(f"archive-{n}", 1)[0] for n in range(newest, newest - config.archive_size, -1)]
+
+
+def archive_page(config: SiteConfig) -> bytes:
+    """Recent-pastes table in the layout of Pastebin's /archive"""
+    rows = '\n'.join(
+        f'<tr><td><a href="/{paste_id}">{_rng(paste_id).choice(_TITLES)}</a></td><td>1 min ago</td></tr>'
+        for paste_id in archive_ids(config)
+    )
+    return f"""<!DOCTYPE html><html><body>
+<table class="maintable">
+<tr><th>Name / Title</th><th>Posted</th></tr>
+{rows}
+</table></body></html>""".encode('utf-8')
+
+
+def make_handler(config: SiteConfig):
+    """Request handler class bound to a site configuration"""
+
+    class PasteSiteHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+            if delay > 0:
+                time.sleep(delay / 1000)
+            if random.random() < config.error_rate:
+                self._send(503, b'Service Unavailable', 'text/plain; charset=utf-8')
+                return
+
+            paste = _PASTE_ID_RE.match(self.path)
+            user = _USER_RE.match(self.path)
+            if paste and paste.group(1):
+                self._send(200, paste_body(paste.group(2), config), 'text/plain; charset=utf-8')
+            elif paste:
+                self._send(200, paste_page(paste.group(2), config), 'text/html; charset=utf-8')
+            elif user:
+                self._send(200, user_page(user.group(1), config), 'text/html; charset=utf-8')
+            elif self.path == '/archive':
+                self._send(200, archive_page(config), 'text/html; charset=utf-8')
+            else:
+                self._send(404, b'Not Found', 'text/plain; charset=utf-8')
+
+        def log_message(self, format, *args):
+            pass  # Thousands of requests per second; the load harness reports instead
+
+    return PasteSiteHandler
+
+
+def serve(host: str = '127.0.0.1', port: int = 8081, config: SiteConfig = None) -> ThreadingHTTPServer:
+    """Create the simulator server (call serve_forever() on the result)"""
+    server = ThreadingHTTPServer((host, port), make_handler(config or SiteConfig()))
+    server.daemon_threads = True
+    return server
+
+
+def _size_range(value: str):
+    low, _, high = value.partition('-')
+    return int(float(low) * 1024), int(float(high or low) * 1024)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local paste-site simulator for load tests")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Mean response delay")
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help="Uniform +/- delay jitter")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of 503 responses")
+    parser.add_argument('--body-kb', type=_size_range, default=(4096, 65536),
+                        help="Raw body size in KB, fixed (64) or a range (4-256)")
+    parser.add_argument('--leak-rate', type=float, default=0.3, help="Share of pastes with credentials")
+    parser.add_argument('--pastes-per-user', type=int, default=10)
+    parser.add_argument('--authors', type=int, default=50, help="Distinct paste authors")
+    parser.add_argument('--post-interval', type=float, default=10.0,
+                        help="Seconds between new pastes in /archive")
+    args = parser.parse_args(argv)
+
+    config = SiteConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        body_min=args.body_kb[0], body_max=args.body_kb[1], leak_rate=args.leak_rate,
+        pastes_per_user=args.pastes_per_user, authors=args.authors,
+        post_interval=args.post_interval
+    )
+    server = serve(args.host, args.port, config)
+    print(f"Paste site simulator on http://{args.host}:{args.port} "
+          f"(set PASTEBIN_BASE_URL=http://{args.host}:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,75 @@
 """
 Scrapers module for Project NEXT Intelligence
+
+Scraper backends are registered by name and imported on first use, so
+importing this package (or the API) does not load requests, BeautifulSoup,
+Selenium or the Tor stack until a scan needs them.
+
+Usage:
+    from scrapers import get_scraper
+    orchestrator = get_scraper('clearnet')(paste_store=...)
+
+    from scrapers import TorScraper  # also lazy
 """
+
+import importlib
+import threading
+from typing import Dict, List
+
+# Backend name -> "module:attribute"
+SCRAPERS: Dict[str, str] = {
+    'clearnet': 'scrapers.discovery_engine:DiscoveryOrchestrator',
+    'tor': 'scrapers.tor_scraper:TorScraper',
+    'selenium': 'scrapers.selenium_scraper:SeleniumScraper',
+}
+
+_loaded: Dict[str, type] = {}
+_load_lock = threading.Lock()
+
+
+def register_scraper(name: str, target: str):
+    """
+    Register a scraper backend without importing it
+
+    Args:
+        name: Backend name passed to get_scraper()
+        target: "package.module:ClassName"
+    """
+    with _load_lock:
+        SCRAPERS[name] = target
+        _loaded.pop(name, None)
+
+
+def available_scrapers() -> List[str]:
+    """Names of the registered backends"""
+    return sorted(SCRAPERS)
+
+
+def get_scraper(name: str) -> type:
+    """
+    Return a scraper class, importing its module on first use
+
+    Args:
+        name: Backend name ("clearnet", "tor", "selenium")
+
+    Returns:
+        The scraper class
+    """
+    scraper = _loaded.get(name)
+    if scraper is not None:
+        return scraper
+    if name not in SCRAPERS:
+        raise KeyError(f"Unknown scraper '{name}'. Use one of: {', '.join(available_scrapers())}")
+    with _load_lock:
+        if name not in _loaded:
+            module_name, _, attribute = SCRAPERS[name].partition(':')
+            _loaded[name] = getattr(importlib.import_module(module_name), attribute)
+        return _loaded[name]
+
+
+def __getattr__(attribute: str):
+    # PEP 562: `from scrapers import DiscoveryOrchestrator` resolves through the registry
+    for name, target in list(SCRAPERS.items()):
+        if target.partition(':')[2] == attribute:
+            return get_scraper(name)
+    raise AttributeError(f"module 'scrapers' has no attribute '{attribute}'")
@@ -0,0 +1,307 @@
+"""
+Analysis Pool for Project NEXT Intelligence
+Content analysis in worker processes, with large pastes split into parallel chunks
+
+A large body is written once to a memory-mapped file (under /dev/shm where
+available). Workers map it and analyze their own line-aligned byte range,
+so only offsets travel to the workers and only compact, mergeable features
+travel back; the multi-MB text is never pickled.
+
+Features are extracted from UTF-8 bytes: domains, emails and keywords are
+ASCII patterns, so matching the raw buffer avoids decoding it at all.
+"""
+
+import atexit
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    TARGET_DOMAIN, LEAK_KEYWORDS,
+    ANALYSIS_WORKERS, ANALYSIS_POOL_MIN_BYTES, ANALYSIS_CHUNK_BYTES
+)
+from scrapers.log_setup import setup_logging
+from scrapers.batch_scorer import (
+    DEFAULT_WEIGHTS, ScoringWeights, score_features, target_email_pattern, unique_keywords
+)
+from scrapers.credential_extractor import CredentialSummary, iter_credentials, summarize
+from scrapers.domain_matcher import DomainHits, DomainMatcher
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+# Local parts are anchored by a lookbehind rather than \b and bounded to 64
+# characters, so dotted runs in hostile pastes are scanned in linear time
+_EMAIL_BODY = r'[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+EMAIL_RE = re.compile(r'(?<![\w.%+-])' + _EMAIL_BODY)
+TARGET_EMAIL_RE = re.compile(target_email_pattern(TARGET_DOMAIN), re.IGNORECASE)
+
+# Byte versions of the same patterns. \w and \b are ASCII-only on bytes, so
+# UTF-8 lead/continuation bytes count as letters where text matching would
+# (no match starting inside "józef", target local parts kept whole)
+_EMAIL_BYTES_RE = re.compile(rb'(?<![\w.%+\-\x80-\xff])' + _EMAIL_BODY.encode('ascii'))
+_TARGET_EMAIL_BYTES_RE = re.compile(
+    rb'(?<![\w.\x80-\xff-])[\w.\x80-\xff-]{1,64}@' + re.escape(TARGET_DOMAIN.encode('ascii')) + rb'\b',
+    re.IGNORECASE
+)
+_TARGET_DOMAIN_BYTES = TARGET_DOMAIN.encode('ascii')
+
+KEYWORDS, KEYWORD_COUNTS = unique_keywords(LEAK_KEYWORDS)
+_KEYWORD_BYTES = [kw.encode('utf-8') for kw in KEYWORDS]
+
+_SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+class ContentFeatures:
+    """
+    Analysis features of a document, or of a line-aligned part of one
+
+    Every field merges exactly (counts add, sets union, keyword flags OR),
+    so features of consecutive chunks combine into those of the whole text.
+    """
+
+    def __init__(self):
+        self.domain_hits = 0
+        self.email_hits = 0
+        self.keyword_hits: List[bool] = [False] * len(KEYWORDS)
+        self.emails: Set[str] = set()
+        self.target_emails: Set[str] = set()
+        self.domains: Dict[str, DomainHits] = {}
+        self.credentials = CredentialSummary()
+
+    def merge(self, other: "ContentFeatures"):
+        """Fold in the features of the next chunk"""
+        self.domain_hits += other.domain_hits
+        self.email_hits += other.email_hits
+        self.keyword_hits = [a or b for a, b in zip(self.keyword_hits, other.keyword_hits)]
+        self.emails |= other.emails
+        self.target_emails |= other.target_emails
+        for domain, hits in other.domains.items():
+            merged = self.domains.setdefault(domain, DomainHits())
+            merged.mentions += hits.mentions
+            merged.emails |= hits.emails
+        self.credentials.merge(other.credentials)
+
+    def weighted_keywords(self) -> float:
+        return sum(count for hit, count in zip(self.keyword_hits, KEYWORD_COUNTS) if hit)
+
+    def relevance_score(self, weights: ScoringWeights = DEFAULT_WEIGHTS) -> float:
+        """TARGET_DOMAIN relevance score (same as DiscoveryOrchestrator._calculate_relevance_score)"""
+        return score_features(self.domain_hits, self.email_hits, self.weighted_keywords(), weights)
+
+    def domain_scores(self, weights: ScoringWeights = DEFAULT_WEIGHTS) -> Dict[str, Dict]:
+        """Per monitored domain {'relevance_score', 'target_emails'}"""
+        keywords = self.weighted_keywords()
+        return {
+            domain: {
+                'relevance_score': round(score_features(hits.mentions, len(hits.emails), keywords, weights), 2),
+                'target_emails': sorted(hits.emails)
+            }
+            for domain, hits in self.domains.items()
+        }
+
+
+def extract_content_features(data: Union[bytes, str], title: str = "",
+                             domain_matcher: Optional[DomainMatcher] = None) -> ContentFeatures:
+    """
+    Analyze a document (or chunk) in the current process
+
+    Args:
+        data: UTF-8 document bytes (text is encoded first)
+        title: Paste title (only used for keyword matching)
+        domain_matcher: Matcher of monitored domains (skipped if None)
+
+    Returns:
+        ContentFeatures of the document
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8', 'replace')
+    features = ContentFeatures()
+    data_lower = data.lower()
+    title_lower = title.lower()
+
+    features.domain_hits = data_lower.count(_TARGET_DOMAIN_BYTES)
+    # Scoring counts target emails in lowercased text, as batch_scorer.extract_features does
+    features.email_hits = sum(1 for _ in _TARGET_EMAIL_BYTES_RE.finditer(data_lower))
+    features.keyword_hits = [
+        kw_bytes in data_lower or kw in title_lower
+        for kw, kw_bytes in zip(KEYWORDS, _KEYWORD_BYTES)
+    ]
+    features.emails = {m.decode('ascii') for m in _EMAIL_BYTES_RE.findall(data)}
+    features.target_emails = {
+        m.decode('utf-8', 'replace') for m in _TARGET_EMAIL_BYTES_RE.findall(data)
+    }
+    if domain_matcher:
+        features.domains = domain_matcher.scan(data_lower)
+    features.credentials = summarize(iter_credentials(data))
+    return features
+
+
+# Worker-side matcher cache, keyed by the monitored domain tuple
+_worker_matchers: Dict[Tuple[str, ...], DomainMatcher] = {}
+
+
+def _analyze_range(path: str, start: int, end: int, line_base: int,
+                   title: str, domains: Tuple[str, ...]) -> ContentFeatures:
+    """Worker task: analyze bytes [start, end) of a mapped body"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        data = view[start:end]
+
+    matcher = None
+    if domains:
+        matcher = _worker_matchers.get(domains)
+        if matcher is None:
+            matcher = _worker_matchers[domains] = DomainMatcher(domains)
+
+    features = extract_content_features(data, title, matcher)
+    # Credential positions are relative to the chunk; make them document-wide
+    features.credentials.samples = [
+        record._replace(line=record.line + line_base, offset=record.offset + start)
+        for record in features.credentials.samples
+    ]
+    return features
+
+
+def split_lines(data: bytes, chunk_bytes: int) -> List[Tuple[int, int, int]]:
+    """
+    Split a body into line-aligned byte ranges
+
+    Args:
+        data: Encoded body
+        chunk_bytes: Target chunk size (a chunk ends at the last newline
+                     within this size, or the next one if a line is longer)
+
+    Returns:
+        List of (start, end, newlines before start)
+    """
+    ranges = []
+    start = 0
+    line_base = 0
+    size = len(data)
+    while start < size:
+        end = start + chunk_bytes
+        if end >= size:
+            end = size
+        else:
+            cut = data.rfind(b'\n', start, end)
+            if cut < 0:
+                cut = data.find(b'\n', end)
+            end = size if cut < 0 else cut + 1
+        ranges.append((start, end, line_base))
+        line_base += data.count(b'\n', start, end)
+        start = end
+    return ranges
+
+
+class AnalysisPool:
+    """Process pool analyzing large pastes in parallel line-aligned chunks"""
+
+    def __init__(self, workers: int = ANALYSIS_WORKERS, chunk_bytes: int = ANALYSIS_CHUNK_BYTES,
+                 min_bytes: int = ANALYSIS_POOL_MIN_BYTES):
+        """
+        Initialize the pool (worker processes start on first use)
+
+        Args:
+            workers: Worker processes (0 = one per CPU)
+            chunk_bytes: Minimum chunk size; huge bodies get larger chunks so
+                         there are about four per worker
+            min_bytes: Bodies smaller than this are analyzed in-process
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+        self.min_bytes = min_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def should_offload(self, size: int) -> bool:
+        """Whether a body of this size is worth sending to the workers"""
+        return size >= self.min_bytes
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: workers must not inherit the scanner's threads and sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(f"✓ Started analysis pool with {self.workers} workers")
+            return self._executor
+
+    def analyze(self, content: Union[bytes, str], title: str = "",
+                domains: Sequence[str] = ()) -> ContentFeatures:
+        """
+        Analyze a body across the worker processes
+
+        Args:
+            content: UTF-8 paste bytes (text is encoded first)
+            title: Paste title
+            domains: Monitored domains to match (see DomainMatcher)
+
+        Returns:
+            ContentFeatures of the whole body, identical to in-process analysis
+        """
+        data = content.encode('utf-8', 'replace') if isinstance(content, str) else content
+        chunk_bytes = max(self.chunk_bytes, -(-len(data) // (self.workers * 4)))
+        ranges = split_lines(data, chunk_bytes)
+        domains = tuple(domains)
+
+        path = None
+        try:
+            fd, path = tempfile.mkstemp(prefix='next-analysis-', dir=_SHM_DIR)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_analyze_range, path, start, end, line_base,
+                                title if i == 0 else "", domains)
+                for i, (start, end, line_base) in enumerate(ranges)
+            ]
+            features = ContentFeatures()
+            for future in futures:
+                features.merge(future.result())
+            return features
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"⚠ Analysis pool failed ({e}), analyzing in-process")
+            self.close()
+            matcher = DomainMatcher(domains) if domains else None
+            return extract_content_features(data, title, matcher)
+        finally:
+            if path:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def close(self):
+        """Shut down the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+_analysis_pool: Optional[AnalysisPool] = None
+_analysis_pool_lock = threading.Lock()
+
+
+def get_analysis_pool() -> AnalysisPool:
+    """Return the process-wide analysis pool, creating it on first use"""
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is None:
+            _analysis_pool = AnalysisPool()
+            atexit.register(_analysis_pool.close)
+        return _analysis_pool
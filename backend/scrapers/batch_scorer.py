@@ -0,0 +1,211 @@
+"""
+Batch Scorer for Project NEXT Intelligence
+Feature-matrix relevance scoring for rescoring large paste corpora
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TARGET_DOMAIN, LEAK_KEYWORDS
+
+
+@dataclass
+class ScoringWeights:
+    """
+    Relevance scoring weights
+
+    Each signal contributes ``min(cap, hits * per_hit)`` and the total is
+    capped at 1.0. ``keyword_weights`` optionally scales individual keywords
+    (a keyword listed twice in LEAK_KEYWORDS counts twice by default).
+    """
+    domain_cap: float = 0.4
+    domain_per_hit: float = 0.1
+    email_cap: float = 0.3
+    email_per_hit: float = 0.05
+    keyword_cap: float = 0.3
+    keyword_per_hit: float = 0.03
+    keyword_weights: Dict[str, float] = field(default_factory=dict)
+
+
+DEFAULT_WEIGHTS = ScoringWeights()
+
+
+def unique_keywords(keywords: Sequence[str] = LEAK_KEYWORDS) -> Tuple[List[str], List[float]]:
+    """Deduplicated keywords and how many times each appears in the list"""
+    counts: Dict[str, float] = {}
+    for keyword in keywords:
+        counts[keyword] = counts.get(keyword, 0) + 1
+    return list(counts), list(counts.values())
+
+
+def target_email_pattern(domain: str = TARGET_DOMAIN) -> str:
+    """
+    Regex matching email addresses at the given domain
+
+    The local part starts where no local-part character precedes it and is
+    at most 64 characters (RFC 5321). A leading \\b would let every dot of a
+    long dotted run start a new attempt, which backtracks quadratically.
+    """
+    return rf'(?<![\w.-])[\w.-]{{1,64}}@{re.escape(domain)}\b'
+
+
+def extract_features(text: str, title: str = "", domain: str = TARGET_DOMAIN,
+                     keywords: Sequence[str] = None) -> Tuple[int, int, List[bool]]:
+    """
+    Extract the raw scoring features of a single document
+
+    Args:
+        text: Document content
+        title: Document title (only used for keyword matching)
+        domain: Domain whose mentions and emails are counted
+        keywords: Deduplicated keyword list (see unique_keywords)
+
+    Returns:
+        Tuple of (domain mentions, target-domain emails, keyword presence flags)
+    """
+    if keywords is None:
+        keywords = unique_keywords()[0]
+    text_lower = text.lower()
+    title_lower = title.lower()
+
+    domain_hits = text_lower.count(domain)
+    email_hits = len(re.findall(target_email_pattern(domain), text_lower))
+    keyword_hits = [kw in text_lower or kw in title_lower for kw in keywords]
+    return domain_hits, email_hits, keyword_hits
+
+
+def score_features(domain_hits: int, email_hits: int, keyword_hits: float,
+                   weights: ScoringWeights = DEFAULT_WEIGHTS) -> float:
+    """
+    Score a single document from its features
+
+    Args:
+        domain_hits: Number of target domain mentions
+        email_hits: Number of target domain emails
+        keyword_hits: Weighted number of leak keywords present
+        weights: Scoring weights
+
+    Returns:
+        float: Relevance score between 0 and 1
+    """
+    score = min(weights.domain_cap, domain_hits * weights.domain_per_hit)
+    score += min(weights.email_cap, email_hits * weights.email_per_hit)
+    score += min(weights.keyword_cap, keyword_hits * weights.keyword_per_hit)
+    return min(1.0, score)
+
+
+class FeatureMatrix:
+    """
+    Hit counts of a document corpus, extracted once and rescored in bulk
+
+    Rows are documents; columns are target-domain mentions, target-domain
+    emails and per-keyword presence. Rescoring under new weights is pure
+    NumPy and never touches the document text again.
+    """
+
+    def __init__(self, ids: List[str], domain_hits: np.ndarray, email_hits: np.ndarray,
+                 keyword_hits: np.ndarray, keywords: List[str],
+                 keyword_counts: Optional[List[float]] = None):
+        self.ids = ids
+        self.domain_hits = domain_hits
+        self.email_hits = email_hits
+        self.keyword_hits = keyword_hits
+        self.keywords = keywords
+        self.keyword_counts = keyword_counts or [1.0] * len(keywords)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str, str]], domain: str = TARGET_DOMAIN,
+              keywords: Sequence[str] = LEAK_KEYWORDS) -> "FeatureMatrix":
+        """
+        Extract features from a stream of documents
+
+        Args:
+            documents: Iterable of (doc_id, text, title) tuples, consumed lazily
+            domain: Domain whose mentions and emails are counted
+            keywords: Leak keywords (duplicates count multiple times)
+
+        Returns:
+            FeatureMatrix over all documents
+        """
+        unique, counts = unique_keywords(keywords)
+        ids: List[str] = []
+        domain_hits: List[int] = []
+        email_hits: List[int] = []
+        keyword_rows = bytearray()
+
+        for doc_id, text, title in documents:
+            d, e, k = extract_features(text, title or "", domain, unique)
+            ids.append(doc_id)
+            domain_hits.append(d)
+            email_hits.append(e)
+            keyword_rows.extend(k)
+
+        keyword_hits = np.frombuffer(bytes(keyword_rows), dtype=np.uint8)
+        return cls(
+            ids,
+            np.asarray(domain_hits, dtype=np.int32),
+            np.asarray(email_hits, dtype=np.int32),
+            keyword_hits.reshape(len(ids), len(unique)),
+            unique,
+            counts,
+        )
+
+    def _keyword_vector(self, weights: ScoringWeights) -> np.ndarray:
+        return np.array(
+            [weights.keyword_weights.get(kw, count)
+             for kw, count in zip(self.keywords, self.keyword_counts)],
+            dtype=np.float64,
+        )
+
+    def score(self, weights: ScoringWeights = DEFAULT_WEIGHTS) -> np.ndarray:
+        """
+        Score every document under the given weights
+
+        Returns:
+            Array of relevance scores between 0 and 1, one per document
+        """
+        keyword_hits = self.keyword_hits @ self._keyword_vector(weights)
+        scores = np.minimum(weights.domain_cap, self.domain_hits * weights.domain_per_hit)
+        scores = scores + np.minimum(weights.email_cap, self.email_hits * weights.email_per_hit)
+        scores = scores + np.minimum(weights.keyword_cap, keyword_hits * weights.keyword_per_hit)
+        return np.minimum(1.0, scores)
+
+    def select(self, min_score: float, weights: ScoringWeights = DEFAULT_WEIGHTS) -> List[str]:
+        """IDs of documents scoring at least min_score under the given weights"""
+        mask = self.score(weights) >= min_score
+        return [self.ids[i] for i in np.flatnonzero(mask)]
+
+    def save(self, path: str):
+        """Persist the matrix (NumPy .npz, no pickled objects) so it is only extracted once"""
+        np.savez_compressed(
+            path,
+            ids=np.asarray(self.ids, dtype=str),
+            domain_hits=self.domain_hits,
+            email_hits=self.email_hits,
+            keyword_hits=self.keyword_hits,
+            keywords=np.asarray(self.keywords, dtype=str),
+            keyword_counts=np.asarray(self.keyword_counts, dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureMatrix":
+        """Load a matrix written by save() (files holding pickled objects are refused)"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['ids'].tolist(),
+                data['domain_hits'],
+                data['email_hits'],
+                data['keyword_hits'],
+                data['keywords'].tolist(),
+                data['keyword_counts'].tolist(),
+            )
@@ -0,0 +1,263 @@
+"""
+Credential Extractor for Project NEXT Intelligence
+Streaming, line-oriented extraction of structured credential records
+
+Usage:
+    python -m scrapers.credential_extractor combolist.txt [--samples 20] [--records]
+"""
+
+import argparse
+import json
+import re
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# One multiline pattern over whole chunks: "key: value" lines are tried first
+# (so "password:hunter2" is not read as user:pass), then identifier<sep>secret
+# combolist lines. Python code only runs for matching lines.
+_LINE_RE = re.compile(
+    rb'^[ \t]*(?:'
+    rb'(?P<key>kata sandi|password|passwd|pwd|pass|sandi|secret[_-]?key|secret|'
+    rb'api[_-]?key|access[_-]?key|auth[_-]?token|token|'
+    rb'username|user|login|e-mail|email)[ \t]*[:=][ \t]*(?P<value>[^\s][^\r\n]{0,255}?)'
+    rb'|'
+    rb'(?P<ident>[^\s:;|]{3,254})[ \t]*[:;|][ \t]*(?P<secret>[^\s]{3,256})'
+    rb')[ \t]*\r?$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+_EMAIL_RE = re.compile(rb'^[\w.%+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}$')
+_USERNAME_RE = re.compile(rb'^[\w.-]+$')
+# Secret part of "2024-01-01T12:30:00Z"-style timestamps split at the first colon
+_TIME_TAIL_RE = re.compile(rb'^\d{2}(?::\d{2})*(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?$')
+
+_KEY_TYPES = {
+    b'kata sandi': 'password', b'password': 'password', b'passwd': 'password',
+    b'pwd': 'password', b'pass': 'password', b'sandi': 'password',
+    b'secret': 'secret', b'token': 'token', b'auth_token': 'token', b'auth-token': 'token',
+    b'authtoken': 'token', b'username': 'username', b'user': 'username',
+    b'login': 'username', b'email': 'email', b'e-mail': 'email',
+}
+
+_HASH_FORMATS = [
+    (re.compile(rb'^\$2[abxy]?\$\d{2}\$[./A-Za-z0-9]{53}$'), 'bcrypt'),
+    (re.compile(rb'^\$argon2(?:id|i|d)\$'), 'argon2'),
+    (re.compile(rb'^\$6\$'), 'sha512crypt'),
+    (re.compile(rb'^\$5\$'), 'sha256crypt'),
+    (re.compile(rb'^\$1\$'), 'md5crypt'),
+    (re.compile(rb'^\*[0-9A-Fa-f]{40}$'), 'mysql5'),
+]
+_HEX_RE = re.compile(rb'^[0-9A-Fa-f]+$')
+_HEX_LENGTHS = {32: 'md5', 40: 'sha1', 64: 'sha256', 128: 'sha512'}
+
+CHUNK_SIZE = 4 * 1024 * 1024
+# Longest line carried between chunks; records are at most ~600 bytes
+MAX_LINE_BYTES = 64 * 1024
+
+
+class CredentialRecord(NamedTuple):
+    """One credential found in a document (the secret itself is never kept)"""
+    identifier: str
+    secret_type: str
+    line: int
+    offset: int
+    hash_format: Optional[str]
+
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+
+def guess_hash_format(secret: bytes) -> Optional[str]:
+    """
+    Guess the hash format of a secret from its shape
+
+    Returns:
+        Format name (e.g. "bcrypt", "md5") or None for plaintext-looking secrets
+    """
+    if secret.startswith(b'$') or secret.startswith(b'*'):
+        for pattern, name in _HASH_FORMATS:
+            if pattern.match(secret):
+                return name
+    name = _HEX_LENGTHS.get(len(secret))
+    if name and _HEX_RE.match(secret):
+        return name
+    return None
+
+
+def _parse_match(match, line: int, offset: int) -> Optional[CredentialRecord]:
+    """Turn a _LINE_RE match into a credential record, rejecting look-alikes"""
+    key = match.group('key')
+    if key is not None:
+        key = key.lower()
+        secret_type = _KEY_TYPES.get(key)
+        if secret_type is None:
+            secret_type = 'api_key' if b'key' in key else 'secret'
+        hash_format = guess_hash_format(match.group('value')) if secret_type == 'password' else None
+        return CredentialRecord(
+            key.decode('ascii'), 'hash' if hash_format else secret_type,
+            line, offset, hash_format
+        )
+
+    ident = match.group('ident')
+    secret = match.group('secret')
+    is_email = b'@' in ident
+    if is_email:
+        if not _EMAIL_RE.match(ident):
+            return None
+    elif ident.isdigit() or not _USERNAME_RE.match(ident):
+        # Timestamps ("12:30:00"), ports and free text
+        return None
+    if secret.startswith(b'//') or _TIME_TAIL_RE.match(secret):
+        # URLs ("https://...") and timestamps
+        return None
+
+    hash_format = guess_hash_format(secret)
+    ident = ident.decode('utf-8', 'replace')
+    return CredentialRecord(
+        ident.lower() if is_email else ident,
+        'hash' if hash_format else 'password',
+        line, offset, hash_format
+    )
+
+
+def _iter_chunks(source: Union[bytes, BinaryIO], chunk_size: int) -> Iterator[Tuple[bytes, bool]]:
+    """
+    Yield newline-aligned chunks of a byte string or binary stream, each
+    flagged with whether it is to be scanned
+
+    An unfinished line is carried into the next read only up to
+    MAX_LINE_BYTES. Longer lines cannot hold a record: they are passed
+    through unscanned (for offsets and line numbers) rather than
+    accumulated, so one giant line costs no more memory than chunk_size.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield bytes(source), True
+        return
+
+    tail = b''
+    skipping = False
+    while True:
+        block = source.read(chunk_size)
+        if not block:
+            break
+        if skipping:
+            end = block.find(b'\n') + 1
+            if end == 0:
+                yield block, False
+                continue
+            yield block[:end], False
+            block = block[end:]
+            skipping = False
+        block = tail + block
+        cut = block.rfind(b'\n') + 1
+        tail = block[cut:]
+        if cut:
+            yield block[:cut], True
+        if len(tail) > MAX_LINE_BYTES:
+            yield tail, False
+            tail = b''
+            skipping = True
+    if tail:
+        yield tail, True
+
+
+def iter_credentials(source: Union[bytes, BinaryIO],
+                     chunk_size: int = CHUNK_SIZE) -> Iterator[CredentialRecord]:
+    """
+    Stream credential records from bytes or a binary file
+
+    Input is scanned in newline-aligned chunks with a single compiled
+    pattern, so multi-GB combolists run close to read speed and memory is
+    bounded by the chunk size (plus MAX_LINE_BYTES for a line spanning two
+    reads) and whatever records the caller keeps.
+
+    Args:
+        source: Byte string or binary file object (e.g. ``open(path, 'rb')``)
+        chunk_size: Bytes read per chunk for file objects
+
+    Yields:
+        CredentialRecord for each credential-bearing line
+    """
+    base = 0
+    line = 1
+    for chunk, scan in _iter_chunks(source, chunk_size):
+        last = 0
+        for match in _LINE_RE.finditer(chunk) if scan else ():
+            start = match.start()
+            line += chunk.count(b'\n', last, start)
+            last = start
+            record = _parse_match(match, line, base + start)
+            if record:
+                yield record
+        line += chunk.count(b'\n', last)
+        base += len(chunk)
+
+
+def extract_credentials(text: str) -> Iterator[CredentialRecord]:
+    """Stream credential records from in-memory text (offsets are UTF-8 byte offsets)"""
+    return iter_credentials(text.encode('utf-8', 'replace'))
+
+
+class CredentialSummary:
+    """Counts and a bounded sample of credential records"""
+
+    def __init__(self, max_samples: int = 10):
+        self.max_samples = max_samples
+        self.total = 0
+        self.by_type: Dict[str, int] = {}
+        self.by_hash_format: Dict[str, int] = {}
+        self.samples: List[CredentialRecord] = []
+
+    def add(self, record: CredentialRecord):
+        """Count a record, keeping it only while the sample is not full"""
+        self.total += 1
+        self.by_type[record.secret_type] = self.by_type.get(record.secret_type, 0) + 1
+        if record.hash_format:
+            self.by_hash_format[record.hash_format] = self.by_hash_format.get(record.hash_format, 0) + 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append(record)
+
+    def merge(self, other: "CredentialSummary"):
+        """Fold in the summary of a later part of the same document"""
+        self.total += other.total
+        for secret_type, count in other.by_type.items():
+            self.by_type[secret_type] = self.by_type.get(secret_type, 0) + count
+        for hash_format, count in other.by_hash_format.items():
+            self.by_hash_format[hash_format] = self.by_hash_format.get(hash_format, 0) + count
+        self.samples.extend(other.samples[:self.max_samples - len(self.samples)])
+
+    def to_dict(self) -> Dict:
+        return {
+            'total': self.total,
+            'by_type': self.by_type,
+            'by_hash_format': self.by_hash_format,
+            'samples': [r.to_dict() for r in self.samples],
+        }
+
+
+def summarize(records: Iterable[CredentialRecord], max_samples: int = 10) -> CredentialSummary:
+    """Consume a record stream into a CredentialSummary"""
+    summary = CredentialSummary(max_samples)
+    for record in records:
+        summary.add(record)
+    return summary
+
+
+def main(argv: List[str] = None):
+    """Command-line entry point: summarize (or dump) credentials in a file"""
+    parser = argparse.ArgumentParser(description="Extract structured credentials from a combolist")
+    parser.add_argument('path', help="File to scan")
+    parser.add_argument('--samples', type=int, default=10, help="Number of sample records")
+    parser.add_argument('--records', action='store_true', help="Print every record as JSONL")
+    args = parser.parse_args(argv)
+
+    with open(args.path, 'rb') as f:
+        records = iter_credentials(f)
+        if args.records:
+            for record in records:
+                print(json.dumps(record.to_dict()))
+        else:
+            print(json.dumps(summarize(records, args.samples).to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
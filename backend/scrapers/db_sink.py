@@ -0,0 +1,249 @@
+"""
+Database Sink for Project NEXT Intelligence
+Batched persistence of scans and findings to the Supabase/Postgres schema
+
+Findings are buffered and written with COPY into a temporary staging table
+followed by one INSERT ... ON CONFLICT DO NOTHING, so thousands of rows
+cost one round trip. Row IDs are derived from (scan ID, paste URL); a retried
+or repeated flush therefore never duplicates a finding.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import psycopg
+from psycopg_pool import ConnectionPool
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    MAX_RETRIES, DATABASE_URL, DB_SINK_OWNER_ID, DB_POOL_SIZE,
+    DB_SINK_BATCH_SIZE, DB_SINK_FLUSH_INTERVAL
+)
+from scrapers.log_setup import setup_logging
+from scrapers.metrics import QUEUE_DEPTH
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_DEPTH = QUEUE_DEPTH.labels('db_sink')
+
+_RESULT_COLUMNS = (
+    'id', 'scan_id', 'user_id', 'url', 'source', 'title', 'author', 'content_preview',
+    'relevance_score', 'has_credentials', 'emails', 'target_emails', 'timestamp', 'screenshot'
+)
+_COLUMN_LIST = ', '.join(f'"{c}"' for c in _RESULT_COLUMNS)
+_SELECT_LIST = ', '.join(
+    'COALESCE("timestamp", NOW())' if c == 'timestamp' else f'"{c}"' for c in _RESULT_COLUMNS
+)
+
+_STAGE_SQL = "CREATE TEMP TABLE scan_results_stage (LIKE scan_results INCLUDING DEFAULTS) ON COMMIT DROP"
+_COPY_SQL = f"COPY scan_results_stage ({_COLUMN_LIST}) FROM STDIN"
+_MERGE_SQL = (
+    f"INSERT INTO scan_results ({_COLUMN_LIST}) "
+    f"SELECT {_SELECT_LIST} "
+    f"FROM scan_results_stage ON CONFLICT (id) DO NOTHING"
+)
+_SCAN_UPSERT_SQL = (
+    "INSERT INTO scans (id, user_id, urls, enable_clearnet, enable_darknet, crawl_authors, "
+    "status, progress, total_results, error) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+    "ON CONFLICT (id) DO UPDATE SET status = EXCLUDED.status, progress = EXCLUDED.progress, "
+    "total_results = EXCLUDED.total_results, error = EXCLUDED.error"
+)
+_SCREENSHOT_SQL = "UPDATE scan_results SET screenshot = %s WHERE id = %s"
+
+
+def finding_id(scan_id: str, url: str) -> uuid.UUID:
+    """Deterministic scan_results.id of a finding"""
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"{scan_id}:{url}")
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Paste timestamps are free text on some sites; unparseable ones become NOW()"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean(text):
+    """Postgres text cannot hold NUL bytes, which binary pastes often contain"""
+    return text.replace('\x00', '') if isinstance(text, str) else text
+
+
+class ScanResultSink:
+    """Buffered writer of scans and findings, flushed on size or time"""
+
+    def __init__(self, conninfo: str = DATABASE_URL, owner_id: str = DB_SINK_OWNER_ID,
+                 batch_size: int = DB_SINK_BATCH_SIZE,
+                 flush_interval: float = DB_SINK_FLUSH_INTERVAL,
+                 pool_size: int = DB_POOL_SIZE, pool: ConnectionPool = None):
+        """
+        Initialize the sink and start the periodic flusher
+
+        Args:
+            conninfo: Postgres connection string
+            owner_id: user_profiles.id recorded as the owner of API scans
+            batch_size: Buffered findings that trigger a flush
+            flush_interval: Seconds after which buffered findings are flushed anyway
+            pool_size: Maximum pooled connections
+            pool: Existing connection pool (conninfo and pool_size are then ignored)
+        """
+        if not owner_id:
+            raise ValueError("DB_SINK_OWNER_ID is required: scans.user_id is NOT NULL")
+        self.owner_id = owner_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pool = pool or ConnectionPool(conninfo, min_size=1, max_size=pool_size, open=True)
+
+        self._buffer: List[tuple] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_periodically, name="db-sink", daemon=True)
+        self._thread.start()
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval / 2):
+            if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def record_scan(self, scan_id: str, urls: List[str], status: str,
+                    enable_clearnet: bool = True, enable_darknet: bool = False,
+                    crawl_authors: bool = True, progress: float = 0.0,
+                    total_results: int = 0, error: str = None):
+        """
+        Insert or update the scans row (written immediately, findings reference it)
+
+        Args:
+            scan_id: Scan identifier (UUID)
+            urls: Seed URLs of the scan
+            status: queued, running, completed or failed
+        """
+        with self.pool.connection() as conn:
+            conn.execute(_SCAN_UPSERT_SQL, (
+                scan_id, self.owner_id, list(urls), enable_clearnet, enable_darknet,
+                crawl_authors, status, round(progress, 2), total_results, error
+            ))
+
+    def add(self, scan_id: str, result: Dict):
+        """Buffer one finding (dict or Finding), flushing once the batch is full"""
+        url = result.get('url')
+        row = (
+            finding_id(scan_id, url), scan_id, self.owner_id, _clean(url),
+            _clean(result.get('source', 'clearnet')), _clean(result.get('title') or 'Unknown'),
+            _clean(result.get('author') or 'Unknown'), _clean(result.get('content_preview')),
+            result.get('relevance_score', 0.0), bool(result.get('has_credentials')),
+            [_clean(email) for email in result.get('emails', [])],
+            [_clean(email) for email in result.get('target_emails', [])],
+            _parse_timestamp(result.get('timestamp')), result.get('screenshot')
+        )
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+            _QUEUE_DEPTH.set(len(self._buffer))
+        if full:
+            self.flush()
+
+    def record_screenshot(self, scan_id: str, url: str, path: str):
+        """Attach an evidence screenshot captured after the finding was written"""
+        with self.pool.connection() as conn:
+            conn.execute(_SCREENSHOT_SQL, (path, finding_id(scan_id, url)))
+
+    def add_many(self, scan_id: str, results: Iterable[Dict]):
+        """Buffer every finding of a scan"""
+        for result in results:
+            self.add(scan_id, result)
+
+    def _write(self, rows: List[tuple]) -> int:
+        """COPY rows into a staging table and merge them in one transaction"""
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(_STAGE_SQL)
+            with cur.copy(_COPY_SQL) as copy:
+                for row in rows:
+                    copy.write_row(row)
+            cur.execute(_MERGE_SQL)
+            return cur.rowcount
+
+    def _write_bisecting(self, rows: List[tuple]) -> int:
+        """
+        Write rows, splitting a rejected batch until only the bad rows are left
+
+        Rejected rows are dropped; connection failures propagate so the
+        whole batch is retried.
+        """
+        try:
+            return self._write(rows)
+        except psycopg.OperationalError:
+            raise
+        except psycopg.Error as e:
+            if len(rows) == 1:
+                logger.error(f"✗ Dropping finding {rows[0][3]} rejected by Postgres: {e}")
+                return 0
+            middle = len(rows) // 2
+            return self._write_bisecting(rows[:middle]) + self._write_bisecting(rows[middle:])
+
+    def flush(self) -> int:
+        """
+        Write buffered findings
+
+        Connection failures are retried with backoff (safe: writes are
+        idempotent); if every attempt fails the rows stay buffered for the
+        next flush. Rows Postgres rejects are isolated and dropped alone.
+
+        Returns:
+            Number of newly inserted rows
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+                _QUEUE_DEPTH.set(0)
+            if not rows:
+                return 0
+
+            for attempt in range(MAX_RETRIES):
+                try:
+                    written = self._write_bisecting(rows)
+                    logger.info(f"✓ Flushed {len(rows)} findings to Postgres ({written} new)")
+                    return written
+                except psycopg.OperationalError as e:
+                    logger.warning(f"⚠ Postgres flush failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
+                    if attempt < MAX_RETRIES - 1:
+                        time.sleep(0.5 * 2 ** attempt)
+
+            with self._lock:
+                self._buffer[:0] = rows
+                _QUEUE_DEPTH.set(len(self._buffer))
+            logger.error(f"✗ Postgres unavailable, keeping {len(rows)} findings buffered")
+            return 0
+
+    def close(self):
+        """Stop the periodic flusher, flush what is left and close the pool"""
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval)
+        self.flush()
+        self.pool.close()
+
+
+_db_sink: Optional[ScanResultSink] = None
+_db_sink_lock = threading.Lock()
+
+
+def get_db_sink() -> ScanResultSink:
+    """Return the process-wide database sink, connecting on first use"""
+    global _db_sink
+    with _db_sink_lock:
+        if _db_sink is None:
+            _db_sink = ScanResultSink()
+        return _db_sink
@@ -0,0 +1,119 @@
+"""
+Body Decoding for Project NEXT Intelligence
+Charset detection from a bounded prefix of fetched bodies
+
+``response.text`` runs charset detection over the entire body whenever the
+server declares no charset, which dominates latency on multi-MB pastes and
+allocates a full decoded copy. Here the declared charset, a byte order mark
+or a bounded prefix decides the encoding, and UTF-8 bodies (nearly all
+pastes) go to analysis as the raw bytes without being decoded at all.
+"""
+
+import codecs
+import re
+from typing import Optional
+
+from charset_normalizer import from_bytes
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DECODE_SNIFF_BYTES
+
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _codec_name(label) -> Optional[str]:
+    """Canonical codec name for a charset label, or None if unknown"""
+    if isinstance(label, bytes):
+        label = label.decode('ascii', 'ignore')
+    try:
+        return codecs.lookup(label.strip()).name
+    except (LookupError, ValueError):
+        return None
+
+
+def detect_encoding(data: bytes, content_type: Optional[str] = None,
+                    sniff_bytes: int = DECODE_SNIFF_BYTES) -> str:
+    """
+    Decide the encoding of a body without scanning all of it
+
+    Order: charset in the Content-Type header, byte order mark, <meta>
+    charset in the prefix, valid UTF-8 prefix, charset_normalizer on the
+    prefix, UTF-8.
+
+    Args:
+        data: Raw body
+        content_type: Content-Type header value, if any
+        sniff_bytes: Bytes of the body inspected
+
+    Returns:
+        Canonical codec name (e.g. "utf-8", "cp1252")
+    """
+    if content_type:
+        match = _CHARSET_RE.search(content_type)
+        declared = match and _codec_name(match.group(1))
+        if declared:
+            return declared
+
+    for bom, name in _BOMS:
+        if data.startswith(bom):
+            return name
+
+    prefix = data[:sniff_bytes]
+    match = _META_CHARSET_RE.search(prefix)
+    declared = match and _codec_name(match.group(1))
+    if declared:
+        return declared
+
+    if prefix.isascii():
+        return 'utf-8'
+    try:
+        # Not final: the prefix may end inside a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    best = from_bytes(prefix).best()
+    return (best and _codec_name(best.encoding)) or 'utf-8'
+
+
+def decode_body(data: bytes, content_type: Optional[str] = None) -> str:
+    """Decode a body with its detected encoding (undecodable bytes replaced)"""
+    return data.decode(detect_encoding(data, content_type), 'replace')
+
+
+def to_utf8(data: bytes, content_type: Optional[str] = None) -> bytes:
+    """
+    A body as UTF-8 bytes, for byte-level analysis
+
+    UTF-8 and ASCII bodies are returned as-is (no copy); only bodies in
+    other encodings are transcoded.
+    """
+    encoding = detect_encoding(data, content_type)
+    if encoding in ('utf-8', 'ascii'):
+        return data
+    if encoding == 'utf-8-sig':
+        return data[len(codecs.BOM_UTF8):]
+    return data.decode(encoding, 'replace').encode('utf-8')
+
+
+def response_text(response) -> str:
+    """Decoded body of a requests response (replacement for ``response.text``)"""
+    return decode_body(response.content, response.headers.get('Content-Type'))
+
+
+def response_utf8(response) -> bytes:
+    """Body of a requests response as UTF-8 bytes"""
+    return to_utf8(response.content, response.headers.get('Content-Type'))
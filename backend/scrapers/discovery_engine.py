@@ -10,7 +10,7 @@ import time
 import logging
 import re
 import random
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 
@@ -20,58 +20,227 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import (
     TARGET_DOMAIN, REQUEST_DELAY, MAX_RETRIES,
-    MIN_RELEVANCE_SCORE, LEAK_KEYWORDS, USER_AGENTS,
-    CLEARNET_SOURCES, LOG_FILE
+    MIN_RELEVANCE_SCORE, HIGH_PRIORITY_SCORE, LEAK_KEYWORDS, USER_AGENTS,
+    CLEARNET_SOURCES, ENABLE_JS_RENDER, JS_RENDER_MIN_TEXT,
+    JS_CONTENT_SELECTORS, MONITORED_DOMAINS, ENABLE_ANALYSIS_POOL, PASTEBIN_BASE_URL,
+    FRONTIER_FETCH_BUDGET
+)
+from scrapers.log_setup import setup_logging
+from scrapers.source_registry import get_source_registry, source_of
+from scrapers.frontier import Frontier, get_yield_history
+from scrapers.metrics import REQUEST_RETRIES
+from scrapers.retry_policy import get_retry_policy
+from scrapers.transport import get_session
+from scrapers.tracing import span, stage
+from scrapers.domain_matcher import DomainMatcher
+from scrapers.credential_extractor import extract_credentials
+from scrapers.batch_scorer import (
+    DEFAULT_WEIGHTS, extract_features, score_features, unique_keywords
+)
+from scrapers.findings import Finding, StringTable
+from scrapers.decoding import decode_body, response_text, response_utf8
+from scrapers.analysis_pool import (
+    EMAIL_RE, TARGET_EMAIL_RE, extract_content_features, get_analysis_pool
 )
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
+# Markup stripped before measuring how much visible text a page really has
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_NOSCRIPT_JS_RE = re.compile(r'<noscript\b[^>]*>[^<]*javascript', re.IGNORECASE)
+
+# Leak keywords deduplicated once, with how often each is listed
+_KEYWORDS, _KEYWORD_COUNTS = unique_keywords(LEAK_KEYWORDS)
+
 
 class DiscoveryOrchestrator:
     """Main orchestrator for clearnet discovery with relevance scoring"""
     
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, browser_pool=None, screenshot_queue=None, source_registry=None,
+                 monitored_domains: List[str] = None, paste_store=None,
+                 exposure_filter=None, analysis_pool=None, string_table=None,
+                 yield_history=None, retry_policy=None, session=None, on_screenshot=None):
+        """
+        Initialize the orchestrator
+
+        Args:
+            browser_pool: BrowserPool used for JS-rendered pastes
+                          (defaults to the shared pool, created on first escalation)
+            screenshot_queue: ScreenshotQueue capturing evidence for
+                              high-priority findings (disabled if None)
+            source_registry: SourceRegistry recording per-source statistics
+                             (defaults to the shared registry)
+            monitored_domains: Domains scored in the same pass as TARGET_DOMAIN
+                               (defaults to MONITORED_DOMAINS)
+            paste_store: PasteStore keeping every fetched raw body (disabled if None)
+            exposure_filter: KnownExposureFilter used to flag newly leaked
+                             target emails (disabled if None); emails are
+                             recorded once the scan is stored, not here
+            analysis_pool: AnalysisPool for large pastes (defaults to the
+                           shared pool, created on the first large paste)
+            string_table: StringTable holding finding emails, sources and
+                          authors (defaults to a table of this orchestrator's
+                          own, released with its findings)
+            yield_history: YieldHistory of per-author and per-URL-shape yield
+                           used to prioritize fetching (defaults to the shared history)
+            retry_policy: RetryPolicy deciding which failures are retried
+                          (defaults to the shared policy)
+            session: requests.Session to fetch with (defaults to the shared,
+                     pooled clearnet session)
+            on_screenshot: Called with (paste URL, stored path) when an evidence
+                           capture finishes, so stored findings can be updated
+        """
+        self.session = session or get_session('clearnet')
         self.results = []
         self.visited_urls = set()
+        # Pastes whose content could not be fetched (dead pastes excluded), worth another try
+        self.unfetched_urls = set()
+        self.browser_pool = browser_pool
+        self.browser_renders = 0
+        self.screenshot_queue = screenshot_queue
+        self.on_screenshot = on_screenshot
+        self.source_registry = source_registry or get_source_registry()
+        if monitored_domains is None:
+            monitored_domains = MONITORED_DOMAINS
+        self.domain_matcher = DomainMatcher(monitored_domains) if monitored_domains else None
+        self.paste_store = paste_store
+        self.exposure_filter = exposure_filter
+        self.analysis_pool = analysis_pool
+        self.strings = string_table if string_table is not None else StringTable()
+        self.yield_history = yield_history or get_yield_history()
+        self.retry_policy = retry_policy or get_retry_policy()
     
     def _get_random_user_agent(self) -> str:
         """Return a random user agent string"""
         return random.choice(USER_AGENTS)
     
     def _make_request(self, url: str, retries: int = MAX_RETRIES) -> Optional[requests.Response]:
-        """Make HTTP request with retry logic"""
+        """
+        Make HTTP request with retry logic
+
+        Known-dead URLs are not requested again. Failures are retried only
+        when the retry policy classifies them as transient and the host's
+        retry budget allows it, after its backoff or Retry-After delay.
+        """
+        if self.retry_policy.is_dead(url):
+            logger.info(f"Skipping known-dead URL: {url}", extra={'url': url})
+            return None
         headers = {'User-Agent': self._get_random_user_agent()}
         
         for attempt in range(retries):
+            wait = self.retry_policy.host_wait(url)
+            if wait:
+                with span('retry_after_sleep', seconds=wait):
+                    time.sleep(wait)
+            started = time.monotonic()
             try:
-                response = self.session.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                time.sleep(REQUEST_DELAY)  # Rate limiting
+                with span('http.get', url=url, attempt=attempt + 1) as request_span:
+                    response = self.session.get(url, headers=headers, timeout=10)
+                    if request_span:
+                        request_span.set(status=response.status_code, bytes=len(response.content))
+                    response.raise_for_status()
+                self.source_registry.record_request(
+                    url, time.monotonic() - started, ok=True, nbytes=len(response.content),
+                    status=response.status_code
+                )
+                with span('rate_limit_sleep', seconds=REQUEST_DELAY):
+                    time.sleep(REQUEST_DELAY)  # Rate limiting
                 return response
             except requests.RequestException as e:
-                logger.warning(f"Request failed (attempt {attempt + 1}/{retries}): {url} - {str(e)}")
-                if attempt < retries - 1:
-                    time.sleep(REQUEST_DELAY * 2)
-                else:
-                    logger.error(f"Failed to fetch {url} after {retries} attempts")
+                self.source_registry.record_request(
+                    url, time.monotonic() - started, ok=False, error=str(e),
+                    status=e.response.status_code if e.response is not None else None
+                )
+                logger.warning("Request failed (attempt %d/%d): %s - %s", attempt + 1, retries, url, e,
+                               extra={'url': url})
+                delay = self.retry_policy.retry_delay(url, e, attempt, retries)
+                if delay is None:
+                    logger.error(f"Failed to fetch {url} after {attempt + 1} attempt(s)")
+                    return None
+                REQUEST_RETRIES.labels(source_of(url)).inc()
+                with span('retry_sleep', seconds=delay):
+                    time.sleep(delay)
         return None
     
+    def _needs_browser_render(self, response: requests.Response) -> bool:
+        """
+        Detect responses whose paste body is only produced by client-side JavaScript
+
+        Plain-text bodies are never escalated. HTML bodies are escalated when
+        they are empty, warn that JavaScript is required, or carry scripts but
+        almost no visible text (encrypted or script-rendered shells).
+        """
+        raw = response.content
+        if not raw or raw.isspace():
+            return True
+
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' not in content_type.lower():
+            return False
+
+        body = decode_body(raw, content_type)
+
+        if _NOSCRIPT_JS_RE.search(body):
+            return True
+
+        has_scripts = '<script' in body.lower()
+        visible_text = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub(' ', body))
+        return has_scripts and len(' '.join(visible_text.split())) < JS_RENDER_MIN_TEXT
+
+    def _render_with_browser(self, url: str) -> Optional[str]:
+        """Render a page in a pooled headless browser and return its paste text"""
+        if not ENABLE_JS_RENDER:
+            return None
+
+        if self.browser_pool is None:
+            # Imported lazily so plain-HTTP scans never load Selenium
+            from scrapers.selenium_scraper import get_browser_pool
+            self.browser_pool = get_browser_pool()
+
+        host = urlparse(url).netloc.lower()
+        selector = next(
+            (sel for site, sel in JS_CONTENT_SELECTORS.items() if host.endswith(site)),
+            None
+        )
+
+        logger.info("Escalating to browser render: %s", url, extra={'url': url})
+        rendered = self.browser_pool.render(url, wait_for_selector=selector)
+        if not rendered or rendered.get('status') != 'success':
+            return None
+
+        self.browser_renders += 1
+        return rendered.get('element_text') or rendered.get('text')
+
+    def _fetch_paste_content(self, paste_url: str, raw_url: str) -> Optional[bytes]:
+        """
+        Fetch paste content over plain HTTP, escalating to a browser only when needed
+
+        Args:
+            paste_url: URL of the paste page (rendered if escalation is needed)
+            raw_url: Raw content URL tried first over plain HTTP
+
+        Returns:
+            Paste content as UTF-8 bytes, or None if it could not be fetched
+        """
+        response = self._make_request(raw_url)
+        if response is None:
+            return None
+
+        if not self._needs_browser_render(response):
+            return response_utf8(response)
+
+        rendered = self._render_with_browser(paste_url)
+        return rendered.encode('utf-8') if rendered is not None else response_utf8(response)
+
     def _calculate_relevance_score(self, text: str, title: str = "") -> float:
         """
         Calculate relevance score based on keyword presence and domain mentions
         
-        Scoring algorithm:
+        Scoring algorithm (weights in batch_scorer.DEFAULT_WEIGHTS):
         - Domain mentions: 40% (0.4)
         - Target domain emails: 30% (0.3)
         - Leak keywords: 30% (0.3)
@@ -83,60 +252,37 @@ class DiscoveryOrchestrator:
         Returns:
             float: Relevance score between 0 and 1
         """
-        score = 0.0
-        text_lower = text.lower()
-        title_lower = title.lower()
-        
-        # Check for target domain (40% weight)
-        domain_mentions = len(re.findall(re.escape(TARGET_DOMAIN), text_lower))
-        if domain_mentions > 0:
-            score += min(0.4, domain_mentions * 0.1)
-        
-        # Check for email addresses with target domain (30% weight)
-        email_pattern = rf'\b[\w\.-]+@{re.escape(TARGET_DOMAIN)}\b'
-        email_matches = len(re.findall(email_pattern, text_lower))
-        if email_matches > 0:
-            score += min(0.3, email_matches * 0.05)
-        
-        # Check for leak keywords (30% weight)
-        keyword_matches = sum(1 for keyword in LEAK_KEYWORDS if keyword in text_lower or keyword in title_lower)
-        if keyword_matches > 0:
-            score += min(0.3, keyword_matches * 0.03)
-        
-        return min(1.0, score)
+        domain_hits, email_hits, keyword_hits = extract_features(
+            text, title, TARGET_DOMAIN, _KEYWORDS
+        )
+        weighted_keywords = sum(
+            count for hit, count in zip(keyword_hits, _KEYWORD_COUNTS) if hit
+        )
+        return score_features(domain_hits, email_hits, weighted_keywords, DEFAULT_WEIGHTS)
     
     def _extract_emails(self, text: str) -> Set[str]:
         """Extract email addresses from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        return set(re.findall(email_pattern, text))
+        return set(EMAIL_RE.findall(text))
     
     def _extract_target_domain_emails(self, text: str) -> Set[str]:
         """Extract email addresses specifically from the target domain"""
-        email_pattern = rf'\b[\w\.-]+@{re.escape(TARGET_DOMAIN)}\b'
-        return set(re.findall(email_pattern, text, re.IGNORECASE))
+        return set(TARGET_EMAIL_RE.findall(text))
     
     def _contains_credentials(self, text: str) -> bool:
         """
-        Check if text likely contains credentials (username:password format)
+        Check if text likely contains credentials (user:pass, email:pass or key: value lines)
         """
-        # Common credential patterns
-        patterns = [
-            r'\b\w+:\w+\b',  # username:password
-            r'username[:\s]+\w+',  # username: xyz
-            r'password[:\s]+\w+',  # password: xyz
-            r'email[:\s]+[\w\.-]+@[\w\.-]+',  # email: xyz@abc.com
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
+        return next(extract_credentials(text), None) is not None
     
+    def _is_pastebin(self, url: str) -> bool:
+        """Whether a URL is on Pastebin (or the PASTEBIN_BASE_URL stand-in)"""
+        return 'pastebin.com' in url or url.startswith(PASTEBIN_BASE_URL)
+
     def _get_raw_url(self, paste_url: str) -> Optional[str]:
         """Convert paste URL to raw content URL"""
-        if 'pastebin.com' in paste_url:
+        if self._is_pastebin(paste_url):
             paste_id = paste_url.split('/')[-1]
-            return f"https://pastebin.com/raw/{paste_id}"
+            return f"{PASTEBIN_BASE_URL}/raw/{paste_id}"
         elif 'paste.ee' in paste_url:
             return paste_url.replace('/p/', '/r/')
         elif 'ghostbin.com' in paste_url:
@@ -150,10 +296,10 @@ class DiscoveryOrchestrator:
         if not response:
             return {}
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response_text(response), 'html.parser')
         metadata = {}
         
-        if 'pastebin.com' in paste_url:
+        if self._is_pastebin(paste_url):
             # Extract Pastebin metadata
             title_elem = soup.find('div', class_='info-top')
             if title_elem:
@@ -174,7 +320,7 @@ class DiscoveryOrchestrator:
         
         return metadata
     
-    def analyze_paste(self, paste_url: str) -> Optional[Dict]:
+    def analyze_paste(self, paste_url: str) -> Optional[Finding]:
         """
         Analyze a single paste for relevant content
         
@@ -182,76 +328,185 @@ class DiscoveryOrchestrator:
             paste_url: URL of the paste to analyze
             
         Returns:
-            Dict with analysis results or None if not relevant
+            Finding (dict-like analysis result) or None if not relevant
         """
         if paste_url in self.visited_urls:
-            logger.info(f"Already visited: {paste_url}")
+            logger.info("Already visited: %s", paste_url, extra={'url': paste_url})
             return None
         
         self.visited_urls.add(paste_url)
-        logger.info(f"Analyzing paste: {paste_url}")
-        
-        # Get raw paste content
-        raw_url = self._get_raw_url(paste_url)
-        if not raw_url:
-            return None
-        
-        response = self._make_request(raw_url)
-        if not response:
-            return None
-        
-        # Extract content
-        content = response.text
-        
-        # Get paste metadata
-        metadata = self._extract_paste_metadata(paste_url)
-        
-        # Calculate relevance
-        relevance_score = self._calculate_relevance_score(
-            content, 
-            metadata.get('title', '')
-        )
+        logger.info("Analyzing paste: %s", paste_url, extra={'url': paste_url})
+        
+        with span('analyze_paste', url=paste_url) as paste_span:
+            # Get raw paste content
+            raw_url = self._get_raw_url(paste_url)
+            if not raw_url:
+                return None
+        
+            # Extract content (plain HTTP first, browser only for script-rendered pastes)
+            with stage('fetch'):
+                content = self._fetch_paste_content(paste_url, raw_url)
+            if content is None:
+                if not self.retry_policy.is_dead(raw_url):
+                    self.unfetched_urls.add(paste_url)
+                return None
+        
+            # Get paste metadata
+            with stage('metadata'):
+                metadata = self._extract_paste_metadata(paste_url)
+
+            # Keep the raw body so it can be re-analyzed without refetching
+            content_hash = None
+            if self.paste_store is not None:
+                with span('store'):
+                    content_hash = self.paste_store.put(content, paste_url.strip(), metadata)
+
+            result = self.analyze_content(paste_url, content, metadata, content_hash)
+            self.source_registry.record_hit(paste_url, result is not None)
+            self.yield_history.record(paste_url, result is not None, metadata.get('author'))
+            if paste_span:
+                paste_span.set(relevant=result is not None, bytes=len(content))
+
+            if result and self.screenshot_queue and result['relevance_score'] >= HIGH_PRIORITY_SCORE:
+                # Captured in the background; the path is filled in once stored
+                self.screenshot_queue.submit(
+                    paste_url, on_done=lambda path: self._screenshot_done(result, path)
+                )
+
+            return result
+
+    def _screenshot_done(self, result: Finding, path: Optional[str]):
+        """Attach a finished capture (None if it failed) to its finding and report it"""
+        if path:
+            result['screenshot'] = path
+        if self.on_screenshot:
+            self.on_screenshot(result['url'], path)
+
+    def analyze_content(self, paste_url: str, content: Union[bytes, str], metadata: Dict = None,
+                        content_hash: str = None) -> Optional[Finding]:
+        """
+        Analyze already-fetched paste content (no network access)
+
+        Args:
+            paste_url: URL the content was fetched from
+            content: Paste content (UTF-8 bytes, or text)
+            metadata: Paste metadata (title, author, timestamp)
+            content_hash: PasteStore reference of the raw body
+
+        Returns:
+            Finding (dict-like analysis result) or None if not relevant
+        """
+        metadata = metadata or {}
+        title = metadata.get('title', '')
+        # Patterns run on the raw bytes; only the preview is ever decoded
+        data = content.encode('utf-8', 'replace') if isinstance(content, str) else content
+
+        # One pass extracts every feature; large dumps are split across processes
+        features = None
+        with stage('extract'):
+            if ENABLE_ANALYSIS_POOL or self.analysis_pool is not None:
+                if self.analysis_pool is None:
+                    self.analysis_pool = get_analysis_pool()
+                if self.analysis_pool.should_offload(len(data)):
+                    domains = self.domain_matcher.domains if self.domain_matcher else ()
+                    features = self.analysis_pool.analyze(data, title, domains)
+            if features is None:
+                features = extract_content_features(data, title, self.domain_matcher)
+
+        with stage('score'):
+            # Calculate relevance
+            relevance_score = features.relevance_score()
+
+            # Score every monitored organization from the same content
+            domain_scores = None
+            if self.domain_matcher:
+                domain_scores = features.domain_scores()
+                relevance_score = max(
+                    [relevance_score] + [d['relevance_score'] for d in domain_scores.values()]
+                )
         
         if relevance_score < MIN_RELEVANCE_SCORE:
-            logger.info(f"Low relevance score ({relevance_score:.2f}), skipping")
+            logger.info("Low relevance score (%.2f), skipping", relevance_score,
+                        extra={'url': paste_url, 'relevance_score': relevance_score})
             return None
         
         # Extract information
-        all_emails = self._extract_emails(content)
-        target_emails = self._extract_target_domain_emails(content)
-        has_creds = self._contains_credentials(content)
-        
-        result = {
-            'url': paste_url.strip(),
-            'source': 'pastebin' if 'pastebin.com' in paste_url else 'clearnet',
-            'title': metadata.get('title', 'Unknown'),
-            'author': metadata.get('author', 'Unknown'),
-            'timestamp': metadata.get('timestamp', datetime.now().isoformat()),
-            'relevance_score': round(relevance_score, 2),
-            'emails': list(all_emails),
-            'target_emails': list(target_emails),
-            'has_credentials': has_creds,
-            'content_preview': content[:500] if content else ''
-        }
-        
-        logger.info(f"✓ Found relevant paste! Score: {relevance_score:.2f}")
-        logger.info(f"  Target emails: {len(target_emails)}, All emails: {len(all_emails)}")
+        all_emails = features.emails
+        target_emails = set(features.target_emails)
+        if domain_scores:
+            for scores in domain_scores.values():
+                target_emails.update(scores['target_emails'])
+        new_target_emails = None
+        if self.exposure_filter is not None:
+            new_target_emails = self.exposure_filter.partition_new(target_emails, record=False)
+        credentials = features.credentials
+        
+        result = Finding(
+            self.strings,
+            url=paste_url.strip(),
+            source='pastebin' if self._is_pastebin(paste_url) else 'clearnet',
+            title=metadata.get('title', 'Unknown'),
+            author=metadata.get('author', 'Unknown'),
+            timestamp=metadata.get('timestamp', datetime.now().isoformat()),
+            relevance_score=round(relevance_score, 2),
+            emails=all_emails,
+            target_emails=target_emails,
+            credentials=credentials,
+            content_preview=data[:2000].decode('utf-8', 'replace')[:500],
+            content_hash=content_hash,
+            domains=domain_scores,
+            new_target_emails=new_target_emails
+        )
+
+        logger.info(
+            "✓ Found relevant paste! Score: %.2f, target emails: %d, all emails: %d",
+            relevance_score, len(target_emails), len(all_emails),
+            extra={'url': paste_url, 'relevance_score': relevance_score}
+        )
         
         return result
     
-    def crawl_user_pastes(self, username: str, base_url: str = "https://pastebin.com") -> List[Dict]:
+    def reanalyze_stored(self, paste_store=None) -> List[Finding]:
         """
-        Crawl all pastes from a specific user
+        Re-analyze every stored paste body from local storage
+
+        Uses the current keywords, domains and thresholds; nothing is refetched.
+        Emails are not recorded as known exposures, so re-analysis never hides
+        a later first sighting.
+
+        Args:
+            paste_store: PasteStore to read (defaults to this orchestrator's store)
+
+        Returns:
+            List of relevant results, highest score first
+        """
+        store = paste_store or self.paste_store
+        if store is None:
+            return []
+
+        results = []
+        for ref, body in store.iter_bodies():
+            metadata = {k: ref[k] for k in ('title', 'author', 'timestamp') if k in ref}
+            result = self.analyze_content(ref.get('url') or '', body, metadata, ref['hash'])
+            if result:
+                results.append(result)
+
+        results.sort(key=lambda x: x['relevance_score'], reverse=True)
+        logger.info(f"Re-analyzed {len(store)} stored pastes, {len(results)} relevant")
+        return results
+    
+    def list_user_pastes(self, username: str, base_url: str = None) -> List[Tuple[str, str]]:
+        """
+        List the pastes on a user's profile page without fetching them
         
         Args:
-            username: Username to crawl
-            base_url: Base URL of the paste site
+            username: Username to list
+            base_url: Base URL of the paste site (defaults to PASTEBIN_BASE_URL)
             
         Returns:
-            List of relevant pastes from this user
+            (paste URL, title) pairs, at most 10
         """
-        logger.info(f"Crawling pastes from user: {username}")
-        
+        base_url = base_url or PASTEBIN_BASE_URL
         user_url = f"{base_url}/u/{username}"
         response = self._make_request(user_url)
         
@@ -259,25 +514,43 @@ class DiscoveryOrchestrator:
             logger.error(f"Failed to fetch user page: {user_url}")
             return []
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        user_results = []
+        soup = BeautifulSoup(response_text(response), 'html.parser')
         
         # Find all paste links on the user's page
         paste_links = soup.find_all('a', href=re.compile(r'^/[A-Za-z0-9]{8}$'))
         
         logger.info(f"Found {len(paste_links)} pastes from user {username}")
         
+        pastes = []
         for link in paste_links[:10]:  # Limit to 10 pastes per user
             paste_id = link.get('href', '').strip('/')
-            if not paste_id:
-                continue
+            if paste_id:
+                pastes.append((f"{base_url}/{paste_id}", link.get_text(strip=True)))
+        return pastes
+    
+    def crawl_user_pastes(self, username: str, base_url: str = None) -> List[Finding]:
+        """
+        Crawl all pastes from a specific user
+        
+        Args:
+            username: Username to crawl
+            base_url: Base URL of the paste site (defaults to PASTEBIN_BASE_URL)
             
-            paste_url = f"{base_url}/{paste_id}"
+        Returns:
+            List of relevant pastes from this user
+        """
+        logger.info(f"Crawling pastes from user: {username}")
+        
+        with span('crawl_user_pastes', username=username):
+            frontier = Frontier(self.source_registry, self.yield_history)
+            for paste_url, title in self.list_user_pastes(username, base_url):
+                frontier.push(paste_url, title=title, author=username)
             
-            # Analyze each paste
-            result = self.analyze_paste(paste_url)
-            if result:
-                user_results.append(result)
+            user_results = []
+            while frontier:
+                result = self.analyze_paste(frontier.pop().url)
+                if result:
+                    user_results.append(result)
         
         logger.info(f"Found {len(user_results)} relevant pastes from {username}")
         return user_results
@@ -286,7 +559,8 @@ class DiscoveryOrchestrator:
                           clearnet_urls: List[str] = None,
                           enable_clearnet: bool = True,
                           enable_darknet: bool = False,
-                          crawl_authors: bool = True) -> Dict:
+                          crawl_authors: bool = True,
+                          max_fetches: int = FRONTIER_FETCH_BUDGET) -> Dict:
         """
         Run complete discovery across clearnet
         
@@ -295,6 +569,7 @@ class DiscoveryOrchestrator:
             enable_clearnet: Whether to run clearnet discovery
             enable_darknet: Whether to run darknet discovery (not implemented)
             crawl_authors: Whether to crawl paste authors' profiles
+            max_fetches: Pastes fetched at most, best-first (0 = no limit)
             
         Returns:
             Dictionary with all results and metadata
@@ -306,66 +581,91 @@ class DiscoveryOrchestrator:
         logger.info("="*70)
         
         all_results = []
-        authors_to_crawl = set()
+        crawled_authors = set()
         
         # Run clearnet discovery
         if enable_clearnet and clearnet_urls:
             try:
-                # Analyze provided URLs
-                for url in clearnet_urls:
-                    result = self.analyze_paste(url)
-                    if result:
-                        all_results.append(result)
-                        
-                        # Collect authors for crawling
-                        if crawl_authors and result.get('author') and result['author'] != 'Unknown':
-                            authors_to_crawl.add(result['author'])
+                # Fetch best-first: likeliest leaks (by source, author, title and
+                # URL-shape yield) come out of the request budget first
+                frontier = Frontier(self.source_registry, self.yield_history)
+                frontier.extend(clearnet_urls)
+                fetched = 0
+                while frontier and not (max_fetches and fetched >= max_fetches):
+                    paste_url = frontier.pop().url
+                    # Visited and known-dead pastes return without a request
+                    if paste_url not in self.visited_urls and \
+                            not self.retry_policy.is_dead(self._get_raw_url(paste_url)):
+                        fetched += 1
+                    result = self.analyze_paste(paste_url)
+                    if not result:
+                        continue
+                    all_results.append(result)
+                    
+                    # Queue the author's other pastes in the same frontier
+                    author = result.get('author')
+                    if crawl_authors and author and author != 'Unknown' and author not in crawled_authors:
+                        crawled_authors.add(author)
+                        logger.info(f"Crawling pastes from user: {author}")
+                        for paste_url, title in self.list_user_pastes(author):
+                            frontier.push(paste_url, title=title, author=author)
                 
-                # Crawl identified authors
-                if crawl_authors and authors_to_crawl:
-                    logger.info(f"\nCrawling {len(authors_to_crawl)} identified authors...")
-                    for author in authors_to_crawl:
-                        author_results = self.crawl_user_pastes(author)
-                        all_results.extend(author_results)
+                if frontier:
+                    logger.info(f"Fetch budget of {max_fetches} spent, {len(frontier)} pastes left unfetched")
                 
             except Exception as e:
                 logger.error(f"Clearnet discovery failed: {str(e)}")
         
+        output = self.package_results(all_results)
+        self.results = all_results
+        
+        logger.info("\n" + "="*70)
+        logger.info("DISCOVERY COMPLETE")
+        logger.info(f"Total relevant items found: {len(all_results)}")
+        logger.info(f"High priority items: {output['summary']['high_priority_count']}")
+        logger.info(f"Total target domain emails: {output['summary']['total_target_emails']}")
+        logger.info("="*70 + "\n")
+        
+        return output
+
+    def package_results(self, all_results: List[Finding]) -> Dict:
+        """
+        Sort findings and wrap them with metadata and a summary
+        
+        Args:
+            all_results: Relevant findings (sorted in place by relevance)
+            
+        Returns:
+            Dictionary with metadata, summary and results
+        """
         # Sort by relevance score
         all_results.sort(key=lambda x: x['relevance_score'], reverse=True)
         
         # Generate summary
-        high_priority_count = sum(1 for r in all_results if r['relevance_score'] >= 0.7)
+        high_priority_count = sum(1 for r in all_results if r['relevance_score'] >= HIGH_PRIORITY_SCORE)
         total_target_emails = sum(len(r['target_emails']) for r in all_results)
         creds_count = sum(1 for r in all_results if r['has_credentials'])
+        new_exposures = sum(len(r.get('new_target_emails', [])) for r in all_results)
         
         summary = {
             'total_results': len(all_results),
             'high_priority_count': high_priority_count,
             'total_target_emails': total_target_emails,
-            'credentials_found': creds_count
+            'credentials_found': creds_count,
+            'new_target_emails': new_exposures
         }
         
         # Package results
-        output = {
+        return {
             'metadata': {
                 'target_domain': TARGET_DOMAIN,
+                'monitored_domains': self.domain_matcher.domains if self.domain_matcher else [],
                 'timestamp': datetime.now().isoformat(),
                 'total_results': len(all_results),
                 'clearnet_results': len(all_results),
-                'darknet_results': 0
+                'darknet_results': 0,
+                'browser_renders': self.browser_renders
             },
             'summary': summary,
             'results': all_results
         }
-        
-        self.results = all_results
-        
-        logger.info("\n" + "="*70)
-        logger.info("DISCOVERY COMPLETE")
-        logger.info(f"Total relevant items found: {len(all_results)}")
-        logger.info(f"High priority items: {high_priority_count}")
-        logger.info(f"Total target domain emails: {total_target_emails}")
-        logger.info("="*70 + "\n")
-        
-        return output
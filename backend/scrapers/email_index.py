@@ -0,0 +1,173 @@
+"""
+Email Index for Project NEXT Intelligence
+Persistent inverted index from leaked email addresses to findings and pastes
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR
+from scrapers.log_setup import setup_logging
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+EMAIL_INDEX_FILE = os.path.join(OUTPUT_DIR, "email_index.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_postings (
+    email TEXT NOT NULL,
+    local_part TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    finding_id TEXT NOT NULL,
+    scan_id TEXT NOT NULL,
+    paste_url TEXT,
+    content_hash TEXT,
+    is_target INTEGER NOT NULL DEFAULT 0,
+    indexed_at TEXT NOT NULL,
+    PRIMARY KEY (email, finding_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_email_postings_local ON email_postings(local_part, email);
+"""
+
+
+def normalize_email(email: str) -> str:
+    """Normalize an email address for indexing (trimmed, lowercase)"""
+    return email.strip().strip('.').lower()
+
+
+class EmailIndex:
+    """
+    Inverted index of email -> (finding, paste), stored in SQLite
+
+    Emails are the leading column of the primary key, so exact lookups and
+    prefix searches are B-tree range scans regardless of history size.
+    """
+
+    def __init__(self, path: str = EMAIL_INDEX_FILE):
+        """
+        Open (or create) the index
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway index)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add_scan(self, scan_id: str, results: Iterable[Dict]) -> int:
+        """
+        Index the emails of a completed scan (idempotent)
+
+        Args:
+            scan_id: Scan identifier
+            results: Findings of the scan, in result order
+
+        Returns:
+            Number of new postings
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        for position, result in enumerate(results):
+            finding_id = f"{scan_id}:{position}"
+            targets = {normalize_email(e) for e in result.get('target_emails', [])}
+            emails = {normalize_email(e) for e in result.get('emails', [])} | targets
+            for email in emails:
+                local, _, domain = email.partition('@')
+                if not domain:
+                    continue
+                rows.append((
+                    email, local, domain, finding_id, scan_id,
+                    result.get('url'), result.get('content_hash'),
+                    int(email in targets), now
+                ))
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO email_postings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            added = self._conn.total_changes - before
+
+        logger.info(f"Indexed {added} email postings from scan {scan_id}")
+        return added
+
+    def lookup(self, email: str) -> List[Dict]:
+        """
+        Every finding an email address (or bare local part) appeared in
+
+        Args:
+            email: Full address, or a local part without "@"
+
+        Returns:
+            Postings, newest first
+        """
+        email = normalize_email(email)
+        if '@' in email:
+            query = "SELECT * FROM email_postings WHERE email = ? ORDER BY indexed_at DESC"
+        else:
+            query = "SELECT * FROM email_postings WHERE local_part = ? ORDER BY indexed_at DESC"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, (email,))]
+
+    def prefix_search(self, prefix: str, limit: int = 50, domain: Optional[str] = None) -> List[Dict]:
+        """
+        Distinct email addresses starting with a prefix
+
+        Args:
+            prefix: Address prefix (e.g. "budi." or "budi.s@ui")
+            limit: Maximum number of addresses returned
+            domain: Only return addresses at this domain
+
+        Returns:
+            List of {'email', 'findings'} in address order
+        """
+        prefix = normalize_email(prefix)
+        params = [prefix, prefix + '\uffff']
+        query = (
+            "SELECT email, COUNT(*) AS findings FROM email_postings "
+            "WHERE email >= ? AND email < ?"
+        )
+        if domain:
+            query += " AND domain = ?"
+            params.append(domain.lower())
+        query += " GROUP BY email ORDER BY email LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params)]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_email_index: Optional[EmailIndex] = None
+_email_index_lock = threading.Lock()
+
+
+def get_email_index() -> EmailIndex:
+    """Return the process-wide email index, opening it on first use"""
+    global _email_index
+    with _email_index_lock:
+        if _email_index is None:
+            _email_index = EmailIndex()
+        return _email_index
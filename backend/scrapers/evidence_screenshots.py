@@ -0,0 +1,258 @@
+"""
+Evidence Screenshots for Project NEXT Intelligence
+Background capture of paste content regions for high-priority findings
+"""
+
+import hashlib
+import io
+import json
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from PIL import Image
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    OUTPUT_DIR, EVIDENCE_SELECTORS,
+    SCREENSHOT_QUEUE_SIZE, SCREENSHOT_WEBP_QUALITY
+)
+from scrapers.log_setup import setup_logging
+from scrapers.metrics import QUEUE_DEPTH
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_DIR = os.path.join(OUTPUT_DIR, "evidence", "screenshots")
+
+_QUEUE_DEPTH = QUEUE_DEPTH.labels('screenshots')
+
+
+class ScreenshotStore:
+    """
+    Content-addressed, deduplicating storage for evidence screenshots
+
+    Captures are keyed on the SHA-256 of their PNG bytes, so only
+    byte-identical captures share a file. Perceptual hashes are not used:
+    text-only pastes collide under them, which would attach one paste's
+    screenshot to another paste's finding.
+    """
+
+    def __init__(self, root: str = SCREENSHOT_DIR, quality: int = SCREENSHOT_WEBP_QUALITY):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding the screenshots and their index
+            quality: WebP quality (0-100) used for encoding
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.quality = quality
+        self.index_path = self.root / "index.jsonl"
+        self._by_digest: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self):
+        """Load the PNG digest index written by previous runs"""
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._by_digest[entry['sha256']] = entry['path']
+                except (ValueError, KeyError):
+                    continue
+
+    def put(self, png: bytes, url: str = "") -> str:
+        """
+        Store a screenshot, reusing an existing file for duplicate captures
+
+        Args:
+            png: PNG bytes of the captured region
+            url: URL the capture belongs to (recorded in the index)
+
+        Returns:
+            Path of the stored image relative to OUTPUT_DIR
+        """
+        png_digest = hashlib.sha256(png).hexdigest()
+        with self._lock:
+            existing = self._by_digest.get(png_digest)
+            if existing:
+                return existing
+
+        image = Image.open(io.BytesIO(png))
+        encoded = io.BytesIO()
+        image.save(encoded, format='WEBP', quality=self.quality, method=4)
+        data = encoded.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
+
+        target = self.root / digest[:2] / f"{digest}.webp"
+        target.parent.mkdir(exist_ok=True)
+        if not target.exists():
+            tmp = target.with_suffix('.tmp')
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
+
+        relative = os.path.relpath(target, OUTPUT_DIR)
+        with self._lock:
+            self._by_digest[png_digest] = relative
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'sha256': png_digest, 'path': relative, 'url': url}) + '\n')
+
+        logger.info(f"✓ Evidence screenshot stored: {relative} ({len(png)} → {len(data)} bytes)")
+        return relative
+
+
+class ScreenshotQueue:
+    """
+    Background queue capturing evidence screenshots without blocking scans
+
+    Captures run on worker threads using browsers borrowed from a BrowserPool,
+    so analysis continues while the (slow) page load and encode happen.
+    """
+
+    def __init__(self, browser_pool=None, store: ScreenshotStore = None,
+                 workers: int = 1, max_pending: int = SCREENSHOT_QUEUE_SIZE):
+        """
+        Initialize the queue
+
+        Args:
+            browser_pool: BrowserPool used for captures (shared pool by default)
+            store: ScreenshotStore receiving the images
+            workers: Number of capture threads
+            max_pending: Captures queued beyond this are dropped
+        """
+        self.browser_pool = browser_pool
+        self.store = store
+        self.workers = workers
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._threads_lock = threading.Lock()
+
+    def start(self):
+        """Start the capture worker threads (once, however many scans submit at a time)"""
+        with self._threads_lock:
+            if self._threads:
+                return
+            if self.store is None:
+                self.store = ScreenshotStore()
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"screenshot-worker-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        """Stop the worker threads after the queued captures finish"""
+        with self._threads_lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    def submit(self, url: str,
+               on_done: Callable[[Optional[str]], None] = None) -> Optional[Future]:
+        """
+        Queue a screenshot of a paste's content region
+
+        Args:
+            url: Paste URL to capture
+            on_done: Called with the stored path (or None) once captured
+
+        Returns:
+            Future resolving to the stored path, or None if the queue is full
+        """
+        if not self._threads:
+            self.start()
+
+        with self._lock:
+            future = self._pending.get(url)
+            if future is None:
+                future = Future()
+                try:
+                    self._queue.put_nowait((url, future))
+                except queue.Full:
+                    logger.warning(f"⚠ Screenshot queue full, dropping capture of {url}")
+                    return None
+                _QUEUE_DEPTH.inc()
+                self._pending[url] = future
+
+        if on_done:
+            future.add_done_callback(lambda f: on_done(f.result()))
+        return future
+
+    def is_pending(self, url: str) -> bool:
+        """Whether a capture of the URL is queued or running"""
+        with self._lock:
+            return url in self._pending
+
+    def _worker(self):
+        """Capture queued URLs until a stop sentinel is received"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            url, future = item
+            _QUEUE_DEPTH.dec()
+            path = None
+            try:
+                path = self._capture(url)
+            except Exception as e:
+                logger.error(f"✗ Evidence capture failed for {url}: {e}")
+            finally:
+                # Resolved before leaving _pending, so is_pending() stays true
+                # until the on_done callbacks have run
+                future.set_result(path)
+                with self._lock:
+                    self._pending.pop(url, None)
+                self._queue.task_done()
+
+    def _capture(self, url: str) -> Optional[str]:
+        """Capture and store the content region of a single paste"""
+        if self.browser_pool is None:
+            from scrapers.selenium_scraper import get_browser_pool
+            self.browser_pool = get_browser_pool()
+        if not self.browser_pool.available:
+            return None
+
+        host = urlparse(url).netloc.lower()
+        selector = next(
+            (sel for site, sel in EVIDENCE_SELECTORS.items() if host.endswith(site)),
+            None
+        )
+
+        with self.browser_pool.acquire(timeout=60) as scraper:
+            png = scraper.screenshot_element(url, selector)
+        if not png:
+            return None
+
+        return self.store.put(png, url)
+
+
+_screenshot_queue: Optional[ScreenshotQueue] = None
+_screenshot_queue_lock = threading.Lock()
+
+
+def get_screenshot_queue() -> ScreenshotQueue:
+    """Return the process-wide screenshot queue, creating it on first use"""
+    global _screenshot_queue
+    with _screenshot_queue_lock:
+        if _screenshot_queue is None:
+            _screenshot_queue = ScreenshotQueue()
+        return _screenshot_queue
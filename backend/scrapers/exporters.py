@@ -0,0 +1,207 @@
+"""
+Result Exporters for Project NEXT Intelligence
+Streaming JSONL, CSV and Parquet export of scan findings
+
+Each exporter is a generator of byte chunks that holds at most one batch
+of rows, so exports of any size can be streamed straight into an HTTP
+response, a file or a SIEM pipe.
+
+Usage:
+    python -m scrapers.exporters results.json --format parquet [-o findings.parquet]
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR
+
+EXPORT_FORMATS = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Flat columns shared by the CSV and Parquet exports
+EXPORT_COLUMNS = [
+    'url', 'source', 'title', 'author', 'timestamp', 'relevance_score', 'has_credentials',
+    'credentials_total', 'emails', 'target_emails', 'new_target_emails',
+    'content_hash', 'screenshot', 'content_preview'
+]
+_LIST_COLUMNS = {'emails', 'target_emails', 'new_target_emails'}
+
+PARQUET_BATCH_SIZE = 10000
+
+
+def _flat_row(result: Dict) -> Dict:
+    """One finding (dict or Finding) as flat export columns"""
+    return {
+        'url': result.get('url'),
+        'source': result.get('source'),
+        'title': result.get('title'),
+        'author': result.get('author'),
+        'timestamp': result.get('timestamp'),
+        'relevance_score': result.get('relevance_score'),
+        'has_credentials': bool(result.get('has_credentials')),
+        'credentials_total': (result.get('credentials') or {}).get('total', 0),
+        'emails': list(result.get('emails') or []),
+        'target_emails': list(result.get('target_emails') or []),
+        'new_target_emails': result.get('new_target_emails'),
+        'content_hash': result.get('content_hash'),
+        'screenshot': result.get('screenshot'),
+        'content_preview': result.get('content_preview'),
+    }
+
+
+def iter_jsonl(results: Iterable[Dict]) -> Iterator[bytes]:
+    """Findings as JSON lines (full result shape, one finding per line)"""
+    for result in results:
+        if hasattr(result, 'to_dict'):
+            result = result.to_dict()
+        yield json.dumps(result, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def iter_csv(results: Iterable[Dict]) -> Iterator[bytes]:
+    """Findings as CSV with a header row (email lists joined with ';')"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for result in results:
+        row = _flat_row(result)
+        for column in _LIST_COLUMNS:
+            row[column] = ';'.join(row[column] or [])
+        writer.writerow(row)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_parquet(results: Iterable[Dict], batch_size: int = PARQUET_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Findings as a Parquet file, one row group per batch
+
+    Args:
+        results: Findings (dicts or Finding objects)
+        batch_size: Rows per row group (bounds memory use)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('url', pa.string()), ('source', pa.string()), ('title', pa.string()),
+        ('author', pa.string()), ('timestamp', pa.string()), ('relevance_score', pa.float64()),
+        ('has_credentials', pa.bool_()), ('credentials_total', pa.int64()),
+        ('emails', pa.list_(pa.string())), ('target_emails', pa.list_(pa.string())),
+        ('new_target_emails', pa.list_(pa.string())), ('content_hash', pa.string()),
+        ('screenshot', pa.string()), ('content_preview', pa.string()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+
+    def row_group(rows: List[Dict]):
+        columns = {name: [row[name] for row in rows] for name in EXPORT_COLUMNS}
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+    batch: List[Dict] = []
+    for result in results:
+        batch.append(_flat_row(result))
+        if len(batch) >= batch_size:
+            row_group(batch)
+            batch = []
+            yield sink.drain()
+    if batch:
+        row_group(batch)
+    writer.close()
+    yield sink.drain()
+
+
+EXPORTERS = {
+    'jsonl': iter_jsonl,
+    'csv': iter_csv,
+    'parquet': iter_parquet,
+}
+
+
+def export(results: Iterable[Dict], fmt: str) -> Iterator[bytes]:
+    """
+    Stream findings in an export format
+
+    Args:
+        results: Findings (dicts or Finding objects)
+        fmt: One of EXPORT_FORMATS
+
+    Returns:
+        Iterator of byte chunks
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return EXPORTERS[fmt](results)
+
+
+def _read_findings(path: str) -> Iterator[Dict]:
+    """Findings from a JSONL file (streamed) or a scan results JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f).get('results', [])
+
+
+def main(argv: List[str] = None):
+    """Command-line entry point: convert saved scan results to an export format"""
+    parser = argparse.ArgumentParser(description="Export scan findings as JSONL, CSV or Parquet")
+    parser.add_argument('input', help="Scan results JSON (from /api/results) or findings JSONL")
+    parser.add_argument('--format', choices=sorted(EXPORTERS), default='jsonl', help="Export format")
+    parser.add_argument('-o', '--output', help="Output file (default: OUTPUT_DIR/exports/...)")
+    args = parser.parse_args(argv)
+
+    output = args.output
+    if output is None:
+        name = os.path.splitext(os.path.basename(args.input))[0]
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(OUTPUT_DIR, 'exports', f"{name}_{stamp}.{args.format}")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, 'wb') as f:
+        for chunk in export(_read_findings(args.input), args.format):
+            f.write(chunk)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
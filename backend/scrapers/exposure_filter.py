@@ -0,0 +1,254 @@
+"""
+Exposure Filter for Project NEXT Intelligence
+Tracks already-known leaked target identities so findings can flag new ones
+"""
+
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import struct
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR, EXPOSURE_FILTER_CAPACITY, EXPOSURE_FILTER_ERROR_RATE
+from scrapers.log_setup import setup_logging
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+EXPOSURE_BLOOM_FILE = os.path.join(OUTPUT_DIR, "known_exposures.bloom")
+EXPOSURE_DB_FILE = os.path.join(OUTPUT_DIR, "known_exposures.db")
+
+_BLOOM_MAGIC = b'NXBF'
+_SQL_BATCH = 500  # below SQLite's bound-parameter limit
+_BLOOM_HEADER = struct.Struct('<4sQIQ')
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Size the filter
+
+        Args:
+            capacity: Number of items before the error rate is exceeded
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def save(self, path: str):
+        """Write the filter atomically"""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, capacity: int, error_rate: float) -> Optional["BloomFilter"]:
+        """Read a filter written by save(), or None if missing or corrupt"""
+        try:
+            with open(path, 'rb') as f:
+                magic, num_bits, num_hashes, count = _BLOOM_HEADER.unpack(f.read(_BLOOM_HEADER.size))
+                bits = bytearray(f.read())
+        except (OSError, struct.error):
+            return None
+        if magic != _BLOOM_MAGIC or len(bits) != (num_bits + 7) // 8:
+            return None
+
+        bloom = cls(capacity, error_rate)
+        bloom.num_bits, bloom.num_hashes, bloom.count, bloom.bits = num_bits, num_hashes, count, bits
+        return bloom
+
+
+class KnownExposureFilter:
+    """
+    Membership test for target emails already seen in earlier leaks
+
+    A persisted Bloom filter answers the common case (a never-seen email) in
+    constant time without touching disk; positives are confirmed against an
+    exact SQLite set so no new exposure is ever misreported as known.
+    """
+
+    def __init__(self, bloom_path: str = EXPOSURE_BLOOM_FILE, db_path: str = EXPOSURE_DB_FILE,
+                 capacity: int = EXPOSURE_FILTER_CAPACITY,
+                 error_rate: float = EXPOSURE_FILTER_ERROR_RATE):
+        """
+        Open (or create) the filter
+
+        Args:
+            bloom_path: Bloom filter file (None keeps it in memory only)
+            db_path: SQLite file holding the exact set (":memory:" for tests)
+            capacity: Initial Bloom filter capacity (doubled when exceeded)
+            error_rate: Bloom filter false-positive rate
+        """
+        self.bloom_path = bloom_path
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS known_exposures ("
+            "email TEXT PRIMARY KEY, first_seen TEXT NOT NULL, first_url TEXT"
+            ") WITHOUT ROWID"
+        )
+
+        known = self._conn.execute("SELECT COUNT(*) FROM known_exposures").fetchone()[0]
+        self.bloom = BloomFilter.load(bloom_path, capacity, error_rate) if bloom_path else None
+        if self.bloom is None or self.bloom.count != known:
+            self._rebuild(max(capacity, known * 2))
+
+    def _rebuild(self, capacity: int):
+        """Rebuild the Bloom filter from the exact set"""
+        bloom = BloomFilter(capacity, self.error_rate)
+        for (email,) in self._conn.execute("SELECT email FROM known_exposures"):
+            bloom.add(email)
+        self.bloom = bloom
+        logger.info(f"Rebuilt exposure filter: {bloom.count} known, capacity {capacity}")
+
+    def _known_among(self, emails: Set[str]) -> Set[str]:
+        """Recorded emails among a normalized set (lock held); only Bloom positives reach SQLite"""
+        candidates = [email for email in emails if email in self.bloom]
+        known = set()
+        for i in range(0, len(candidates), _SQL_BATCH):
+            batch = candidates[i:i + _SQL_BATCH]
+            rows = self._conn.execute(
+                f"SELECT email FROM known_exposures WHERE email IN ({', '.join('?' * len(batch))})", batch
+            )
+            known.update(email for (email,) in rows)
+        return known
+
+    def _insert(self, rows: List[tuple]):
+        """Record (email, first_seen, first_url) rows of new emails in one transaction (lock held)"""
+        if not rows:
+            return
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO known_exposures VALUES (?, ?, ?)", rows)
+        for email, _, _ in rows:
+            self.bloom.add(email)
+        if self.bloom.count > self.bloom.capacity:
+            self._rebuild(max(self.bloom.capacity, self.bloom.count) * 2)
+
+    def is_known(self, email: str) -> bool:
+        """Whether an email was already recorded as exposed"""
+        email = email.strip().lower()
+        with self._lock:
+            if email not in self.bloom:
+                return False
+            return self._conn.execute(
+                "SELECT 1 FROM known_exposures WHERE email = ?", (email,)
+            ).fetchone() is not None
+
+    def partition_new(self, emails: Iterable[str], url: str = None,
+                      record: bool = True) -> List[str]:
+        """
+        Return the emails not seen in any earlier leak
+
+        When recording, novelty is decided and recorded under the filter
+        lock, so concurrent scans never both report the same email.
+
+        Args:
+            emails: Target emails extracted from a paste
+            url: Paste the emails came from (stored as first sighting)
+            record: Mark the new emails as known
+
+        Returns:
+            Sorted list of newly exposed emails
+        """
+        if record:
+            return self.add(emails, url)
+        emails = {e.strip().lower() for e in emails}
+        with self._lock:
+            return sorted(emails - self._known_among(emails))
+
+    def add(self, emails: Iterable[str], url: str = None) -> List[str]:
+        """
+        Record emails as known exposures
+
+        Returns:
+            Sorted list of the emails that were not known before
+        """
+        emails = {e.strip().lower() for e in emails}
+        now = datetime.now().isoformat()
+        with self._lock:
+            new = sorted(emails - self._known_among(emails))
+            self._insert([(email, now, url) for email in new])
+        return new
+
+    def record_findings(self, findings: Iterable) -> int:
+        """
+        Record the target emails of a stored scan's findings in one transaction
+
+        Each finding's new_target_emails is narrowed to the emails this call
+        recorded, so an email found by two scans at once is new in only one.
+
+        Args:
+            findings: Findings (or result dicts) of the scan
+
+        Returns:
+            Number of newly exposed emails
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        with self._lock:
+            recorded = set()
+            for finding in findings:
+                emails = {e.strip().lower() for e in finding.get('target_emails', [])}
+                new = sorted(emails - recorded - self._known_among(emails))
+                recorded.update(new)
+                rows.extend((email, now, finding['url']) for email in new)
+                finding['new_target_emails'] = new
+            self._insert(rows)
+        return len(rows)
+
+    def save(self):
+        """Persist the Bloom filter next to the exact set"""
+        if self.bloom_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.bloom_path)), exist_ok=True)
+            with self._lock:
+                self.bloom.save(self.bloom_path)
+
+
+_exposure_filter: Optional[KnownExposureFilter] = None
+_exposure_filter_lock = threading.Lock()
+
+
+def get_exposure_filter() -> KnownExposureFilter:
+    """Return the process-wide exposure filter, opening it on first use"""
+    global _exposure_filter
+    with _exposure_filter_lock:
+        if _exposure_filter is None:
+            _exposure_filter = KnownExposureFilter()
+        return _exposure_filter
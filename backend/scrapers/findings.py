@@ -0,0 +1,173 @@
+"""
+Findings for Project NEXT Intelligence
+Compact in-memory representation of analysis results for large scans
+
+A finding keeps its fields in slots, its email lists as arrays of 32-bit
+references into its scan's string table, and its credential summary as the
+summary object itself. It still reads like the result dict it replaces
+(``finding['emails']``, ``finding.get('domains')``); the JSON shape is only
+built by to_dict() at the API boundary.
+
+Each orchestrator (one per scan or monitor poll) owns its string table, so
+the strings are released together with the scan's findings when they drop
+out of the result cache.
+"""
+
+import threading
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.credential_extractor import CredentialSummary
+
+
+class StringTable:
+    """Append-only table of distinct strings addressed by 32-bit ids"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self._strings[string_id]
+
+    def id(self, string: str) -> int:
+        """ID of a string, adding it on first sight"""
+        string_id = self._ids.get(string)
+        if string_id is None:
+            with self._lock:
+                string_id = self._ids.get(string)
+                if string_id is None:
+                    string_id = len(self._strings)
+                    self._strings.append(string)
+                    self._ids[string] = string_id
+        return string_id
+
+    def intern(self, string: str) -> str:
+        """The table's single copy of a string"""
+        return self._strings[self.id(string)]
+
+    def ids(self, strings: Iterable[str]) -> array:
+        """Pack strings as an array of ids"""
+        return array('I', [self.id(s) for s in strings])
+
+    def lookup(self, ids: array) -> List[str]:
+        """Unpack an array of ids"""
+        strings = self._strings
+        return [strings[i] for i in ids]
+
+
+_KEYS = (
+    'url', 'source', 'title', 'author', 'timestamp', 'relevance_score',
+    'emails', 'target_emails', 'has_credentials', 'credentials',
+    'content_preview', 'content_hash'
+)
+# Only present once set
+_OPTIONAL_KEYS = ('domains', 'new_target_emails', 'screenshot')
+_EMAIL_FIELDS = {
+    'emails': 'email_ids',
+    'target_emails': 'target_email_ids',
+    'new_target_emails': 'new_target_email_ids',
+}
+_PLAIN_FIELDS = {
+    'url', 'source', 'title', 'author', 'timestamp', 'relevance_score',
+    'content_preview', 'content_hash', 'domains', 'screenshot'
+}
+
+
+class Finding(Mapping):
+    """One relevant paste, read-compatible with the original result dict"""
+
+    __slots__ = (
+        'strings', 'url', 'source', 'title', 'author', 'timestamp', 'relevance_score',
+        'email_ids', 'target_email_ids', 'credential_summary', 'content_preview',
+        'content_hash', 'domains', 'new_target_email_ids', 'screenshot'
+    )
+
+    def __init__(self, strings: StringTable, url: str, source: str, title: str, author: str,
+                 timestamp: str, relevance_score: float, emails: Iterable[str],
+                 target_emails: Iterable[str], credentials: CredentialSummary,
+                 content_preview: str, content_hash: Optional[str] = None,
+                 domains: Optional[Dict[str, Dict]] = None,
+                 new_target_emails: Optional[Iterable[str]] = None):
+        """
+        Build a finding
+
+        Args:
+            strings: Table holding emails, sources and authors
+            credentials: Credential summary of the paste
+            domains: Per monitored domain scores (if domains are monitored)
+            new_target_emails: Target emails not seen in earlier leaks
+                               (if the exposure filter is enabled)
+            (other arguments are the result fields of the same name)
+        """
+        self.strings = strings
+        self.url = url
+        self.source = strings.intern(source)
+        self.title = title
+        self.author = strings.intern(author)
+        self.timestamp = timestamp
+        self.relevance_score = relevance_score
+        self.email_ids = strings.ids(emails)
+        self.target_email_ids = strings.ids(target_emails)
+        self.credential_summary = credentials
+        self.content_preview = content_preview
+        self.content_hash = content_hash
+        self.domains = domains
+        self.new_target_email_ids = None if new_target_emails is None else strings.ids(new_target_emails)
+        self.screenshot = None
+
+    def _present(self, key: str) -> bool:
+        if key in _KEYS:
+            return True
+        field = _EMAIL_FIELDS.get(key, key)
+        return key in _OPTIONAL_KEYS and getattr(self, field) is not None
+
+    def __getitem__(self, key: str):
+        if not self._present(key):
+            raise KeyError(key)
+        if key in _EMAIL_FIELDS:
+            return self.strings.lookup(getattr(self, _EMAIL_FIELDS[key]))
+        if key == 'has_credentials':
+            return self.credential_summary.total > 0
+        if key == 'credentials':
+            return self.credential_summary.to_dict()
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key in _EMAIL_FIELDS:
+            setattr(self, _EMAIL_FIELDS[key], self.strings.ids(value))
+        elif key in _PLAIN_FIELDS:
+            setattr(self, key, value)
+        else:
+            raise KeyError(f"{key} cannot be set on a Finding")
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _KEYS
+        for key in _OPTIONAL_KEYS:
+            if self._present(key):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Finding({self.url!r}, relevance_score={self.relevance_score})"
+
+    def to_dict(self) -> Dict:
+        """JSON-ready result dict"""
+        return {key: self[key] for key in self}
+
+
+def findings_to_dicts(results: Iterable) -> List[Dict]:
+    """Convert findings (or plain result dicts) to their JSON shape"""
+    return [r.to_dict() if isinstance(r, Finding) else r for r in results]
+
@@ -0,0 +1,253 @@
+"""
+Fetch Frontier for Project NEXT Intelligence
+Best-first queue of paste URLs scored from signals available before fetching
+
+Each URL is scored from its source's live statistics (SourceRegistry), its
+author's history, the title shown on the listing it came from, and the past
+yield of URLs of the same shape. The highest-scoring URL is fetched next,
+so a rate-limited request budget is spent on the likeliest leaks first.
+Scores are refreshed when popped, so what the scan learns along the way
+(e.g. an author's first relevant paste) reorders the rest of the queue.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR, LEAK_KEYWORDS, TARGET_DOMAIN
+from scrapers.log_setup import setup_logging
+from scrapers.source_registry import get_source_registry, source_of
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+YIELD_HISTORY_FILE = os.path.join(OUTPUT_DIR, "yield_history.json")
+
+# Relative weight of each signal; signals unknown for a URL (no title, new
+# author) are left out rather than guessed
+SIGNAL_WEIGHTS = {
+    'source': 0.25,
+    'author': 0.35,
+    'title': 0.25,
+    'shape': 0.15,
+}
+
+_KEYWORDS = sorted({keyword.lower() for keyword in LEAK_KEYWORDS})
+_ID_SEGMENT_RE = re.compile(r'^(?=.*\d)[A-Za-z0-9_-]+$|^[A-Za-z0-9_-]{8,}$')
+
+
+def url_shape(url: str) -> str:
+    """
+    URL with its ID-like path segments masked
+
+    "https://pastebin.com/AbCd1234" and "https://pastebin.com/XyZw9876" share
+    the shape "pastebin.com/*"; "/u/name" pages and "/raw/" bodies do not.
+    """
+    path = url.split('://', 1)[-1].split('?', 1)[0].split('#', 1)[0]
+    segments = [s for s in path.split('/')[1:] if s]
+    masked = ['*' if _ID_SEGMENT_RE.match(s) else s.lower() for s in segments]
+    return '/'.join([source_of(url)] + masked)
+
+
+def title_score(title: str) -> float:
+    """Leak likelihood suggested by a listing title, 0 to 1"""
+    lowered = title.lower()
+    if TARGET_DOMAIN in lowered:
+        return 1.0
+    hits = sum(1 for keyword in _KEYWORDS if keyword in lowered)
+    return min(1.0, 0.1 + 0.45 * hits)
+
+
+class YieldHistory:
+    """Analyzed and relevant paste counts per author and per URL shape"""
+
+    def __init__(self, path: Optional[str] = YIELD_HISTORY_FILE):
+        """
+        Initialize the history
+
+        Args:
+            path: JSON file used to persist counts across restarts (None disables)
+        """
+        self.path = path
+        self._counts: Dict[str, List[int]] = {}  # key -> [analyzed, relevant]
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def _add(self, key: str, relevant: bool):
+        counts = self._counts.setdefault(key, [0, 0])
+        counts[0] += 1
+        counts[1] += int(relevant)
+
+    def record(self, url: str, relevant: bool, author: Optional[str] = None):
+        """Record an analyzed paste, its author (if known) and whether it was relevant"""
+        with self._lock:
+            self._add(f"shape:{url_shape(url)}", relevant)
+            if author and author != 'Unknown':
+                self._add(f"author:{author}", relevant)
+
+    def _smoothed(self, key: str) -> Optional[float]:
+        counts = self._counts.get(key)
+        if counts is None:
+            return None
+        return (counts[1] + 1) / (counts[0] + 2)
+
+    def author_yield(self, author: Optional[str]) -> Optional[float]:
+        """Smoothed relevant share of an author's pastes (None if never seen)"""
+        if not author or author == 'Unknown':
+            return None
+        with self._lock:
+            return self._smoothed(f"author:{author}")
+
+    def shape_yield(self, url: str) -> float:
+        """Smoothed relevant share of URLs shaped like this one (0.5 if none seen)"""
+        with self._lock:
+            value = self._smoothed(f"shape:{url_shape(url)}")
+        return 0.5 if value is None else value
+
+    def save(self):
+        """Persist counts to disk"""
+        if not self.path:
+            return
+        with self._lock:
+            data = dict(self._counts)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    def load(self):
+        """Load counts persisted by a previous run"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠ Could not load yield history: {e}")
+            return
+        with self._lock:
+            self._counts.update({key: list(value) for key, value in data.items()})
+
+
+class FrontierItem:
+    """A queued URL with the hints it was discovered with"""
+
+    __slots__ = ('url', 'title', 'author', 'score')
+
+    def __init__(self, url: str, title: Optional[str] = None, author: Optional[str] = None):
+        self.url = url
+        self.title = title
+        self.author = author
+        self.score = 0.0
+
+    def __repr__(self) -> str:
+        return f"FrontierItem({self.url!r}, score={self.score:.3f})"
+
+
+class Frontier:
+    """Priority queue handing out the most promising URL first"""
+
+    def __init__(self, source_registry=None, history: Optional[YieldHistory] = None,
+                 weights: Dict[str, float] = None):
+        """
+        Initialize the frontier
+
+        Args:
+            source_registry: SourceRegistry providing per-source priority
+                             (defaults to the shared registry)
+            history: YieldHistory providing author and URL-shape yield
+                     (defaults to the shared history)
+            weights: Signal weights (defaults to SIGNAL_WEIGHTS)
+        """
+        self.source_registry = source_registry or get_source_registry()
+        self.history = history or get_yield_history()
+        self.weights = weights or SIGNAL_WEIGHTS
+        self._heap: List[Tuple[float, int, FrontierItem]] = []
+        self._queued = set()
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def score(self, url: str, title: Optional[str] = None, author: Optional[str] = None) -> float:
+        """
+        Predicted relevance of a URL before fetching it, 0 to 1
+
+        Weighted mean of the signals known for the URL.
+        """
+        signals = {
+            'source': self.source_registry.priority(url),
+            'shape': self.history.shape_yield(url),
+        }
+        if title:
+            signals['title'] = title_score(title)
+        author_yield = self.history.author_yield(author)
+        if author_yield is not None:
+            signals['author'] = author_yield
+        total_weight = sum(self.weights[name] for name in signals)
+        return sum(self.weights[name] * value for name, value in signals.items()) / total_weight
+
+    def push(self, url: str, title: Optional[str] = None, author: Optional[str] = None) -> bool:
+        """
+        Queue a URL (ignored if it was queued before)
+
+        Args:
+            url: Paste URL
+            title: Title shown where the URL was found
+            author: Author, when the listing names one
+
+        Returns:
+            Whether the URL was queued
+        """
+        url = url.strip()
+        if url in self._queued:
+            return False
+        self._queued.add(url)
+        item = FrontierItem(url, title, author)
+        item.score = self.score(url, title, author)
+        heapq.heappush(self._heap, (-item.score, next(self._counter), item))
+        return True
+
+    def extend(self, urls: Iterable[str]):
+        """Queue URLs without hints"""
+        for url in urls:
+            self.push(url)
+
+    def pop(self) -> FrontierItem:
+        """
+        Remove and return the best URL
+
+        The top item is re-scored first; if what was learned since it was
+        queued drops it below the next one, it goes back in line.
+        """
+        while True:
+            _, _, item = heapq.heappop(self._heap)
+            item.score = self.score(item.url, item.title, item.author)
+            if not self._heap or item.score >= -self._heap[0][0]:
+                return item
+            heapq.heappush(self._heap, (-item.score, next(self._counter), item))
+
+
+_yield_history: Optional[YieldHistory] = None
+_yield_history_lock = threading.Lock()
+
+
+def get_yield_history() -> YieldHistory:
+    """Return the process-wide yield history, loading it on first use"""
+    global _yield_history
+    with _yield_history_lock:
+        if _yield_history is None:
+            _yield_history = YieldHistory()
+        return _yield_history
@@ -0,0 +1,143 @@
+"""
+Logging Setup for Project NEXT Intelligence
+One non-blocking logging pipeline shared by every module
+
+Loggers only put records on a bounded in-memory queue; a background
+listener thread formats them and writes the console and the rotating log
+file (JSON lines by default). Per-URL chatter (INFO records carrying a
+``url`` field) can be sampled, keeping or dropping all lines of a URL
+together.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import threading
+import zlib
+from datetime import datetime, timezone
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    LOG_FILE, LOG_LEVEL, LOG_FILE_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+    LOG_QUEUE_SIZE, LOG_SAMPLE_RATE
+)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+_setup_lock = threading.Lock()
+_exception_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with ``extra`` fields as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class UrlSampler(logging.Filter):
+    """Keep a fraction of INFO-and-below records about individual URLs"""
+
+    def __init__(self, rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.threshold = int(max(0.0, min(rate, 1.0)) * 0xFFFFFFFF)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        url = getattr(record, 'url', None)
+        if url is None or record.levelno > logging.INFO:
+            return True
+        # Hash, not random: every line about one URL shares the decision
+        return zlib.crc32(str(url).encode('utf-8')) <= self.threshold
+
+
+class EnqueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener and drops when full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments and tracebacks may change once the caller moves on, so they
+        # are rendered here; the listener still applies the (JSON) formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level: str = LOG_LEVEL) -> logging.Logger:
+    """
+    Install the queue-based pipeline on the root logger (idempotent)
+
+    Args:
+        level: Root log level name
+
+    Returns:
+        The root logger
+    """
+    global _listener
+    root = logging.getLogger()
+    with _setup_lock:
+        if _listener is not None:
+            return root
+
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers = [console]
+        # Analysis pool workers log to the console only: the rotating file has one writer
+        if multiprocessing.parent_process() is None:
+            log_file = logging.handlers.RotatingFileHandler(
+                LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8',
+                delay=True
+            )
+            log_file.setFormatter(
+                JsonFormatter() if LOG_FILE_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT)
+            )
+            handlers.append(log_file)
+
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        handler = EnqueueHandler(log_queue)
+        if LOG_SAMPLE_RATE < 1.0:
+            handler.addFilter(UrlSampler(LOG_SAMPLE_RATE))
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    return root
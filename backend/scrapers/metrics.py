@@ -0,0 +1,58 @@
+"""
+Metrics for Project NEXT Intelligence
+Prometheus instruments for fetches, analysis stages and pipeline queues
+
+Instruments are module-level and label children are cached by
+prometheus_client, so recording a sample is a dict lookup plus a locked
+add; the exposition is only rendered when /metrics is scraped.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST, REGISTRY
+
+# Paste sites answer in milliseconds, onion sites in tens of seconds
+_REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    'next_request_duration_seconds', 'HTTP request latency by source host and status',
+    ['host', 'status'], buckets=_REQUEST_BUCKETS
+)
+BYTES_FETCHED = Counter(
+    'next_fetched_bytes_total', 'Response body bytes fetched by source host', ['host']
+)
+REQUEST_RETRIES = Counter(
+    'next_request_retries_total', 'Requests retried after a failed attempt', ['host']
+)
+STAGE_DURATION = Histogram(
+    'next_analysis_stage_duration_seconds', 'Time spent per paste analysis stage',
+    ['stage'], buckets=_STAGE_BUCKETS
+)
+ACTIVE_SCANS = Gauge('next_active_scans', 'Scans currently running')
+QUEUE_DEPTH = Gauge('next_queue_depth', 'Items waiting in a pipeline queue', ['queue'])
+WEBSOCKET_CLIENTS = Gauge('next_websocket_clients', 'Connected WebSocket clients')
+MONITOR_NEW_PASTES = Counter(
+    'next_monitor_new_pastes_total', 'Pastes first seen in a monitored feed', ['source']
+)
+
+
+def observe_request(host: str, latency: float, status, nbytes: int = 0):
+    """
+    Record one request
+
+    Args:
+        host: Source host (registry key)
+        latency: Request duration in seconds
+        status: HTTP status code, or "error" when no response arrived
+        nbytes: Response body size
+    """
+    REQUEST_LATENCY.labels(host, str(status)).observe(latency)
+    if nbytes:
+        BYTES_FETCHED.labels(host).inc(nbytes)
+
+
+def render_metrics() -> bytes:
+    """Current metrics in the Prometheus text format"""
+    return generate_latest(REGISTRY)
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
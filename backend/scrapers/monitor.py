@@ -0,0 +1,390 @@
+"""
+Continuous Monitor for Project NEXT Intelligence
+Polls paste-site recent feeds and analyzes only pastes posted since the last poll
+
+Each source has a feed adapter (listing URL plus parser) and a persisted
+cursor: the newest paste seen and a bounded window of recently seen URLs.
+A poll walks the feed newest-first until it reaches the cursor, so only
+new pastes are fetched, and a restart resumes where the last poll stopped.
+Sources are polled concurrently, one thread each.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    OUTPUT_DIR, PASTEBIN_BASE_URL, PASTEBIN_SCRAPING_URL, MONITOR_SOURCES,
+    MONITOR_POLL_INTERVAL, MONITOR_SEEN_WINDOW, MONITOR_RECENT_FINDINGS
+)
+from scrapers import get_scraper
+from scrapers.decoding import response_text
+from scrapers.frontier import Frontier
+from scrapers.log_setup import setup_logging
+from scrapers.metrics import MONITOR_NEW_PASTES
+from scrapers.tracing import span
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+MONITOR_CURSOR_FILE = os.path.join(OUTPUT_DIR, "monitor_cursors.json")
+
+_PASTE_HREF_RE = re.compile(r'^/([A-Za-z0-9]{8})$')
+
+
+class FeedEntry:
+    """One paste listed in a recent feed"""
+
+    __slots__ = ('url', 'title', 'author', 'posted')
+
+    def __init__(self, url: str, title: str = None, author: str = None, posted: float = None):
+        self.url = url
+        self.title = title
+        self.author = author
+        self.posted = posted  # Unix time, when the feed provides it
+
+    def __repr__(self) -> str:
+        return f"FeedEntry({self.url!r}, title={self.title!r})"
+
+
+class FeedAdapter:
+    """Recent-pastes feed of one site"""
+
+    name = ''
+
+    def feed_url(self) -> str:
+        """URL of the listing"""
+        raise NotImplementedError
+
+    def parse(self, response) -> List[FeedEntry]:
+        """Entries of a fetched listing, newest first"""
+        raise NotImplementedError
+
+
+class PastebinArchiveAdapter(FeedAdapter):
+    """Pastebin's public /archive page (the latest public pastes)"""
+
+    name = 'pastebin'
+
+    def feed_url(self) -> str:
+        return f"{PASTEBIN_BASE_URL}/archive"
+
+    def parse(self, response) -> List[FeedEntry]:
+        soup = BeautifulSoup(response_text(response), 'html.parser')
+        table = soup.find('table', class_='maintable') or soup
+        entries = []
+        seen = set()
+        for link in table.find_all('a', href=_PASTE_HREF_RE):
+            paste_id = _PASTE_HREF_RE.match(link['href']).group(1)
+            if paste_id in seen:
+                continue
+            seen.add(paste_id)
+            entries.append(FeedEntry(f"{PASTEBIN_BASE_URL}/{paste_id}", title=link.get_text(strip=True)))
+        return entries
+
+
+class PastebinScrapingAdapter(FeedAdapter):
+    """Pastebin scraping API (JSON, needs a whitelisted IP)"""
+
+    name = 'pastebin_api'
+
+    def feed_url(self) -> str:
+        return f"{PASTEBIN_SCRAPING_URL}?limit=250"
+
+    def parse(self, response) -> List[FeedEntry]:
+        items = sorted(response.json(), key=lambda item: int(item.get('date', 0)), reverse=True)
+        return [
+            FeedEntry(
+                f"{PASTEBIN_BASE_URL}/{item['key']}", title=item.get('title') or None,
+                author=item.get('user') or None, posted=float(item.get('date', 0)) or None
+            )
+            for item in items if item.get('key')
+        ]
+
+
+# Other CLEARNET_SOURCES have no public listing (privatebin pastes are
+# end-to-end encrypted, hastebin and paste.ee list nothing); register
+# adapters here when a site gains one.
+FEED_ADAPTERS: Dict[str, type] = {
+    PastebinArchiveAdapter.name: PastebinArchiveAdapter,
+    PastebinScrapingAdapter.name: PastebinScrapingAdapter,
+}
+
+
+class SourceCursor:
+    """Where the last poll of a feed stopped"""
+
+    def __init__(self, window: int = MONITOR_SEEN_WINDOW):
+        self.last_seen: Optional[str] = None
+        self.seen: deque = deque(maxlen=window)
+        self._seen_set = set()
+        self.last_poll: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.polls = 0
+        self.new_pastes = 0
+        self.relevant = 0
+
+    def new_entries(self, entries: List[FeedEntry]) -> List[FeedEntry]:
+        """Entries listed before the cursor that were not seen yet (newest first)"""
+        new = []
+        for entry in entries:
+            if entry.url == self.last_seen:
+                break
+            if entry.url not in self._seen_set:
+                new.append(entry)
+        return new
+
+    def mark_seen(self, url: str):
+        if url in self._seen_set:
+            return
+        if len(self.seen) == self.seen.maxlen:
+            self._seen_set.discard(self.seen[0])
+        self.seen.append(url)
+        self._seen_set.add(url)
+
+    def to_dict(self) -> Dict:
+        return {
+            'last_seen': self.last_seen,
+            'last_poll': self.last_poll,
+            'last_error': self.last_error,
+            'polls': self.polls,
+            'new_pastes': self.new_pastes,
+            'relevant': self.relevant,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, window: int = MONITOR_SEEN_WINDOW) -> "SourceCursor":
+        cursor = cls(window)
+        for url in data.get('seen', []):
+            cursor.mark_seen(url)
+        for field in ('last_seen', 'last_poll', 'last_error'):
+            setattr(cursor, field, data.get(field))
+        for field in ('polls', 'new_pastes', 'relevant'):
+            setattr(cursor, field, data.get(field, 0))
+        return cursor
+
+
+class ContinuousMonitor:
+    """Polls every configured feed on its own thread and analyzes new pastes"""
+
+    def __init__(self, sources: List[str] = None, interval: float = MONITOR_POLL_INTERVAL,
+                 orchestrator_factory: Callable = None, on_results: Callable = None,
+                 path: Optional[str] = MONITOR_CURSOR_FILE, seen_window: int = MONITOR_SEEN_WINDOW,
+                 recent_findings: int = MONITOR_RECENT_FINDINGS):
+        """
+        Initialize the monitor
+
+        Args:
+            sources: Feed adapter names (defaults to MONITOR_SOURCES)
+            interval: Seconds between polls of one feed
+            orchestrator_factory: Returns a fresh DiscoveryOrchestrator for each poll
+            on_results: Called as on_results(source, packaged_results) after a
+                        poll that found relevant pastes (on the polling thread)
+            path: JSON file persisting the cursors (None disables)
+            seen_window: Paste URLs remembered per source
+            recent_findings: Findings kept for status queries
+        """
+        unknown = [name for name in (sources or MONITOR_SOURCES) if name not in FEED_ADAPTERS]
+        if unknown:
+            raise ValueError(f"Unknown monitor sources {unknown}. Use: {', '.join(FEED_ADAPTERS)}")
+
+        self.adapters = {name: FEED_ADAPTERS[name]() for name in (sources or MONITOR_SOURCES)}
+        self.interval = interval
+        self.orchestrator_factory = orchestrator_factory or (lambda: get_scraper('clearnet')())
+        self.on_results = on_results
+        self.path = path
+        self.seen_window = seen_window
+        self.cursors = {name: SourceCursor(seen_window) for name in self.adapters}
+        self.recent: deque = deque(maxlen=recent_findings)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        if path:
+            self.load()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def poll_source(self, name: str) -> List:
+        """
+        Fetch one feed and analyze the pastes posted since the last poll
+
+        Args:
+            name: Source (feed adapter) name
+
+        Returns:
+            Relevant findings among the new pastes
+        """
+        adapter = self.adapters[name]
+        cursor = self.cursors[name]
+        orchestrator = self.orchestrator_factory()
+
+        with span('monitor_poll', source=name) as poll_span:
+            response = orchestrator._make_request(adapter.feed_url())
+            cursor.polls += 1
+            cursor.last_poll = datetime.now().isoformat()
+            if response is None:
+                cursor.last_error = f"Could not fetch {adapter.feed_url()}"
+                logger.warning(f"⚠ Monitor: {cursor.last_error}")
+                return []
+
+            entries = adapter.parse(response)
+            new = cursor.new_entries(entries)
+            if new:
+                logger.info(f"Monitor: {len(new)} new pastes on {name}")
+
+            # Best-first by listing title and past yield, so leaks in a burst
+            # of new pastes are analyzed (and reported) first
+            frontier = Frontier(orchestrator.source_registry, orchestrator.yield_history)
+            for entry in new:
+                frontier.push(entry.url, title=entry.title, author=entry.author)
+            findings = []
+            while frontier:
+                url = frontier.pop().url
+                result = orchestrator.analyze_paste(url)
+                if url in orchestrator.unfetched_urls:
+                    continue  # Not seen yet: tried again on the next poll
+                with self._lock:
+                    cursor.mark_seen(url)
+                if result:
+                    findings.append(result)
+
+            # The cursor never moves past a paste that could not be fetched
+            unfetched = [i for i, entry in enumerate(entries) if entry.url in orchestrator.unfetched_urls]
+            fetched = len(new) - len(unfetched)
+            MONITOR_NEW_PASTES.labels(name).inc(fetched)
+            with self._lock:
+                if not unfetched and entries:
+                    cursor.last_seen = entries[0].url
+                elif unfetched and unfetched[-1] + 1 < len(entries):
+                    cursor.last_seen = entries[unfetched[-1] + 1].url
+                cursor.last_error = f"Could not fetch {len(unfetched)} pastes" if unfetched else None
+                cursor.new_pastes += fetched
+                cursor.relevant += len(findings)
+                self.recent.extend(findings)
+            if unfetched:
+                logger.warning(f"⚠ Monitor: {cursor.last_error} on {name}, retrying next poll")
+            if poll_span:
+                poll_span.set(new=len(new), relevant=len(findings))
+
+        self.save()
+        if findings:
+            logger.info(f"✓ Monitor: {len(findings)} relevant pastes on {name}")
+            if self.on_results:
+                results = orchestrator.package_results(findings)
+                results['metadata']['monitor_source'] = name
+                self.on_results(name, results)
+        return findings
+
+    def poll_once(self) -> Dict[str, int]:
+        """
+        Poll every feed once, concurrently
+
+        Returns:
+            Relevant findings per source
+        """
+        with ThreadPoolExecutor(max_workers=len(self.adapters) or 1) as executor:
+            futures = {name: executor.submit(self.poll_source, name) for name in self.adapters}
+        return {name: len(future.result()) for name, future in futures.items()}
+
+    def _run(self, name: str):
+        while not self._stop.is_set():
+            try:
+                self.poll_source(name)
+            except Exception as e:
+                self.cursors[name].last_error = str(e)
+                logger.error(f"✗ Monitor poll of {name} failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start one polling thread per source (no-op if already running)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, args=(name,), name=f"monitor-{name}", daemon=True)
+            for name in self.adapters
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"✓ Monitoring {', '.join(self.adapters)} every {self.interval:g}s")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop polling after the current poll of each source"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self.save()
+
+    def status(self) -> Dict:
+        """Running state and per-source cursor statistics"""
+        with self._lock:
+            return {
+                'running': self.running,
+                'interval': self.interval,
+                'sources': {name: cursor.to_dict() for name, cursor in self.cursors.items()},
+            }
+
+    def save(self):
+        """Persist cursors (with their seen windows) to disk"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                name: {**cursor.to_dict(), 'seen': list(cursor.seen)}
+                for name, cursor in self.cursors.items()
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        """Resume from the cursors of a previous run"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠ Could not load monitor cursors: {e}")
+            return
+
+        with self._lock:
+            for name in self.cursors:
+                if name in data:
+                    self.cursors[name] = SourceCursor.from_dict(data[name], self.seen_window)
+
+
+_monitor: Optional[ContinuousMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor(**kwargs) -> ContinuousMonitor:
+    """
+    Return the process-wide monitor, creating it on first use
+
+    Args:
+        kwargs: ContinuousMonitor arguments, used only on creation
+    """
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ContinuousMonitor(**kwargs)
+        return _monitor
@@ -0,0 +1,288 @@
+"""
+Paste Store for Project NEXT Intelligence
+Content-addressed, zstd-compressed storage of raw paste bodies
+
+Every fetched body is stored once under its SHA-256, so re-analysis and
+rescoring jobs read from local disk instead of refetching pastes that may
+already be deleted. Once enough bodies are stored a compression dictionary
+is trained on them; small pastes share a lot of structure (headers,
+combolist layout) and compress far better with it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+import zstandard as zstd
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    OUTPUT_DIR, PASTE_STORE_LEVEL,
+    PASTE_STORE_DICT_SIZE, PASTE_STORE_DICT_SAMPLES
+)
+from scrapers.log_setup import setup_logging
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+PASTE_STORE_DIR = os.path.join(OUTPUT_DIR, "pastes")
+
+
+class PasteStore:
+    """Content-addressed store of raw paste bodies"""
+
+    def __init__(self, root: str = PASTE_STORE_DIR, level: int = PASTE_STORE_LEVEL,
+                 dict_samples: int = PASTE_STORE_DICT_SAMPLES):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding objects, dictionaries and the reference log
+            level: zstd compression level
+            dict_samples: Train a dictionary once this many bodies are stored
+                          (0 disables automatic training)
+        """
+        self.root = root
+        self.level = level
+        self.dict_samples = dict_samples
+        self.objects_dir = os.path.join(root, "objects")
+        self.dicts_dir = os.path.join(root, "dicts")
+        self.refs_path = os.path.join(root, "refs.jsonl")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.dicts_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._dicts: Dict[int, zstd.ZstdCompressionDict] = {}
+        self._dictionary: Optional[zstd.ZstdCompressionDict] = None
+        # zstd contexts are not thread-safe; each thread keeps its own, so
+        # (de)compression never runs under the store lock
+        self._local = threading.local()
+        self._refs = set()
+        self._digests = set()
+        self._next_train = dict_samples
+        self._trainer: Optional[threading.Thread] = None
+        self._load()
+
+    def _load(self):
+        """Load trained dictionaries and the set of known references"""
+        newest = None
+        paths = [
+            os.path.join(self.dicts_dir, name)
+            for name in os.listdir(self.dicts_dir) if name.endswith('.zdict')
+        ]
+        for path in sorted(paths, key=os.path.getmtime):
+            with open(path, 'rb') as f:
+                dictionary = zstd.ZstdCompressionDict(f.read())
+            self._dicts[dictionary.dict_id()] = dictionary
+            newest = dictionary
+        self._dictionary = newest
+
+        if os.path.exists(self.refs_path):
+            for ref in self.iter_refs():
+                self._refs.add((ref['hash'], ref.get('url')))
+                self._digests.add(ref['hash'])
+
+    def _compressor(self) -> zstd.ZstdCompressor:
+        """This thread's compressor for the newest dictionary"""
+        dictionary = self._dictionary
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None or self._local.dictionary is not dictionary:
+            compressor = zstd.ZstdCompressor(level=self.level, dict_data=dictionary)
+            self._local.compressor = compressor
+            self._local.dictionary = dictionary
+        return compressor
+
+    def _decompressor(self, dict_id: int) -> zstd.ZstdDecompressor:
+        """This thread's decompressor for a dictionary (0: none)"""
+        decompressors = getattr(self._local, 'decompressors', None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        decompressor = decompressors.get(dict_id)
+        if decompressor is None:
+            decompressor = zstd.ZstdDecompressor(dict_data=self._dicts.get(dict_id))
+            decompressors[dict_id] = decompressor
+        return decompressor
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.zst")
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self._object_path(digest))
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def put(self, data: bytes, url: str = None, metadata: Dict = None) -> str:
+        """
+        Store a raw body (once) and record where it came from
+
+        Args:
+            data: Raw paste body
+            url: URL the body was fetched from
+            metadata: Paste metadata (title, author, timestamp) kept for re-analysis
+
+        Returns:
+            SHA-256 hex digest referencing the stored body
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            # Written outside the lock; a body stored by two threads at once
+            # is compressed twice and replaced atomically with the same bytes
+            frame = self._compressor().compress(data)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(frame)
+            os.replace(tmp, path)
+
+        with self._lock:
+            if (digest, url) in self._refs:
+                return digest
+            self._refs.add((digest, url))
+            self._digests.add(digest)
+            ref = {
+                'hash': digest,
+                'url': url,
+                'size': len(data),
+                'stored_at': datetime.now().isoformat(),
+                **(metadata or {})
+            }
+            with open(self.refs_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(ref) + '\n')
+
+            # Decided under the lock so exactly one thread starts training
+            train = (
+                self._next_train and not self._dicts and self._trainer is None
+                and len(self._digests) >= self._next_train
+            )
+            if train:
+                self._trainer = threading.Thread(
+                    target=self._train_in_background, name="paste-dict-trainer", daemon=True
+                )
+        if train:
+            self._trainer.start()
+        return digest
+
+    def _train_in_background(self):
+        """Train the first dictionary off the scan thread that crossed the threshold"""
+        try:
+            dict_id = self.train_dictionary()
+        except Exception as e:
+            logger.error(f"✗ Paste dictionary training failed: {e}")
+            dict_id = None
+        with self._lock:
+            if dict_id is None:
+                self._next_train *= 2
+            self._trainer = None
+
+    def wait_for_training(self, timeout: float = None):
+        """Block until a running dictionary training finishes"""
+        trainer = self._trainer
+        if trainer is not None:
+            trainer.join(timeout)
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """
+        Read a stored body
+
+        Args:
+            digest: SHA-256 hex digest returned by put()
+
+        Returns:
+            Raw body or None if not stored
+        """
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                frame = f.read()
+        except FileNotFoundError:
+            return None
+
+        return self._decompressor(zstd.get_frame_parameters(frame).dict_id).decompress(frame)
+
+    def train_dictionary(self, max_samples: int = 2000,
+                         dict_size: int = PASTE_STORE_DICT_SIZE) -> Optional[int]:
+        """
+        Train a compression dictionary on stored bodies
+
+        Bodies stored earlier keep their frames; the dictionary id in each
+        frame header selects the right dictionary when reading.
+
+        Args:
+            max_samples: Number of stored bodies sampled for training
+            dict_size: Target dictionary size in bytes
+
+        Returns:
+            ID of the new dictionary, or None if there is too little data
+        """
+        samples = []
+        for ref, body in self.iter_bodies():
+            samples.append(body[:128 * 1024])
+            if len(samples) >= max_samples:
+                break
+
+        try:
+            dictionary = zstd.train_dictionary(dict_size, samples)
+        except zstd.ZstdError as e:
+            logger.warning(f"⚠ Could not train paste dictionary: {e}")
+            return None
+
+        dict_id = dictionary.dict_id()
+        with open(os.path.join(self.dicts_dir, f"{dict_id:010d}.zdict"), 'wb') as f:
+            f.write(dictionary.as_bytes())
+
+        with self._lock:
+            self._dicts[dict_id] = dictionary
+            self._dictionary = dictionary
+
+        logger.info(f"✓ Trained paste dictionary {dict_id} on {len(samples)} bodies")
+        return dict_id
+
+    def iter_refs(self) -> Iterator[Dict]:
+        """Stream the reference log (one entry per distinct body/URL pair)"""
+        if not os.path.exists(self.refs_path):
+            return
+        with open(self.refs_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def iter_bodies(self) -> Iterator[Tuple[Dict, bytes]]:
+        """Stream (reference, body) pairs from local storage, each body once"""
+        seen = set()
+        for ref in self.iter_refs():
+            if ref['hash'] in seen:
+                continue
+            seen.add(ref['hash'])
+            body = self.get(ref['hash'])
+            if body is not None:
+                yield ref, body
+
+    def iter_documents(self) -> Iterator[Tuple[str, str, str]]:
+        """Stream (hash, text, title) tuples, e.g. for FeatureMatrix.build"""
+        for ref, body in self.iter_bodies():
+            yield ref['hash'], body.decode('utf-8', 'replace'), ref.get('title', '')
+
+
+_paste_store: Optional[PasteStore] = None
+_paste_store_lock = threading.Lock()
+
+
+def get_paste_store() -> PasteStore:
+    """Return the process-wide paste store, creating it on first use"""
+    global _paste_store
+    with _paste_store_lock:
+        if _paste_store is None:
+            _paste_store = PasteStore()
+        return _paste_store
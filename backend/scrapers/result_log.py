@@ -0,0 +1,388 @@
+"""
+Result Log for Project NEXT Intelligence
+Append-only, segmented and checksummed log of completed scans under OUTPUT_DIR
+
+Each completed scan is one record (zstd-compressed JSON behind a small
+header with its CRC32) appended to the current segment file. A one-line
+index entry per scan holds the segment offset plus the scan's status
+metadata, so a restart rebuilds the scan list from the index alone and
+result bodies are only read, through a memory map, when requested.
+
+Findings updated after their scan was logged (late evidence screenshots)
+go to a small side file of per-finding amendments, merged in on read,
+rather than re-appending the whole record.
+"""
+
+import gc
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Optional
+
+import zstandard as zstd
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR, RESULT_LOG_SEGMENT_BYTES, RESULT_CACHE_SIZE
+from scrapers.log_setup import setup_logging
+from scrapers.findings import findings_to_dicts
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+RESULT_LOG_DIR = os.path.join(OUTPUT_DIR, "result_log")
+
+_RECORD_MAGIC = b'NXRL'
+_RECORD_HEADER = struct.Struct('<4sII')  # magic, crc32 of payload, payload length
+
+
+class ResultLogError(Exception):
+    """A result record is missing or fails its checksum"""
+
+
+class ResultLog:
+    """Segmented append-only log of scan results with a scan-level index"""
+
+    def __init__(self, root: str = RESULT_LOG_DIR, segment_bytes: int = RESULT_LOG_SEGMENT_BYTES):
+        """
+        Open (or create) the log and load its index
+
+        Args:
+            root: Directory holding segment-NNNNNN.log files, index.jsonl and amendments.jsonl
+            segment_bytes: Start a new segment once the current one is this large
+        """
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.index_path = os.path.join(root, "index.jsonl")
+        self.amendments_path = os.path.join(root, "amendments.jsonl")
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        # scan ID -> finding URL -> fields set after the scan was logged
+        self._amendments: Dict[str, Dict[str, Dict]] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._compressor = zstd.ZstdCompressor(level=3)
+        self._decompressor = zstd.ZstdDecompressor()
+        self._segment = 1
+        self._load_index()
+        self._load_amendments()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.root, f"segment-{segment:06d}.log")
+
+    def _load_index(self):
+        """Read index entries, dropping a torn final line"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb+') as f:
+            data = f.read()
+            end = data.rfind(b'\n') + 1
+            if end != len(data):
+                f.truncate(end)
+                logger.warning(f"⚠ Dropped torn result index entry ({len(data) - end} bytes)")
+
+        data = data[:end]
+        # One parse of the whole index is about twice as fast as per line, and
+        # the collector would otherwise rescan the new entries over and over
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            entries = json.loads(b'[' + data.rstrip(b'\n').replace(b'\n', b',') + b']')
+        except ValueError:
+            entries = []
+            for line in data.splitlines():
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning("⚠ Skipped unreadable result index entry")
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        segments = {entry['segment'] for entry in entries}
+        sizes: Dict[int, int] = {}
+        for segment in segments:
+            path = self._segment_path(segment)
+            sizes[segment] = os.path.getsize(path) if os.path.exists(path) else 0
+        index = self._index
+        for entry in entries:
+            # An entry pointing past the end of its segment lost its record
+            if entry['offset'] + entry['length'] <= sizes[entry['segment']]:
+                index[entry['scan_id']] = entry
+            else:
+                logger.warning(f"⚠ Result record of scan {entry['scan_id']} is missing, dropped from index")
+        if segments:
+            self._segment = max(segments)
+
+    def _load_amendments(self):
+        """Read finding amendments, dropping a torn final line"""
+        if not os.path.exists(self.amendments_path):
+            return
+        with open(self.amendments_path, 'rb+') as f:
+            data = f.read()
+            end = data.rfind(b'\n') + 1
+            if end != len(data):
+                f.truncate(end)
+                logger.warning(f"⚠ Dropped torn result amendment ({len(data) - end} bytes)")
+
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning("⚠ Skipped unreadable result amendment")
+                continue
+            fields = self._amendments.setdefault(entry['scan_id'], {}).setdefault(entry['url'], {})
+            fields.update(entry['fields'])
+
+    def __contains__(self, scan_id: str) -> bool:
+        return scan_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def scans(self) -> Dict[str, Dict]:
+        """Status metadata of every logged scan (no result bodies are read)"""
+        return {scan_id: entry['scan'] for scan_id, entry in self._index.items()}
+
+    def append(self, scan_id: str, scan: Dict, results: Dict):
+        """
+        Append a completed scan
+
+        Args:
+            scan_id: Scan identifier
+            scan: Status metadata (the active_scans entry)
+            results: Scan results ('results' may hold Finding objects)
+        """
+        body = {**results, 'results': findings_to_dicts(results.get('results', []))}
+        payload = self._compressor.compress(json.dumps(body, ensure_ascii=False).encode('utf-8'))
+        record = _RECORD_HEADER.pack(_RECORD_MAGIC, zlib.crc32(payload), len(payload)) + payload
+
+        with self._lock:
+            path = self._segment_path(self._segment)
+            if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+                self._segment += 1
+                path = self._segment_path(self._segment)
+
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = {
+                'scan_id': scan_id,
+                'segment': self._segment,
+                'offset': offset,
+                'length': len(record),
+                'scan': scan
+            }
+            # The index line is only written once the record is durable
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self._index[scan_id] = entry
+
+        logger.info(f"✓ Logged scan {scan_id} to segment {self._segment} ({len(record)} bytes)")
+
+    def amend(self, scan_id: str, url: str, fields: Dict):
+        """
+        Set fields of one finding of a logged scan
+
+        Args:
+            scan_id: Scan identifier (must be in the log)
+            url: URL of the finding to update
+            fields: Finding fields to set
+        """
+        if scan_id not in self._index:
+            raise KeyError(scan_id)
+        line = json.dumps({'scan_id': scan_id, 'url': url, 'fields': fields},
+                          ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            with open(self.amendments_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            self._amendments.setdefault(scan_id, {}).setdefault(url, {}).update(fields)
+
+    def _view(self, segment: int, end: int) -> mmap.mmap:
+        """Memory map of a segment covering at least ``end`` bytes"""
+        view = self._maps.get(segment)
+        if view is None or len(view) < end:
+            if view is not None:
+                view.close()
+            with open(self._segment_path(segment), 'rb') as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = view
+        return view
+
+    def read(self, scan_id: str) -> Dict:
+        """
+        Load the results of a logged scan
+
+        Raises:
+            KeyError: Scan is not in the log
+            ResultLogError: Record is truncated or fails its checksum
+        """
+        entry = self._index[scan_id]
+        start, end = entry['offset'], entry['offset'] + entry['length']
+        with self._lock:
+            try:
+                view = self._view(entry['segment'], end)
+            except (OSError, ValueError) as e:
+                raise ResultLogError(f"Segment {entry['segment']} unreadable: {e}")
+            if len(view) < end:
+                raise ResultLogError(f"Record of scan {scan_id} is truncated")
+            record = view[start:end]
+            amendments = {url: dict(fields) for url, fields in self._amendments.get(scan_id, {}).items()}
+
+        magic, crc, length = _RECORD_HEADER.unpack_from(record)
+        payload = record[_RECORD_HEADER.size:]
+        if magic != _RECORD_MAGIC or length != len(payload) or zlib.crc32(payload) != crc:
+            raise ResultLogError(f"Record of scan {scan_id} fails its checksum")
+        results = json.loads(self._decompressor.decompress(payload))
+
+        if amendments:
+            for result in results.get('results', []):
+                fields = amendments.get(result['url'])
+                if fields:
+                    result.update(fields)
+        return results
+
+    def close(self):
+        """Unmap segments"""
+        with self._lock:
+            for view in self._maps.values():
+                view.close()
+            self._maps.clear()
+
+
+class LazyScanResults(MutableMapping):
+    """
+    scan_results mapping backed by the result log
+
+    Scans still in memory (running, or not persisted yet) are held as-is;
+    logged scans are loaded on first access and kept in a small LRU cache.
+    Deleting a logged scan only drops it from memory.
+    """
+
+    def __init__(self, log: ResultLog = None, cache_size: int = RESULT_CACHE_SIZE):
+        self.log = log
+        self.cache_size = cache_size
+        self._pinned: Dict[str, Dict] = {}
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        # Scans are stored from worker threads while the API reads them
+        self._lock = threading.RLock()
+
+    def attach(self, log: ResultLog):
+        """Start serving (and persisting to) a result log"""
+        self.log = log
+
+    def _cache_put(self, scan_id: str, results: Dict):
+        self._cache[scan_id] = results
+        self._cache.move_to_end(scan_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def __getitem__(self, scan_id: str) -> Dict:
+        with self._lock:
+            results = self._pinned.get(scan_id)
+            if results is None and scan_id in self._cache:
+                self._cache.move_to_end(scan_id)
+                results = self._cache[scan_id]
+        if results is not None:
+            return results
+        if self.log is None or scan_id not in self.log:
+            raise KeyError(scan_id)
+        try:
+            results = self.log.read(scan_id)
+        except ResultLogError as e:
+            logger.error(f"✗ {e}")
+            raise KeyError(scan_id)
+        with self._lock:
+            self._cache_put(scan_id, results)
+        return results
+
+    def __setitem__(self, scan_id: str, results: Dict):
+        with self._lock:
+            self._cache.pop(scan_id, None)
+            self._pinned[scan_id] = results
+
+    def __delitem__(self, scan_id: str):
+        with self._lock:
+            found = self._pinned.pop(scan_id, None) is not None
+            found = self._cache.pop(scan_id, None) is not None or found
+        if not found:
+            raise KeyError(scan_id)
+
+    def __contains__(self, scan_id) -> bool:
+        return (
+            scan_id in self._pinned or scan_id in self._cache
+            or (self.log is not None and scan_id in self.log)
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            pinned = dict.fromkeys(self._pinned)
+            cached = list(self._cache)
+        yield from pinned
+        for scan_id in self.log.scans() if self.log is not None else cached:
+            if scan_id not in pinned:
+                yield scan_id
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def amend(self, scan_id: str, url: str, **fields):
+        """
+        Update one finding of a scan, recording the change in the log if already persisted
+
+        Args:
+            scan_id: Scan identifier
+            url: URL of the finding to update
+            fields: Finding fields to set
+        """
+        results = self[scan_id]
+        for result in results.get('results', []):
+            if result['url'] == url:
+                result.update(fields)
+        with self._lock:
+            pinned = scan_id in self._pinned
+        if self.log is not None and not pinned:
+            self.log.amend(scan_id, url, fields)
+
+    def persist(self, scan_id: str, scan: Dict):
+        """
+        Append an in-memory scan to the log and release it to the cache
+
+        Args:
+            scan_id: Scan identifier
+            scan: Status metadata stored in the index
+        """
+        with self._lock:
+            results = self._pinned.get(scan_id)
+        if self.log is None or results is None:
+            return
+        self.log.append(scan_id, scan, results)
+        with self._lock:
+            self._cache_put(scan_id, results)
+            del self._pinned[scan_id]
+
+
+_result_log: Optional[ResultLog] = None
+_result_log_lock = threading.Lock()
+
+
+def get_result_log() -> ResultLog:
+    """Return the process-wide result log, opening it on first use"""
+    global _result_log
+    with _result_log_lock:
+        if _result_log is None:
+            _result_log = ResultLog()
+        return _result_log
@@ -0,0 +1,230 @@
+"""
+Retry Policy for Project NEXT Intelligence
+Decides whether, and after how long, a failed request is tried again
+
+Failures are classified first: deleted pastes (404, 410, 451) are dead and
+remembered in a negative cache, other client errors are permanent, and only
+timeouts, connection errors, 429 and 5xx are retried. Retries wait for the
+server's Retry-After or a jittered exponential backoff, and draw on a
+per-host token bucket so a failing host cannot absorb the scan's time.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    RETRY_BASE_DELAY, RETRY_MAX_DELAY, RETRY_AFTER_MAX, RETRY_BUDGET_PER_HOST,
+    RETRY_BUDGET_REFILL, DEAD_URL_TTL, DEAD_URL_CACHE_SIZE
+)
+from scrapers.log_setup import setup_logging
+from scrapers.source_registry import source_of
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+DEAD = 'dead'
+PERMANENT = 'permanent'
+TRANSIENT = 'transient'
+
+DEAD_STATUSES = {404, 410, 451}
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Errors no retry can fix: the request itself is malformed
+_PERMANENT_ERRORS = (
+    requests.exceptions.InvalidURL,
+    requests.exceptions.MissingSchema,
+    requests.exceptions.InvalidSchema,
+    requests.exceptions.InvalidHeader,
+    requests.exceptions.TooManyRedirects,
+)
+
+
+def classify(error: requests.RequestException) -> str:
+    """
+    Classify a failed request
+
+    Returns:
+        DEAD (gone for good), PERMANENT (do not retry) or TRANSIENT (retry)
+    """
+    response = getattr(error, 'response', None)
+    if response is not None:
+        status = response.status_code
+        if status in DEAD_STATUSES:
+            return DEAD
+        if status in TRANSIENT_STATUSES or status >= 500:
+            return TRANSIENT
+        if 400 <= status < 500:
+            return PERMANENT
+    if isinstance(error, _PERMANENT_ERRORS):
+        return PERMANENT
+    return TRANSIENT
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta or HTTP date), if any"""
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Full-jitter exponential backoff before retry number attempt + 1"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class RetryBudget:
+    """Per-host token buckets; a retry spends one token"""
+
+    def __init__(self, capacity: float = RETRY_BUDGET_PER_HOST, refill: float = RETRY_BUDGET_REFILL):
+        self.capacity = capacity
+        self.refill = refill
+        self._buckets: Dict[str, list] = {}  # host -> [tokens, last update]
+        self._lock = threading.Lock()
+
+    def take(self, host: str) -> bool:
+        """Spend a retry token for a host, if one is left"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(host, [self.capacity, now])
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill)
+            bucket[1] = now
+            if bucket[0] < 1:
+                return False
+            bucket[0] -= 1
+            return True
+
+
+class NegativeCache:
+    """Bounded, expiring set of URLs known to be dead"""
+
+    def __init__(self, ttl: float = DEAD_URL_TTL, max_size: int = DEAD_URL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._expiry: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, url: str):
+        with self._lock:
+            self._expiry[url] = time.monotonic() + self.ttl
+            self._expiry.move_to_end(url)
+            while len(self._expiry) > self.max_size:
+                self._expiry.popitem(last=False)
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            expiry = self._expiry.get(url)
+            if expiry is None:
+                return False
+            if expiry < time.monotonic():
+                del self._expiry[url]
+                return False
+            return True
+
+
+class RetryPolicy:
+    """Error-aware retry decisions shared by every scraper"""
+
+    def __init__(self, budget: RetryBudget = None, dead_urls: NegativeCache = None,
+                 base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY,
+                 max_retry_after: float = RETRY_AFTER_MAX):
+        """
+        Initialize the policy
+
+        Args:
+            budget: Per-host retry token buckets
+            dead_urls: Negative cache of dead URLs
+            base_delay: Backoff before the first retry (doubled per attempt, jittered)
+            max_delay: Backoff cap
+            max_retry_after: Longest Retry-After honoured; longer waits give up
+        """
+        self.budget = budget or RetryBudget()
+        self.dead_urls = dead_urls or NegativeCache()
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self._host_ready: Dict[str, float] = {}
+
+    def is_dead(self, url: str) -> bool:
+        """Whether a URL recently answered 404, 410 or 451"""
+        return url in self.dead_urls
+
+    def host_wait(self, url: str) -> float:
+        """Seconds to wait before the next request to a host that sent Retry-After"""
+        ready = self._host_ready.get(source_of(url))
+        return max(0.0, ready - time.monotonic()) if ready else 0.0
+
+    def retry_delay(self, url: str, error: requests.RequestException,
+                    attempt: int, attempts: int) -> Optional[float]:
+        """
+        Decide on a failed attempt
+
+        Args:
+            url: Requested URL
+            error: The failure
+            attempt: Zero-based number of the failed attempt
+            attempts: Attempts allowed in total
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        kind = classify(error)
+        if kind == DEAD:
+            self.dead_urls.add(url)
+            return None
+        if kind == PERMANENT or attempt + 1 >= attempts:
+            return None
+
+        requested = retry_after(getattr(error, 'response', None))
+        if requested is not None:
+            if requested > self.max_retry_after:
+                logger.warning(f"⚠ {source_of(url)} asked to retry after {requested:.0f}s, giving up")
+                return None
+            self._host_ready[source_of(url)] = time.monotonic() + requested
+
+        if not self.budget.take(source_of(url)):
+            logger.warning(f"⚠ Retry budget of {source_of(url)} exhausted, not retrying {url}")
+            return None
+        delay = backoff(attempt, self.base_delay, self.max_delay)
+        return max(delay, requested) if requested is not None else delay
+
+
+_retry_policy: Optional[RetryPolicy] = None
+_retry_policy_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy, creating it on first use"""
+    global _retry_policy
+    with _retry_policy_lock:
+        if _retry_policy is None:
+            _retry_policy = RetryPolicy()
+        return _retry_policy
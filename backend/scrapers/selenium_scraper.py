@@ -4,8 +4,11 @@ Handles dynamic content and JavaScript-heavy sites
 """
 
 import logging
+import queue
+import threading
 import time
-from typing import Optional, Dict
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
@@ -20,17 +23,11 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import REQUEST_DELAY, LOG_FILE
+from config import REQUEST_DELAY, BROWSER_POOL_SIZE, BROWSER_RETRY_COOLDOWN
+from scrapers.log_setup import setup_logging
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -104,17 +101,19 @@ class SeleniumScraper:
             return None
         
         try:
-            logger.info(f"Scraping dynamic content from: {url}")
+            logger.info("Scraping dynamic content from: %s", url, extra={'url': url})
             
             # Navigate to URL
             self.driver.get(url)
             
             # Wait for specific element if provided
+            element_text = None
             if wait_for_selector:
                 try:
-                    WebDriverWait(self.driver, timeout).until(
+                    element = WebDriverWait(self.driver, timeout).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_selector))
                     )
+                    element_text = element.text
                     logger.info(f"✓ Found selector: {wait_for_selector}")
                 except TimeoutException:
                     logger.warning(f"⚠ Timeout waiting for selector: {wait_for_selector}")
@@ -129,10 +128,11 @@ class SeleniumScraper:
                 'title': self.driver.title,
                 'html': self.driver.page_source,
                 'text': self.driver.find_element(By.TAG_NAME, 'body').text,
+                'element_text': element_text,
                 'current_url': self.driver.current_url
             }
             
-            logger.info(f"✓ Successfully scraped {url}")
+            logger.info("✓ Successfully scraped %s", url, extra={'url': url})
             time.sleep(REQUEST_DELAY)  # Rate limiting
             
             return result
@@ -182,7 +182,44 @@ class SeleniumScraper:
             logger.error(f"✗ Failed to take screenshot: {e}")
             return False
     
-    def get_element_text(self, url: str, selector: str, 
+    def screenshot_element(self, url: str, selector: str = None,
+                           timeout: int = 10) -> Optional[bytes]:
+        """
+        Capture a PNG of a single page region instead of the whole window
+
+        Args:
+            url: URL to screenshot
+            selector: CSS selector of the region to capture (whole body if missing)
+            timeout: Maximum time to wait for the region to appear
+
+        Returns:
+            PNG bytes or None if the capture failed
+        """
+        if not self.driver:
+            logger.error("WebDriver not initialized")
+            return None
+
+        try:
+            self.driver.get(url)
+
+            element = None
+            if selector:
+                try:
+                    element = WebDriverWait(self.driver, timeout).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                    )
+                except TimeoutException:
+                    logger.warning(f"⚠ Evidence region not found, capturing body: {selector}")
+            if element is None:
+                element = self.driver.find_element(By.TAG_NAME, 'body')
+
+            return element.screenshot_as_png
+
+        except Exception as e:
+            logger.error(f"✗ Failed to capture element screenshot: {e}")
+            return None
+
+    def get_element_text(self, url: str, selector: str,
                         by: By = By.CSS_SELECTOR) -> Optional[str]:
         """
         Get text from a specific element
@@ -235,3 +272,145 @@ class SeleniumScraper:
     def __del__(self):
         """Destructor to ensure cleanup"""
         self.close()
+
+
+class _WedgedBrowser(Exception):
+    """Raised inside BrowserPool.acquire() so a browser is discarded on release"""
+
+
+class BrowserPool:
+    """
+    Bounded pool of reusable SeleniumScraper instances
+
+    Browsers are started lazily on first use and kept warm between renders,
+    so only the URLs that actually need JavaScript pay the startup cost once.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, browser: str = "chrome",
+                 headless: bool = True, retry_cooldown: float = BROWSER_RETRY_COOLDOWN):
+        """
+        Initialize the pool
+
+        Args:
+            size: Maximum number of concurrent browser instances
+            browser: Browser to use ("chrome" or "edge")
+            headless: Whether to run in headless mode
+            retry_cooldown: Seconds rendering is skipped after a browser failed to start
+        """
+        self.size = max(1, size)
+        self.browser = browser
+        self.headless = headless
+        self.retry_cooldown = retry_cooldown
+        self._idle: "queue.LifoQueue[SeleniumScraper]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether browsers can be started (False while cooling down after a failed start)"""
+        return time.monotonic() >= self._retry_at
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[SeleniumScraper]:
+        """
+        Borrow a scraper from the pool, starting a new browser if below capacity
+
+        Args:
+            timeout: Maximum time to wait for a free browser
+
+        Yields:
+            SeleniumScraper instance (returned to the pool on exit)
+        """
+        scraper = None
+        try:
+            scraper = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    scraper = SeleniumScraper(browser=self.browser, headless=self.headless)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                        self._retry_at = time.monotonic() + self.retry_cooldown
+                    logger.warning(f"⚠ Browser failed to start, retrying in {self.retry_cooldown:.0f}s")
+                    raise
+            else:
+                scraper = self._idle.get(timeout=timeout)
+
+        healthy = True
+        try:
+            yield scraper
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            if healthy and scraper.driver:
+                self._idle.put(scraper)
+            else:
+                self._discard(scraper)
+
+    def _discard(self, scraper: SeleniumScraper):
+        """Close a broken scraper and free its slot"""
+        scraper.close()
+        scraper.driver = None
+        with self._lock:
+            self._created -= 1
+
+    def render(self, url: str, wait_for_selector: str = None,
+               timeout: int = 10) -> Optional[Dict]:
+        """
+        Render a page in a pooled browser
+
+        Args:
+            url: URL to render
+            wait_for_selector: CSS selector to wait for before scraping
+            timeout: Maximum time to wait for page load
+
+        Returns:
+            Dict from SeleniumScraper.scrape_dynamic_content or None if unavailable
+        """
+        if not self.available:
+            return None
+
+        result = None
+        try:
+            with self.acquire(timeout=timeout * 3) as scraper:
+                result = scraper.scrape_dynamic_content(url, wait_for_selector, timeout)
+                if result and result.get('status') == 'error':
+                    # Drop the browser (acquire closes it), it may be wedged after a driver error
+                    raise _WedgedBrowser()
+                return result
+        except _WedgedBrowser:
+            return result
+        except queue.Empty:
+            logger.warning(f"⚠ No browser available to render {url}")
+        except Exception as e:
+            logger.error(f"✗ Browser render failed for {url}: {e}")
+        return None
+
+    def close(self):
+        """Close all idle browsers"""
+        while True:
+            try:
+                scraper = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(scraper)
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it on first use"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+        return _browser_pool
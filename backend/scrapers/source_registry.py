@@ -0,0 +1,238 @@
+"""
+Source Registry for Project NEXT Intelligence
+Live per-source latency, error and yield statistics used to order fetching
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR, SOURCE_LATENCY_WINDOW
+from scrapers.log_setup import setup_logging
+from scrapers.metrics import observe_request
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+SOURCE_STATS_FILE = os.path.join(OUTPUT_DIR, "source_stats.json")
+
+
+def source_of(url: str) -> str:
+    """Return the registry key (host without www.) for a URL"""
+    host = urlparse(url if '://' in url else f"http://{url}").netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class SourceStats:
+    """Rolling statistics for a single paste source"""
+
+    def __init__(self, name: str, window: int = SOURCE_LATENCY_WINDOW):
+        self.name = name
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.bytes_fetched = 0
+        self.hits = 0
+        self.relevant_hits = 0
+        self.last_error: Optional[str] = None
+        self.last_seen: Optional[float] = None
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency percentile (0-100) over the rolling window, in seconds"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def bytes_per_hit(self) -> float:
+        return self.bytes_fetched / self.hits if self.hits else 0.0
+
+    @property
+    def yield_rate(self) -> float:
+        return self.relevant_hits / self.hits if self.hits else 0.0
+
+    def priority(self) -> float:
+        """
+        Fetch priority, higher first
+
+        Yield and success rate use Laplace smoothing so unseen sources start
+        with an optimistic prior and still get tried; latency divides it so a
+        fast source wins over an equally productive slow one.
+        """
+        smoothed_yield = (self.relevant_hits + 1) / (self.hits + 2)
+        success_rate = 1 - (self.errors / (self.requests + 1))
+        p50 = self.percentile(50) or 0.0
+        return smoothed_yield * success_rate / (1 + p50)
+
+    def to_dict(self) -> Dict:
+        """Serializable snapshot of the statistics"""
+        return {
+            'source': self.name,
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': round(self.error_rate, 4),
+            'latency_p50': self.percentile(50),
+            'latency_p90': self.percentile(90),
+            'latency_p99': self.percentile(99),
+            'bytes_fetched': self.bytes_fetched,
+            'bytes_per_hit': round(self.bytes_per_hit, 1),
+            'hits': self.hits,
+            'relevant_hits': self.relevant_hits,
+            'yield_rate': round(self.yield_rate, 4),
+            'priority': round(self.priority(), 4),
+            'last_error': self.last_error,
+            'last_seen': self.last_seen,
+        }
+
+
+class SourceRegistry:
+    """Thread-safe registry of SourceStats keyed by source host"""
+
+    def __init__(self, path: Optional[str] = SOURCE_STATS_FILE):
+        """
+        Initialize the registry
+
+        Args:
+            path: JSON file used to persist statistics across restarts (None disables)
+        """
+        self.path = path
+        self._sources: Dict[str, SourceStats] = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def _get(self, source: str) -> SourceStats:
+        stats = self._sources.get(source)
+        if stats is None:
+            stats = self._sources[source] = SourceStats(source)
+        return stats
+
+    def record_request(self, url: str, latency: float, ok: bool,
+                       nbytes: int = 0, error: Optional[str] = None,
+                       status: Optional[int] = None):
+        """
+        Record the outcome of a single request
+
+        Args:
+            url: Requested URL (its host is the source)
+            latency: Request duration in seconds
+            ok: Whether the request succeeded
+            nbytes: Response body size
+            error: Error description for failed requests
+            status: HTTP status code, if a response arrived
+        """
+        source = source_of(url)
+        observe_request(source, latency, status or ('ok' if ok else 'error'), nbytes)
+        with self._lock:
+            stats = self._get(source)
+            stats.requests += 1
+            stats.latencies.append(latency)
+            stats.bytes_fetched += nbytes
+            stats.last_seen = time.time()
+            if not ok:
+                stats.errors += 1
+                stats.last_error = error
+
+    def record_hit(self, url: str, relevant: bool):
+        """Record an analyzed paste and whether it was relevant"""
+        with self._lock:
+            stats = self._get(source_of(url))
+            stats.hits += 1
+            if relevant:
+                stats.relevant_hits += 1
+
+    def priority(self, url: str) -> float:
+        """Fetch priority of the source behind a URL"""
+        with self._lock:
+            stats = self._sources.get(source_of(url))
+            return stats.priority() if stats else SourceStats('').priority()
+
+    def rank(self, items: Iterable, key: Callable = None) -> List:
+        """
+        Order items best source first (fast, reliable, high-yield)
+
+        Args:
+            items: URLs, or arbitrary items when key is given
+            key: Function returning the URL of an item
+
+        Returns:
+            New list, stable for items from equally ranked sources
+        """
+        key = key or (lambda item: item)
+        items = list(items)
+        priorities = {}
+        for item in items:
+            url = key(item)
+            if url not in priorities:
+                priorities[url] = self.priority(url)
+        return sorted(items, key=lambda item: priorities[key(item)], reverse=True)
+
+    def snapshot(self) -> List[Dict]:
+        """Statistics for every known source, best first"""
+        with self._lock:
+            stats = [s.to_dict() for s in self._sources.values()]
+        return sorted(stats, key=lambda s: s['priority'], reverse=True)
+
+    def save(self):
+        """Persist counters (latency windows are kept as-is) to disk"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                name: {**s.to_dict(), 'latencies': list(s.latencies)}
+                for name, s in self._sources.items()
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        """Load counters persisted by a previous run"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠ Could not load source statistics: {e}")
+            return
+
+        with self._lock:
+            for name, entry in data.items():
+                stats = self._get(name)
+                stats.latencies.extend(entry.get('latencies', []))
+                for field in ('requests', 'errors', 'bytes_fetched', 'hits', 'relevant_hits'):
+                    setattr(stats, field, entry.get(field, 0))
+                stats.last_error = entry.get('last_error')
+                stats.last_seen = entry.get('last_seen')
+
+
+_source_registry: Optional[SourceRegistry] = None
+_source_registry_lock = threading.Lock()
+
+
+def get_source_registry() -> SourceRegistry:
+    """Return the process-wide source registry, creating it on first use"""
+    global _source_registry
+    with _source_registry_lock:
+        if _source_registry is None:
+            _source_registry = SourceRegistry()
+        return _source_registry
@@ -13,17 +13,15 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import TOR_PROXY, REQUEST_DELAY, LOG_FILE
+from config import REQUEST_DELAY, MAX_RETRIES
+from scrapers.log_setup import setup_logging
+from scrapers.source_registry import get_source_registry
+from scrapers.decoding import response_text
+from scrapers.retry_policy import get_retry_policy
+from scrapers.transport import get_session
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +29,11 @@ logger = logging.getLogger(__name__)
 class TorScraper:
     """Scraper for Tor hidden services (.onion sites)"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.proxies = TOR_PROXY
+    def __init__(self, source_registry=None, retry_policy=None, session=None):
+        self.session = session or get_session('tor')
         self.is_connected = False
+        self.source_registry = source_registry or get_source_registry()
+        self.retry_policy = retry_policy or get_retry_policy()
     
     def test_tor_connection(self) -> bool:
         """
@@ -71,13 +70,14 @@ class TorScraper:
             self.is_connected = False
             return False
     
-    def fetch_onion_site(self, url: str, timeout: int = 60) -> Optional[Dict]:
+    def fetch_onion_site(self, url: str, timeout: int = 60, retries: int = MAX_RETRIES) -> Optional[Dict]:
         """
         Fetch content from an onion site
         
         Args:
             url: The .onion URL to fetch
             timeout: Request timeout in seconds
+            retries: Attempts allowed for transient failures (see RetryPolicy); at least one is made
             
         Returns:
             Dict with status, content, and error info or None if failed
@@ -91,64 +91,94 @@ class TorScraper:
                     'error': 'Tor connection not available'
                 }
         
-        try:
-            logger.info(f"Fetching onion site: {url}")
-            
-            response = self.session.get(
-                url,
-                timeout=timeout,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; rv:102.0) Gecko/20100101 Firefox/102.0'
-                }
-            )
-            
-            response.raise_for_status()
-            
-            # Parse content
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            result = {
-                'status': 'success',
-                'url': url,
-                'content': response.text,
-                'title': soup.title.string if soup.title else 'No title',
-                'text': soup.get_text(),
-                'status_code': response.status_code
-            }
-            
-            logger.info(f"✓ Successfully fetched {url}")
-            time.sleep(REQUEST_DELAY)  # Rate limiting
-            
-            return result
-            
-        except requests.exceptions.Timeout:
-            logger.error(f"✗ Timeout fetching {url}")
-            return {
-                'status': 'error',
-                'url': url,
-                'error': 'Request timeout'
-            }
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"✗ Connection error fetching {url}: {e}")
+        if self.retry_policy.is_dead(url):
+            logger.info("Skipping known-dead onion URL: %s", url, extra={'url': url})
             return {
                 'status': 'error',
                 'url': url,
-                'error': f'Connection error: {str(e)}'
-            }
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"✗ HTTP error fetching {url}: {e}")
-            return {
-                'status': 'error',
-                'url': url,
-                'error': f'HTTP error: {str(e)}'
-            }
-        except Exception as e:
-            logger.error(f"✗ Unexpected error fetching {url}: {e}")
-            return {
-                'status': 'error',
-                'url': url,
-                'error': f'Unexpected error: {str(e)}'
+                'error': 'Known dead URL'
             }
+        
+        retries = max(1, retries)
+        for attempt in range(retries):
+            wait = self.retry_policy.host_wait(url)
+            if wait:
+                time.sleep(wait)
+            started = time.monotonic()
+            try:
+                logger.info("Fetching onion site: %s", url, extra={'url': url})
+                
+                response = self.session.get(
+                    url,
+                    timeout=timeout,
+                    headers={
+                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; rv:102.0) Gecko/20100101 Firefox/102.0'
+                    }
+                )
+                
+                response.raise_for_status()
+                self.source_registry.record_request(
+                    url, time.monotonic() - started, ok=True, nbytes=len(response.content),
+                    status=response.status_code
+                )
+                
+                # Parse content (charset sniffed from a bounded prefix only)
+                html = response_text(response)
+                soup = BeautifulSoup(html, 'html.parser')
+                
+                result = {
+                    'status': 'success',
+                    'url': url,
+                    'content': html,
+                    'title': soup.title.string if soup.title else 'No title',
+                    'text': soup.get_text(),
+                    'status_code': response.status_code
+                }
+                
+                logger.info("✓ Successfully fetched %s", url, extra={'url': url})
+                time.sleep(REQUEST_DELAY)  # Rate limiting
+                
+                return result
+                
+            except requests.exceptions.Timeout as e:
+                failure = e
+                error = 'Request timeout'
+                self.source_registry.record_request(url, time.monotonic() - started, ok=False, error=error)
+                logger.error(f"✗ Timeout fetching {url}")
+            except requests.exceptions.ConnectionError as e:
+                failure = e
+                error = f'Connection error: {str(e)}'
+                self.source_registry.record_request(url, time.monotonic() - started, ok=False, error=str(e))
+                logger.error(f"✗ Connection error fetching {url}: {e}")
+            except requests.exceptions.RequestException as e:
+                failure = e
+                error = f'HTTP error: {str(e)}'
+                self.source_registry.record_request(
+                    url, time.monotonic() - started, ok=False, error=str(e),
+                    status=e.response.status_code if e.response is not None else None
+                )
+                logger.error(f"✗ HTTP error fetching {url}: {e}")
+            except Exception as e:
+                # requests wraps every network failure in RequestException; anything
+                # else is a parsing or programming error a refetch would only repeat
+                logger.error(f"✗ Unexpected error fetching {url}: {e}")
+                return {
+                    'status': 'error',
+                    'url': url,
+                    'error': f'Unexpected error: {str(e)}'
+                }
+            
+            delay = self.retry_policy.retry_delay(url, failure, attempt, retries)
+            if delay is None:
+                break
+            logger.info(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 2}/{retries})")
+            time.sleep(delay)
+        
+        return {
+            'status': 'error',
+            'url': url,
+            'error': error
+        }
     
     def search_onion_pastes(self, query: str, paste_sites: list) -> list:
         """
@@ -163,7 +193,8 @@ class TorScraper:
         """
         results = []
         
-        for site in paste_sites:
+        # Try fast, productive mirrors first
+        for site in self.source_registry.rank(paste_sites):
             try:
                 logger.info(f"Searching {site} for: {query}")
                 
@@ -172,7 +203,9 @@ class TorScraper:
                 
                 if site_data and site_data['status'] == 'success':
                     # Check if query appears in content
-                    if query.lower() in site_data['text'].lower():
+                    found = query.lower() in site_data['text'].lower()
+                    self.source_registry.record_hit(site, found)
+                    if found:
                         results.append({
                             'url': site,
                             'title': site_data['title'],
@@ -0,0 +1,317 @@
+"""
+Tracing for Project NEXT Intelligence
+Stage-level spans per scan, OTLP/JSON export and an on-demand sampling profiler
+
+Spans nest through a context variable, so code called from a scan (also
+on worker threads started with asyncio.to_thread) joins that scan's trace;
+the trace ID is the scan ID. Finished spans are batched and posted to an
+OTLP/HTTP collector (TRACE_EXPORT_URL). The profiler samples thread stacks
+and returns them as folded stacks, prefixed with the span path each worker
+thread was in, ready for flamegraph.pl or speedscope.
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    ENABLE_TRACING, TRACE_EXPORT_URL, TRACE_EXPORT_INTERVAL,
+    TRACE_SERVICE_NAME, PROFILE_INTERVAL
+)
+from scrapers.log_setup import setup_logging
+from scrapers.metrics import STAGE_DURATION
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar('current_span', default=None)
+
+# Innermost open span of every worker thread, read by the profiler. Coroutines
+# interleave on the event loop thread, so spans opened there are not tracked.
+_thread_spans: Dict[int, "Span"] = {}
+
+_EXPORT_QUEUE_SIZE = 10000
+
+
+class Span:
+    """One timed operation of a trace"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent', 'start_ns', 'end_ns',
+                 'attributes', 'error')
+
+    def __init__(self, name: str, trace_id: str, parent: Optional["Span"] = None,
+                 attributes: Dict = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent = parent
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (so far, if still open)"""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def path(self) -> List[str]:
+        """Span names from the root down to this span"""
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return names[::-1]
+
+    def set(self, **attributes):
+        """Add attributes"""
+        self.attributes.update(attributes)
+
+    def to_otlp(self) -> Dict:
+        """Span in the OTLP/JSON encoding"""
+        otlp = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': _otlp_attributes(self.attributes),
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1},
+        }
+        if self.parent is not None:
+            otlp['parentSpanId'] = self.parent.span_id
+        return otlp
+
+
+def _otlp_attributes(attributes: Dict) -> List[Dict]:
+    encoded = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            value = {'boolValue': value}
+        elif isinstance(value, int):
+            value = {'intValue': str(value)}
+        elif isinstance(value, float):
+            value = {'doubleValue': value}
+        else:
+            value = {'stringValue': str(value)}
+        encoded.append({'key': key, 'value': value})
+    return encoded
+
+
+def trace_id_for(scan_id: str) -> str:
+    """Trace ID of a scan (its UUID as 32 hex digits)"""
+    try:
+        return uuid.UUID(scan_id).hex
+    except (TypeError, ValueError):
+        return uuid.uuid5(uuid.NAMESPACE_URL, str(scan_id)).hex
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span of the calling context"""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, scan_id: str = None, **attributes):
+    """
+    Time a block as a span of the current trace
+
+    Args:
+        name: Span name (e.g. "fetch", "analyze_paste")
+        scan_id: Start a new trace for this scan instead of joining the current one
+        attributes: Span attributes
+
+    Yields:
+        The Span, or None when tracing is disabled
+    """
+    if not ENABLE_TRACING:
+        yield None
+        return
+
+    parent = None if scan_id else _current_span.get()
+    if scan_id:
+        attributes['scan_id'] = scan_id
+        trace_id = trace_id_for(scan_id)
+    else:
+        trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+    current = Span(name, trace_id, parent, attributes)
+
+    token = _current_span.set(current)
+    thread_id = None if _on_event_loop() else threading.get_ident()
+    if thread_id is not None:
+        previous = _thread_spans.get(thread_id)
+        _thread_spans[thread_id] = current
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        if thread_id is not None:
+            if previous is None:
+                _thread_spans.pop(thread_id, None)
+            else:
+                _thread_spans[thread_id] = previous
+        get_span_exporter().export(current)
+
+
+@contextmanager
+def stage(name: str, **attributes):
+    """A span that also feeds the per-stage duration histogram"""
+    with STAGE_DURATION.labels(name).time(), span(name, **attributes) as current:
+        yield current
+
+
+class SpanExporter:
+    """Batches finished spans and posts them to an OTLP/HTTP collector"""
+
+    def __init__(self, url: str = TRACE_EXPORT_URL, interval: float = TRACE_EXPORT_INTERVAL,
+                 service_name: str = TRACE_SERVICE_NAME, max_queue: int = _EXPORT_QUEUE_SIZE):
+        """
+        Initialize the exporter
+
+        Args:
+            url: Collector traces endpoint, e.g. http://localhost:4318/v1/traces
+                 (spans are discarded if empty)
+            interval: Seconds between exports
+            service_name: service.name resource attribute
+            max_queue: Finished spans kept while the collector is unreachable
+        """
+        self.url = url
+        self.interval = interval
+        self.service_name = service_name
+        self._spans: deque = deque(maxlen=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def export(self, finished: Span):
+        """Queue a finished span"""
+        if not self.url:
+            return
+        self._spans.append(finished)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._export_periodically, name="span-exporter", daemon=True
+                    )
+                    self._thread.start()
+
+    def _export_periodically(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def payload(self, spans: List[Span]) -> Dict:
+        """OTLP/JSON ExportTraceServiceRequest for a batch of spans"""
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': _otlp_attributes({'service.name': self.service_name})},
+                'scopeSpans': [{
+                    'scope': {'name': 'next-intelligence'},
+                    'spans': [s.to_otlp() for s in spans],
+                }],
+            }]
+        }
+
+    def flush(self) -> int:
+        """
+        Post queued spans
+
+        Returns:
+            Number of spans delivered
+        """
+        spans = []
+        while self._spans:
+            spans.append(self._spans.popleft())
+        if not spans:
+            return 0
+        import requests  # Only needed once a collector is configured
+        try:
+            response = requests.post(self.url, json=self.payload(spans), timeout=10)
+            response.raise_for_status()
+            return len(spans)
+        except requests.RequestException as e:
+            logger.warning(f"⚠ Could not export {len(spans)} spans to {self.url}: {e}")
+            self._spans.extendleft(reversed(spans))
+            return 0
+
+
+_span_exporter: Optional[SpanExporter] = None
+_span_exporter_lock = threading.Lock()
+
+
+def get_span_exporter() -> SpanExporter:
+    """Return the process-wide span exporter, creating it on first use"""
+    global _span_exporter
+    if _span_exporter is None:
+        with _span_exporter_lock:
+            if _span_exporter is None:
+                _span_exporter = SpanExporter()
+    return _span_exporter
+
+
+def _folded_frames(frame) -> List[str]:
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return frames[::-1]
+
+
+def profile(seconds: float, scan_id: str = None, interval: float = PROFILE_INTERVAL) -> str:
+    """
+    Sample the stacks of running threads
+
+    Args:
+        seconds: How long to sample
+        scan_id: Only sample threads inside this scan's spans
+                 (needs ENABLE_TRACING; every thread is sampled otherwise)
+        interval: Seconds between samples
+
+    Returns:
+        Folded stacks ("span;...;frame;frame count" per line), hottest first
+    """
+    trace_id = trace_id_for(scan_id) if scan_id and ENABLE_TRACING else None
+    own = threading.get_ident()
+    samples: Counter = Counter()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            active = _thread_spans.get(thread_id)
+            if trace_id and (active is None or active.trace_id != trace_id):
+                continue
+            prefix = active.path() if active is not None else []
+            samples[';'.join(prefix + _folded_frames(frame))] += 1
+        time.sleep(interval)
+
+    return ''.join(f"{stack} {count}\n" for stack, count in samples.most_common())
@@ -0,0 +1,229 @@
+"""
+HTTP Transport for Project NEXT Intelligence
+Process-wide connection pools shared by every orchestrator and scraper
+
+Each backend ("clearnet", "tor") keeps one set of adapters for the life of
+the process. Each one holds HTTP_POOL_HOSTS host pools of up to
+HTTP_POOL_MAXSIZE keep-alive connections, and HTTP_POOL_SIZES can override
+the size per host. The TCP/TLS handshake to a paste site is therefore paid
+once per host rather than once per scan. Every caller still gets its own
+requests.Session, so cookies never pass between concurrent scans. Clearnet
+pools resolve hosts through a TTL'd DNS cache. Tor sessions resolve through
+the proxy (socks5h) and never use it.
+"""
+
+import logging
+import socket
+import threading
+import time
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TOR_PROXY, HTTP_POOL_HOSTS, HTTP_POOL_MAXSIZE, HTTP_POOL_SIZES, DNS_CACHE_TTL
+from scrapers.log_setup import setup_logging
+
+# Setup logging
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
+# Keep idle pooled connections alive through NAT and load-balancer timeouts
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+
+class DnsCache:
+    """TTL cache in front of socket.getaddrinfo"""
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple, Tuple[float, list]] = {}
+        self._lock = threading.Lock()
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Cached drop-in for socket.getaddrinfo (failures are not cached)"""
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+        result = socket.getaddrinfo(host, port, family, type, proto, flags)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (now + self.ttl, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _CachedResolution:
+    """Connection mixin resolving its host through a DnsCache instead of per connect"""
+
+    def __init__(self, *args, dns_cache: DnsCache = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dns_cache = dns_cache
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+
+        # Connect to each resolved address in turn; a literal address resolves locally
+        error = NewConnectionError(self, f"Failed to establish a new connection: no addresses for {host}")
+        for *_, sockaddr in addresses:
+            self._dns_host = sockaddr[0]
+            try:
+                return super()._new_conn()
+            except NewConnectionError as e:
+                error = e
+            finally:
+                self._dns_host = host
+        raise error
+
+
+class CachedHTTPConnection(_CachedResolution, HTTPConnection):
+    pass
+
+
+class CachedHTTPSConnection(_CachedResolution, HTTPSConnection):
+    pass
+
+
+class CachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedHTTPConnection
+
+    def __init__(self, *args, dns_cache: DnsCache = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.conn_kw['dns_cache'] = dns_cache
+
+
+class CachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedHTTPSConnection
+
+    def __init__(self, *args, dns_cache: DnsCache = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.conn_kw['dns_cache'] = dns_cache
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections enable TCP keep-alive and, optionally, cached DNS"""
+
+    def __init__(self, *args, dns_cache: Optional[DnsCache] = None, **kwargs):
+        # Set before HTTPAdapter.__init__, which builds the pool manager
+        self.dns_cache = dns_cache
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+        if self.dns_cache is not None:
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': partial(CachedHTTPConnectionPool, dns_cache=self.dns_cache),
+                'https': partial(CachedHTTPSConnectionPool, dns_cache=self.dns_cache),
+            }
+
+
+def build_adapters(pool_hosts: int = HTTP_POOL_HOSTS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                   pool_sizes: Dict[str, int] = None,
+                   dns_cache: Optional[DnsCache] = None) -> Dict[str, KeepAliveAdapter]:
+    """
+    Create pooled keep-alive adapters, keyed by the URL prefix they serve
+
+    Retries are left to RetryPolicy, so the adapters never retry themselves.
+
+    Args:
+        pool_hosts: Host pools kept open per adapter
+        pool_maxsize: Connections kept per host
+        pool_sizes: Per-host connection counts overriding pool_maxsize
+        dns_cache: Cache resolving the pools' hosts (None resolves on every connect)
+    """
+    adapter = KeepAliveAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize, max_retries=0,
+                               dns_cache=dns_cache)
+    adapters = {'http://': adapter, 'https://': adapter}
+    for host, size in (pool_sizes if pool_sizes is not None else HTTP_POOL_SIZES).items():
+        host_adapter = KeepAliveAdapter(pool_connections=1, pool_maxsize=size, max_retries=0,
+                                        dns_cache=dns_cache)
+        adapters[f'http://{host}/'] = host_adapter
+        adapters[f'https://{host}/'] = host_adapter
+    return adapters
+
+
+def build_session(proxies: Optional[Dict[str, str]] = None,
+                  adapters: Dict[str, KeepAliveAdapter] = None) -> requests.Session:
+    """
+    Create a session (with its own cookie jar) over pooled adapters
+
+    Args:
+        proxies: Session proxies (e.g. TOR_PROXY)
+        adapters: URL prefix -> adapter, as from build_adapters (new ones if None)
+    """
+    session = requests.Session()
+    if proxies:
+        session.proxies = dict(proxies)
+    for prefix, adapter in (adapters if adapters is not None else build_adapters()).items():
+        session.mount(prefix, adapter)
+    return session
+
+
+_adapters: Dict[str, Dict[str, KeepAliveAdapter]] = {}
+_adapters_lock = threading.Lock()
+_dns_cache: Optional[DnsCache] = None
+
+
+def get_dns_cache() -> Optional[DnsCache]:
+    """Return the clearnet DNS cache (None if DNS_CACHE_TTL is 0)"""
+    global _dns_cache
+    with _adapters_lock:
+        if _dns_cache is None and DNS_CACHE_TTL > 0:
+            _dns_cache = DnsCache()
+        return _dns_cache
+
+
+def get_session(name: str = 'clearnet') -> requests.Session:
+    """
+    Return a new session over the backend's process-wide pools, creating them on first use
+
+    Sessions are not thread-safe and carry cookies, so each orchestrator or
+    scraper gets its own; only the pooled connections are shared.
+
+    Args:
+        name: "clearnet" (direct, DNS-cached) or "tor" (through TOR_PROXY)
+    """
+    if name not in ('clearnet', 'tor'):
+        raise ValueError(f"Unknown transport '{name}'. Use 'clearnet' or 'tor'")
+    dns_cache = get_dns_cache() if name == 'clearnet' else None
+    with _adapters_lock:
+        if name not in _adapters:
+            _adapters[name] = build_adapters(dns_cache=dns_cache)
+            logger.info(f"✓ Created shared {name} HTTP connection pools")
+        adapters = _adapters[name]
+    return build_session(proxies=TOR_PROXY if name == 'tor' else None, adapters=adapters)
+
+
+def close_pools():
+    """Close every shared pool and its connections"""
+    with _adapters_lock:
+        for adapters in _adapters.values():
+            for adapter in set(adapters.values()):
+                adapter.close()
+        _adapters.clear()
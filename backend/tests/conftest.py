@@ -3,10 +3,14 @@
 import pytest
 import sys
 import os
+import tempfile
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Keep the rotating log of test runs out of the source tree (read by config at import)
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.mkdtemp(prefix="next-intel-tests-"), "discovery.log"))
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -5,6 +5,7 @@ import asyncio
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch, AsyncMock
 import json
+import logging
 
 # Import the FastAPI app
 import sys
@@ -189,6 +190,45 @@ class TestAPIEndpoints:
                response.status_code in [200, 405]
 
 
+class TestEmailIndex:
+    """Test suite for the cross-scan email inverted index"""
+
+    RESULTS = [
+        {"url": "https://pastebin.com/aaaaaaaa", "content_hash": "h1",
+         "emails": ["Budi.S@ui.ac.id", "x@gmail.com"], "target_emails": ["budi.s@ui.ac.id"]},
+        {"url": "https://pastebin.com/bbbbbbbb", "content_hash": "h2",
+         "emails": ["budi.s@ui.ac.id", "budi.s@gmail.com"], "target_emails": ["budi.s@ui.ac.id"]},
+    ]
+
+    def test_be_011_lookup_and_prefix_search(self):
+        """TC-BE-011: Email lookups and prefix searches span all scans"""
+        from scrapers.email_index import EmailIndex
+
+        index = EmailIndex(":memory:")
+        assert index.add_scan("scan-1", self.RESULTS[:1]) == 2
+        assert index.add_scan("scan-2", self.RESULTS[1:]) == 2
+        assert index.add_scan("scan-2", self.RESULTS[1:]) == 0
+
+        postings = index.lookup("BUDI.S@ui.ac.id")
+        assert {p["finding_id"] for p in postings} == {"scan-1:0", "scan-2:0"}
+        assert all(p["is_target"] == 1 for p in postings)
+        assert len(index.lookup("budi.s")) == 3
+
+        assert index.prefix_search("budi") == [
+            {"email": "budi.s@gmail.com", "findings": 1},
+            {"email": "budi.s@ui.ac.id", "findings": 2},
+        ]
+        assert index.prefix_search("budi", domain="ui.ac.id") == [
+            {"email": "budi.s@ui.ac.id", "findings": 2}
+        ]
+
+    def test_be_012_email_endpoints(self):
+        """TC-BE-012: Email lookup and search endpoints"""
+        assert client.get("/api/emails/nobody@ui.ac.id").json()["postings"] == []
+        assert client.get("/api/emails", params={"prefix": "a"}).status_code == 400
+        assert client.get("/api/emails", params={"prefix": "zz-unknown"}).json() == []
+
+
 # ============================================================================
 # DISCOVERY ENGINE TESTS - TC-DE-001 to TC-DE-008
 # ============================================================================
@@ -318,6 +358,1324 @@ class TestDiscoveryEngine:
         assert len(found_keywords) == 3
 
 
+class TestBatchScorer:
+    """Test suite for feature-matrix batch scoring"""
+
+    DOCS = [
+        ("a", "admin@ui.ac.id:pass1\nstaff@ui.ac.id:pass2 leaked database dump", "UI leak"),
+        ("b", "nothing interesting here", ""),
+        ("c", "portal ui.ac.id login for mahasiswa, data bocor", "akun"),
+    ]
+
+    def test_de_007_matrix_matches_single_paste_scorer(self):
+        """TC-DE-007: Batch scores equal _calculate_relevance_score"""
+        from scrapers.batch_scorer import FeatureMatrix
+
+        engine = DiscoveryOrchestrator()
+        matrix = FeatureMatrix.build(self.DOCS, domain="ui.ac.id")
+        expected = [engine._calculate_relevance_score(text, title) for _, text, title in self.DOCS]
+
+        assert matrix.score().tolist() == expected
+
+    def test_de_008_rescore_with_new_weights(self, tmp_path):
+        """TC-DE-008: Rescoring uses new weights without re-reading documents"""
+        from scrapers.batch_scorer import FeatureMatrix, ScoringWeights
+
+        matrix = FeatureMatrix.build(self.DOCS, domain="ui.ac.id")
+        path = str(tmp_path / "features.npz")
+        matrix.save(path)
+        restored = FeatureMatrix.load(path)
+
+        emails_only = ScoringWeights(domain_cap=0, keyword_cap=0, email_cap=1.0, email_per_hit=0.5)
+        assert restored.score(emails_only).tolist() == pytest.approx([1.0, 0.0, 0.0])
+        assert restored.select(0.5, emails_only) == ["a"]
+
+        muted = ScoringWeights(keyword_weights={kw: 0.0 for kw in restored.keywords})
+        assert restored.score(muted)[2] == pytest.approx(0.1)
+        assert restored.ids == ["a", "b", "c"] and restored.keywords == matrix.keywords
+
+        # Pickled object arrays could run code on load
+        import numpy as np
+        np.savez(str(tmp_path / "pickled.npz"), ids=np.asarray(["a"], dtype=object))
+        with pytest.raises(ValueError):
+            FeatureMatrix.load(str(tmp_path / "pickled.npz"))
+
+
+class TestDomainMatcher:
+    """Test suite for single-pass multi-domain matching"""
+
+    def test_de_009_exact_and_wildcard_domains(self):
+        """TC-DE-009: Exact domains match the host only, wildcards match subdomains"""
+        from scrapers.domain_matcher import DomainMatcher
+
+        matcher = DomainMatcher(["ui.ac.id", "*.itb.ac.id"])
+        hits = matcher.scan(
+            "admin@ui.ac.id dosen@cs.ui.ac.id Staff@STEI.ITB.AC.ID itb.ac.id xui.ac.id"
+        )
+
+        assert hits["ui.ac.id"].mentions == 1
+        assert hits["ui.ac.id"].emails == {"admin@ui.ac.id"}
+        assert hits["*.itb.ac.id"].mentions == 2
+        assert hits["*.itb.ac.id"].emails == {"staff@stei.itb.ac.id"}
+
+    def test_de_010_per_domain_scores_in_one_pass(self):
+        """TC-DE-010: The analyzer scores every monitored domain separately"""
+        engine = DiscoveryOrchestrator(monitored_domains=["ui.ac.id", "*.ugm.ac.id"])
+
+        scores = engine.analyze_content(
+            "https://pastebin.com/aaaaaaaa",
+            "password dump\nmhs1@ui.ac.id:x\nmhs2@ui.ac.id:y\nportal.ugm.ac.id", {"title": "leak"}
+        )["domains"]
+
+        assert scores["ui.ac.id"]["target_emails"] == ["mhs1@ui.ac.id", "mhs2@ui.ac.id"]
+        assert scores["*.ugm.ac.id"]["target_emails"] == []
+        assert scores["ui.ac.id"]["relevance_score"] > scores["*.ugm.ac.id"]["relevance_score"] > 0
+
+
+class TestCredentialExtractor:
+    """Test suite for the streaming credential extractor"""
+
+    COMBOLIST = (
+        "admin@ui.ac.id:hunter22\n"
+        "bob;5f4dcc3b5aa765d61d8327deb882cf99\n"
+        "Logged at 2024-01-01T12:30:00Z\n"
+        "12:30:45\n"
+        "see https://pastebin.com/raw/abc\n"
+        "Password: correct horse battery\n"
+        "api_key = sk_live_abc123\n"
+    )
+
+    def test_de_011_structured_records(self):
+        """TC-DE-011: Combos and key: value lines become structured records"""
+        from scrapers.credential_extractor import extract_credentials
+
+        records = list(extract_credentials(self.COMBOLIST))
+
+        assert [(r.identifier, r.secret_type, r.line, r.hash_format) for r in records] == [
+            ("admin@ui.ac.id", "password", 1, None),
+            ("bob", "hash", 2, "md5"),
+            ("password", "password", 6, None),
+            ("api_key", "api_key", 7, None),
+        ]
+        assert records[1].offset == len("admin@ui.ac.id:hunter22\n")
+
+    def test_de_012_timestamps_and_urls_are_not_credentials(self):
+        """TC-DE-012: Timestamps and URLs no longer count as credentials"""
+        engine = DiscoveryOrchestrator()
+
+        assert engine._contains_credentials("Posted 12:30:45 at https://example.com") is False
+        assert engine._contains_credentials("student01:Rahasia123") is True
+
+    def test_de_013_cli_streams_file(self, tmp_path, capsys):
+        """TC-DE-013: The CLI summarizes a combolist file"""
+        from scrapers.credential_extractor import main
+
+        path = tmp_path / "combo.txt"
+        path.write_text(self.COMBOLIST * 100)
+        main([str(path), "--samples", "3"])
+        summary = json.loads(capsys.readouterr().out)
+
+        assert summary["total"] == 400
+        assert summary["by_hash_format"] == {"md5": 100}
+        assert len(summary["samples"]) == 3
+
+    def test_de_039_giant_line_is_not_carried(self):
+        """TC-DE-039: A line longer than MAX_LINE_BYTES is skipped without buffering it"""
+        import io
+        from scrapers import credential_extractor
+        from scrapers.credential_extractor import MAX_LINE_BYTES, iter_credentials
+
+        giant = b"x" * (MAX_LINE_BYTES * 20) + b"\n"
+        data = b"first@ui.ac.id:hunter22\n" + giant + b"last@ui.ac.id:hunter22\n"
+        chunks = list(credential_extractor._iter_chunks(io.BytesIO(data), 8192))
+        records = list(iter_credentials(io.BytesIO(data), chunk_size=8192))
+
+        assert max(len(chunk) for chunk, _ in chunks) <= 8192 + MAX_LINE_BYTES
+        assert b"".join(chunk for chunk, _ in chunks) == data
+        assert [(r.identifier, r.line) for r in records] == [("first@ui.ac.id", 1), ("last@ui.ac.id", 3)]
+        assert records[1].offset == data.index(b"last@")
+
+
+class TestPasteStore:
+    """Test suite for the content-addressed raw paste store"""
+
+    def test_de_014_bodies_are_stored_once(self, tmp_path):
+        """TC-DE-014: Identical bodies share one compressed object"""
+        from scrapers.paste_store import PasteStore
+
+        store = PasteStore(root=str(tmp_path), dict_samples=0)
+        body = b"mhs@ui.ac.id:rahasia\n" * 200
+        first = store.put(body, "https://pastebin.com/aaaaaaaa", {"title": "dump"})
+        second = store.put(body, "https://pastebin.com/bbbbbbbb")
+
+        assert first == second
+        assert len(store) == 1
+        assert store.get(first) == body
+        assert len(list(tmp_path.rglob("*.zst"))) == 1
+        assert [ref["url"] for ref in store.iter_refs()] == [
+            "https://pastebin.com/aaaaaaaa", "https://pastebin.com/bbbbbbbb"
+        ]
+
+    def test_de_015_dictionary_training_keeps_old_frames_readable(self, tmp_path):
+        """TC-DE-015: Bodies written before and after dictionary training decode"""
+        from scrapers.paste_store import PasteStore
+
+        store = PasteStore(root=str(tmp_path), dict_samples=0)
+        bodies = [
+            (f"user{i}@ui.ac.id:Passw0rd{i * 7}\nstaff{i}@ui.ac.id:{i * 13}secret\n" * 5).encode()
+            for i in range(300)
+        ]
+        digests = [store.put(body, f"https://pastebin.com/{i:08d}") for i, body in enumerate(bodies[:200])]
+        assert store.train_dictionary(dict_size=4096) is not None
+        digests += [store.put(body, f"https://pastebin.com/{i:08d}") for i, body in enumerate(bodies[200:])]
+
+        reopened = PasteStore(root=str(tmp_path), dict_samples=0)
+        assert [reopened.get(d) for d in digests] == bodies
+
+    def test_de_040_training_runs_once_off_the_scan_thread(self, tmp_path):
+        """TC-DE-040: Crossing the training threshold from many threads trains once, in the background"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from scrapers.paste_store import PasteStore
+
+        store = PasteStore(root=str(tmp_path), dict_samples=20)
+        release = threading.Event()
+        calls = []
+
+        def train():
+            calls.append(threading.current_thread().name)
+            release.wait(10)
+            return 1
+
+        with patch.object(store, "train_dictionary", side_effect=train):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda i: store.put(f"body {i}".encode(), f"https://pastebin.com/{i:08d}"),
+                              range(100)))
+            assert len(store) == 100
+            release.set()
+            store.wait_for_training(timeout=10)
+
+        assert calls == ["paste-dict-trainer"]
+
+    def test_de_047_compression_runs_outside_the_store_lock(self, tmp_path):
+        """TC-DE-047: Bodies are compressed and read without the store lock; concurrent use round-trips"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from scrapers.paste_store import PasteStore
+
+        store = PasteStore(root=str(tmp_path), dict_samples=0)
+        digest = store.put(b"admin@ui.ac.id:secret\n" * 1000, "https://pastebin.com/aaaaaaaa")
+        outcome = {}
+
+        def read_and_write():
+            outcome["body"] = store.get(digest)
+            outcome["frame"] = store._compressor().compress(b"new body")
+
+        with store._lock:
+            worker = threading.Thread(target=read_and_write)
+            worker.start()
+            worker.join(timeout=5)
+            assert not worker.is_alive()
+        assert outcome["body"] == b"admin@ui.ac.id:secret\n" * 1000
+
+        bodies = [f"paste {i} ".encode() * (100 + i) for i in range(64)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            digests = list(pool.map(lambda i: store.put(bodies[i], f"https://pastebin.com/{i:08d}"),
+                                    range(64)))
+            assert list(pool.map(store.get, digests)) == bodies
+
+    def test_de_016_reanalysis_reads_local_storage(self, tmp_path):
+        """TC-DE-016: Stored pastes are re-analyzed without network requests"""
+        from scrapers.paste_store import PasteStore
+
+        store = PasteStore(root=str(tmp_path), dict_samples=0)
+        store.put(b"password dump\nadmin@ui.ac.id:x\nstaff@ui.ac.id:y\nui.ac.id leak",
+                  "https://pastebin.com/aaaaaaaa", {"title": "UI leak", "author": "anon"})
+        store.put(b"nothing here", "https://pastebin.com/bbbbbbbb")
+        engine = DiscoveryOrchestrator(paste_store=store)
+
+        with patch.object(engine, "_make_request", side_effect=AssertionError("network used")):
+            results = engine.reanalyze_stored()
+
+        assert [r["url"] for r in results] == ["https://pastebin.com/aaaaaaaa"]
+        assert results[0]["author"] == "anon"
+        assert store.get(results[0]["content_hash"]).startswith(b"password dump")
+
+
+class TestExposureFilter:
+    """Test suite for the known-exposure filter"""
+
+    def test_de_017_only_new_emails_are_reported(self, tmp_path):
+        """TC-DE-017: Emails from earlier leaks are not reported as new"""
+        from scrapers.exposure_filter import KnownExposureFilter
+
+        bloom_path = str(tmp_path / "known.bloom")
+        db_path = str(tmp_path / "known.db")
+        known = KnownExposureFilter(bloom_path, db_path, capacity=100)
+
+        assert known.partition_new(["A@ui.ac.id", "b@ui.ac.id"], "https://pastebin.com/1") == [
+            "a@ui.ac.id", "b@ui.ac.id"
+        ]
+        assert known.partition_new(["a@ui.ac.id", "c@ui.ac.id"]) == ["c@ui.ac.id"]
+        known.save()
+
+        reopened = KnownExposureFilter(bloom_path, db_path, capacity=100)
+        assert reopened.bloom.count == 3
+        assert reopened.is_known("B@UI.AC.ID") is True
+        assert reopened.is_known("d@ui.ac.id") is False
+
+    def test_de_018_filter_grows_past_capacity(self, tmp_path):
+        """TC-DE-018: The Bloom filter is rebuilt larger instead of saturating"""
+        from scrapers.exposure_filter import KnownExposureFilter
+
+        known = KnownExposureFilter(None, ":memory:", capacity=10)
+        known.add(f"user{i}@ui.ac.id" for i in range(25))
+
+        assert known.bloom.capacity >= 25
+        assert all(known.is_known(f"user{i}@ui.ac.id") for i in range(25))
+        assert known.partition_new(["user3@ui.ac.id", "new@ui.ac.id"]) == ["new@ui.ac.id"]
+
+    def test_de_041_novelty_is_atomic_and_reanalysis_does_not_record(self, tmp_path):
+        """TC-DE-041: Concurrent scans report an email as new once; re-analysis records nothing"""
+        from concurrent.futures import ThreadPoolExecutor
+        from scrapers.exposure_filter import KnownExposureFilter
+        from scrapers.paste_store import PasteStore
+
+        known = KnownExposureFilter(None, ":memory:", capacity=100)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            reports = list(pool.map(lambda i: known.partition_new(["race@ui.ac.id"]), range(64)))
+        assert sum(1 for new in reports if new == ["race@ui.ac.id"]) == 1
+
+        store = PasteStore(root=str(tmp_path), dict_samples=0)
+        store.put(b"password dump\nfresh@ui.ac.id:x\nui.ac.id leak", "https://pastebin.com/aaaaaaaa")
+        engine = DiscoveryOrchestrator(paste_store=store, exposure_filter=known)
+        assert engine.reanalyze_stored()[0]["new_target_emails"] == ["fresh@ui.ac.id"]
+        assert known.is_known("fresh@ui.ac.id") is False
+
+
+    def test_de_048_scan_storage_records_exposures_in_one_pass(self):
+        """TC-DE-048: Analysis never writes; storing a scan records its emails once, checking the Bloom filter first"""
+        from scrapers.exposure_filter import KnownExposureFilter
+
+        known = KnownExposureFilter(None, ":memory:", capacity=100)
+        known.add(["old@ui.ac.id"])
+        engine = DiscoveryOrchestrator(exposure_filter=known)
+        content = "password dump\nold@ui.ac.id:x\nnew@ui.ac.id:y\nui.ac.id leak"
+        statements = []
+        known._conn.set_trace_callback(statements.append)
+
+        first = engine.analyze_content("https://pastebin.com/aaaaaaaa", content)
+        second = engine.analyze_content("https://pastebin.com/bbbbbbbb", content)
+        assert first["new_target_emails"] == second["new_target_emails"] == ["new@ui.ac.id"]
+        assert not any(sql.startswith("INSERT") for sql in statements)
+        assert known.partition_new(["never@ui.ac.id"], record=False) == ["never@ui.ac.id"]
+
+        statements.clear()
+        assert known.record_findings([first, second]) == 1
+        assert first["new_target_emails"] == ["new@ui.ac.id"] and second["new_target_emails"] == []
+        assert sum(sql.startswith("INSERT") for sql in statements) == 1
+        assert known.is_known("new@ui.ac.id")
+
+        statements.clear()
+        assert known.partition_new(["fresh@ui.ac.id"], record=False) == ["fresh@ui.ac.id"]
+        assert statements == []  # a Bloom negative never reaches SQLite
+
+
+class TestAnalysisPool:
+    """Test suite for process-pool content analysis"""
+
+    DUMP = "".join(
+        f"mhs{i}@ui.ac.id:Rahasia{i}\nstaff{i}@cs.ui.ac.id;5f4dcc3b5aa765d61d8327deb882cf99\n"
+        f"kebocoran data https://ui.ac.id/{i} dosen{i}@gmail.com\n"
+        for i in range(300)
+    )
+
+    def test_de_019_chunks_split_on_line_boundaries(self):
+        """TC-DE-019: Chunks end at newlines and carry their starting line"""
+        from scrapers.analysis_pool import split_lines
+
+        data = self.DUMP.encode()
+        ranges = split_lines(data, 1000)
+
+        assert len(ranges) > 10
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (start, end, line_base), (next_start, _, next_base) in zip(ranges, ranges[1:]):
+            assert data[end - 1:end] == b"\n" and next_start == end
+            assert next_base == line_base + data.count(b"\n", start, end)
+
+    def test_de_020_pooled_analysis_matches_in_process(self):
+        """TC-DE-020: Merged chunk features equal single-process analysis"""
+        from scrapers.analysis_pool import AnalysisPool, extract_content_features
+        from scrapers.domain_matcher import DomainMatcher
+
+        domains = ["*.ui.ac.id", "gmail.com"]
+        pool = AnalysisPool(workers=2, chunk_bytes=4096, min_bytes=0)
+        try:
+            pooled = pool.analyze(self.DUMP, "UI leak", domains)
+        finally:
+            pool.close()
+        local = extract_content_features(self.DUMP, "UI leak", DomainMatcher(domains))
+
+        assert pooled.relevance_score() == local.relevance_score()
+        assert pooled.domain_scores() == local.domain_scores()
+        assert pooled.emails == local.emails
+        assert pooled.target_emails == local.target_emails
+        assert pooled.credentials.to_dict() == local.credentials.to_dict()
+        assert pooled.credentials.total == 600
+
+    def test_de_043_dotted_runs_scan_in_linear_time(self):
+        """TC-DE-043: A 1 MB dotted run costs about four times a 256 KB one (no backtracking blow-up)"""
+        import time
+        from scrapers.analysis_pool import extract_content_features
+        from scrapers.domain_matcher import DomainMatcher
+
+        matcher = DomainMatcher(["*.ui.ac.id"])
+        engine = DiscoveryOrchestrator(monitored_domains=[])
+
+        def scan(size):
+            data = b"a." * (size // 2) + b" x@ui.ac.id"
+            started = time.perf_counter()
+            features = extract_content_features(data, "", matcher)
+            emails = engine._extract_emails(data.decode())
+            return time.perf_counter() - started, features, emails
+
+        scan(16 * 1024)
+        small, _, _ = scan(256 * 1024)
+        large, features, emails = scan(1024 * 1024)
+
+        assert large < max(small, 0.05) * 12
+        assert large < 5
+        assert features.domains["*.ui.ac.id"].emails and emails
+
+
+class TestDecoding:
+    """Test suite for prefix-based body decoding"""
+
+    def test_de_023_charset_is_detected_from_a_bounded_prefix(self):
+        """TC-DE-023: Declared charset, BOM and prefix sniffing pick the encoding"""
+        from scrapers import decoding
+
+        utf8 = "kata sandi: rahasia ✓\n".encode() * 10000
+        assert decoding.detect_encoding(b"x", "text/plain; charset=ISO-8859-1") == "iso8859-1"
+        assert decoding.detect_encoding(b"\xef\xbb\xbfadmin") == "utf-8-sig"
+        assert decoding.to_utf8(utf8) is utf8
+
+        text = "Contraseña: año pasado, déjà vu, señor\n" * 100000
+        latin = text.encode("cp1252")
+        assert decoding.to_utf8(latin, "text/plain; charset=windows-1252") == text.encode()
+        with patch.object(decoding, "from_bytes", wraps=decoding.from_bytes) as sniff:
+            decoding.to_utf8(latin, "text/plain").decode("utf-8")
+        assert len(sniff.call_args.args[0]) <= decoding.DECODE_SNIFF_BYTES
+
+    def test_de_024_analysis_runs_on_raw_bytes(self):
+        """TC-DE-024: Byte-level analysis matches text analysis of the same paste"""
+        from scrapers.analysis_pool import extract_content_features
+        from scrapers.domain_matcher import DomainMatcher
+
+        text = "Kebocoran DATA\nAdmin@UI.ac.id:Rahasia1\njózef@ui.ac.id ui.ac.id\nbob@gmail.com;x1y2z3\n"
+        matcher = DomainMatcher(["*.ui.ac.id"])
+        features = extract_content_features(text.encode(), "Leak", matcher)
+
+        engine = DiscoveryOrchestrator(monitored_domains=[])
+        assert features.relevance_score() == engine._calculate_relevance_score(text, "Leak")
+        assert features.target_emails == {"Admin@UI.ac.id", "józef@ui.ac.id"}
+        assert features.emails == {"Admin@UI.ac.id", "bob@gmail.com"}
+        assert features.domains["*.ui.ac.id"].mentions == 3
+        assert features.credentials.total == 2
+
+
+class TestDbSink:
+    """Test suite for the batched Postgres sink"""
+
+    OWNER = "00000000-0000-0000-0000-000000000001"
+    SCAN = "11111111-1111-1111-1111-111111111111"
+
+    @staticmethod
+    def _finding(i):
+        return {
+            "url": f"https://pastebin.com/{i:08d}", "source": "pastebin", "title": f"dump {i}",
+            "author": "anon", "timestamp": "2024-01-01T12:00:00", "relevance_score": 0.75,
+            "has_credentials": True, "emails": [f"u{i}@ui.ac.id"], "target_emails": [f"u{i}@ui.ac.id"],
+            "content_preview": "password dump"
+        }
+
+    def test_de_025_flushes_on_size_and_retries_idempotently(self):
+        """TC-DE-025: Full batches flush, transient failures retry, IDs are stable"""
+        import psycopg
+        from scrapers.db_sink import ScanResultSink, finding_id
+
+        written = []
+        attempts = []
+
+        def write(rows):
+            attempts.append(len(rows))
+            if len(attempts) == 1:
+                raise psycopg.OperationalError("connection reset")
+            written.extend(rows)
+            return len(rows)
+
+        sink = ScanResultSink(owner_id=self.OWNER, batch_size=3, flush_interval=60, pool=Mock())
+        with patch.object(sink, "_write", side_effect=write), patch("scrapers.db_sink.time.sleep"):
+            sink.add_many(self.SCAN, (self._finding(i) for i in range(7)))
+            assert attempts == [3, 3, 3] and len(sink._buffer) == 1
+            sink.close()
+
+        assert len(written) == 7
+        assert written[0][0] == finding_id(self.SCAN, "https://pastebin.com/00000000")
+        assert written[0][12].year == 2024
+
+    def test_de_044_rejected_row_dropped_alone(self):
+        """TC-DE-044: NULs are stripped and a batch Postgres rejects loses only its bad row"""
+        import psycopg
+        from scrapers.db_sink import ScanResultSink
+
+        written = []
+
+        def write(rows):
+            if any(row[5] == "bad" for row in rows):
+                raise psycopg.DataError("invalid input")
+            written.extend(rows)
+            return len(rows)
+
+        findings = [self._finding(i) for i in range(8)]
+        findings[5]["title"] = "bad"
+        findings[2]["content_preview"] = "bin\x00ary"
+        sink = ScanResultSink(owner_id=self.OWNER, batch_size=100, flush_interval=60, pool=Mock())
+        with patch.object(sink, "_write", side_effect=write):
+            sink.add_many(self.SCAN, findings)
+            assert sink.flush() == 7
+            sink.close()
+
+        assert sorted(row[3] for row in written) == [f["url"] for i, f in enumerate(findings) if i != 5]
+        assert next(row for row in written if row[3] == findings[2]["url"])[7] == "binary"
+
+    @pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+    def test_de_026_copy_merge_against_postgres(self):
+        """TC-DE-026: Findings land in scan_results once, even when flushed twice"""
+        import psycopg
+        from psycopg.conninfo import make_conninfo
+        from psycopg_pool import ConnectionPool
+        from scrapers.db_sink import ScanResultSink
+
+        schema = "next_sink_test"
+        base = os.environ["TEST_DATABASE_URL"]
+        with psycopg.connect(base, autocommit=True) as conn:
+            conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+            conn.execute(f"CREATE SCHEMA {schema}")
+            conn.execute(f"SET search_path TO {schema}")
+            conn.execute("CREATE TABLE user_profiles (id UUID PRIMARY KEY)")
+            conn.execute(
+                "CREATE TABLE scans (id UUID PRIMARY KEY, user_id UUID NOT NULL REFERENCES user_profiles(id), "
+                "urls TEXT[] NOT NULL, enable_clearnet BOOLEAN DEFAULT true, enable_darknet BOOLEAN DEFAULT false, "
+                "crawl_authors BOOLEAN DEFAULT true, status TEXT, progress DECIMAL(3,2) DEFAULT 0.0, "
+                "total_results INTEGER DEFAULT 0, error TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE scan_results (id UUID PRIMARY KEY, scan_id UUID NOT NULL REFERENCES scans(id), "
+                "user_id UUID NOT NULL REFERENCES user_profiles(id), url TEXT NOT NULL, source TEXT NOT NULL, "
+                "title TEXT NOT NULL, author TEXT DEFAULT 'Unknown', content_preview TEXT, "
+                "relevance_score DECIMAL(3,2) NOT NULL, has_credentials BOOLEAN DEFAULT false, "
+                "emails TEXT[] DEFAULT ARRAY[]::TEXT[], target_emails TEXT[] DEFAULT ARRAY[]::TEXT[], "
+                "timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(), screenshot TEXT)"
+            )
+            conn.execute("INSERT INTO user_profiles VALUES (%s)", (self.OWNER,))
+
+        pool = ConnectionPool(make_conninfo(base, options=f"-csearch_path={schema}"), min_size=1, max_size=2,
+                              open=True)
+        sink = ScanResultSink(owner_id=self.OWNER, batch_size=500, flush_interval=60, pool=pool)
+        try:
+            sink.record_scan(self.SCAN, ["https://pastebin.com/x"], "running")
+            findings = [self._finding(i) for i in range(1200)]
+            findings[0]["timestamp"] = "Jan 5th, 2024"
+            sink.add_many(self.SCAN, findings)
+            assert sink.flush() == 200
+            sink.add_many(self.SCAN, findings)
+            assert sink.flush() == 0
+            sink.record_scan(self.SCAN, ["https://pastebin.com/x"], "completed", progress=1.0, total_results=1200)
+
+            with pool.connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM scan_results").fetchone()[0] == 1200
+                assert conn.execute("SELECT status, total_results FROM scans").fetchone() == ("completed", 1200)
+                emails, = conn.execute(
+                    "SELECT target_emails FROM scan_results WHERE url = %s", ("https://pastebin.com/00000007",)
+                ).fetchone()
+                assert emails == ["u7@ui.ac.id"]
+        finally:
+            sink.close()
+            with psycopg.connect(base, autocommit=True) as conn:
+                conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+class TestFindings:
+    """Test suite for compact findings"""
+
+    CONTENT = "password dump\nadmin@ui.ac.id:hunter22\nstaff@ui.ac.id:rahasia\nui.ac.id ui.ac.id"
+
+    def test_de_021_finding_reads_like_result_dict(self):
+        """TC-DE-021: Findings share email strings and expand to the result dict"""
+        from scrapers.findings import Finding, StringTable
+
+        strings = StringTable()
+        engine = DiscoveryOrchestrator(monitored_domains=[], string_table=strings)
+        first = engine.analyze_content("https://pastebin.com/aaaaaaaa", self.CONTENT, {"author": "anon"})
+        second = engine.analyze_content("https://pastebin.com/bbbbbbbb", self.CONTENT, {"author": "anon"})
+
+        assert isinstance(first, Finding)
+        assert len(strings) == 4  # two emails, the author and the source, stored once
+        assert sorted(first["target_emails"]) == ["admin@ui.ac.id", "staff@ui.ac.id"]
+        assert first["has_credentials"] is True and first.get("domains") is None
+        assert "screenshot" not in first
+        first["screenshot"] = "ab/abcd.webp"
+
+        as_dict = first.to_dict()
+        assert list(as_dict)[:6] == ["url", "source", "title", "author", "timestamp", "relevance_score"]
+        assert as_dict["screenshot"] == "ab/abcd.webp"
+        assert as_dict["credentials"]["total"] == 2
+        assert json.loads(json.dumps(as_dict)) == as_dict
+        assert second.author is first.author
+
+    def test_de_042_string_table_is_released_with_its_scan(self):
+        """TC-DE-042: Each orchestrator interns into its own table, freed with its findings"""
+        import gc
+        import weakref
+
+        first = DiscoveryOrchestrator(monitored_domains=[])
+        second = DiscoveryOrchestrator(monitored_domains=[])
+        assert first.strings is not second.strings
+
+        finding = first.analyze_content("https://pastebin.com/dddddddd", self.CONTENT)
+        table = weakref.ref(first.strings)
+        assert len(table()) == 4
+        del first
+        gc.collect()
+        assert table() is not None  # still referenced by the finding
+        del finding
+        gc.collect()
+        assert table() is None
+
+    def test_de_022_results_endpoint_expands_findings(self):
+        """TC-DE-022: The results endpoint serializes findings as plain JSON"""
+        from api.main import active_scans, scan_results
+
+        engine = DiscoveryOrchestrator(monitored_domains=[])
+        finding = engine.analyze_content("https://pastebin.com/cccccccc", self.CONTENT)
+        active_scans["scan-findings"] = {"status": "completed"}
+        scan_results["scan-findings"] = {"summary": {}, "results": [finding]}
+        try:
+            body = client.get("/api/results/scan-findings").json()
+        finally:
+            active_scans.pop("scan-findings")
+            scan_results.pop("scan-findings")
+
+        assert body["results"] == [finding.to_dict()]
+
+
+class TestExporters:
+    """Test suite for streaming result exports"""
+
+    @staticmethod
+    def _results(count):
+        return [
+            {
+                "url": f"https://pastebin.com/{i:08d}", "source": "pastebin", "title": f"dump, \"{i}\"",
+                "author": "anon", "timestamp": "2024-01-01T12:00:00", "relevance_score": 0.5,
+                "emails": [f"u{i}@ui.ac.id", "x@gmail.com"], "target_emails": [f"u{i}@ui.ac.id"],
+                "has_credentials": True, "credentials": {"total": i}, "content_preview": "line1\nline2",
+                "content_hash": None
+            }
+            for i in range(count)
+        ]
+
+    def test_de_027_exports_round_trip(self):
+        """TC-DE-027: JSONL, CSV and multi-row-group Parquet exports read back intact"""
+        import csv
+        import io
+        import pyarrow.parquet as pq
+        from scrapers.exporters import iter_parquet, export
+
+        results = self._results(250)
+        jsonl = b"".join(export(iter(results), "jsonl")).decode().splitlines()
+        assert [json.loads(line) for line in jsonl] == results
+
+        rows = list(csv.DictReader(io.StringIO(b"".join(export(iter(results), "csv")).decode())))
+        assert len(rows) == 250
+        assert rows[3]["title"] == 'dump, "3"' and rows[3]["emails"] == "u3@ui.ac.id;x@gmail.com"
+
+        chunks = list(iter_parquet(iter(results), batch_size=100))
+        table = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+        assert len(chunks) == 3 and table.metadata.num_row_groups == 3
+        data = table.read().to_pydict()
+        assert data["target_emails"][249] == ["u249@ui.ac.id"]
+        assert data["credentials_total"][7] == 7 and data["new_target_emails"][0] is None
+
+    def test_de_028_export_endpoint_streams_files(self):
+        """TC-DE-028: The export endpoint streams a download in the requested format"""
+        from api.main import active_scans, scan_results
+
+        active_scans["scan-export"] = {"status": "completed"}
+        scan_results["scan-export"] = {"summary": {}, "results": self._results(3)}
+        try:
+            response = client.get("/api/results/scan-export/export", params={"format": "csv"})
+            bad = client.get("/api/results/scan-export/export", params={"format": "xlsx"})
+        finally:
+            active_scans.pop("scan-export")
+            scan_results.pop("scan-export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="scan_scan-export.csv"' in response.headers["content-disposition"]
+        assert len(response.text.split("\r\n")) == 5  # header, 3 rows, trailing newline
+        assert bad.status_code == 400
+
+
+class TestResultLog:
+    """Test suite for the segmented scan result log"""
+
+    @staticmethod
+    def _scan(scan_id):
+        meta = {"scan_id": scan_id, "status": "completed", "progress": 1.0, "total_results": 1}
+        results = {"summary": {"total_results": 1}, "results": [{"url": f"https://pastebin.com/{scan_id}"}]}
+        return meta, results
+
+    def test_de_029_scans_reload_lazily(self, tmp_path):
+        """TC-DE-029: Logged scans survive a reopen and load only when requested"""
+        from scrapers.result_log import ResultLog, LazyScanResults
+
+        store = LazyScanResults(ResultLog(str(tmp_path), segment_bytes=64), cache_size=2)
+        for i in range(5):
+            meta, results = self._scan(f"scan-{i}")
+            store[f"scan-{i}"] = results
+            store.persist(f"scan-{i}", meta)
+        assert len(list(tmp_path.glob("segment-*.log"))) == 5
+
+        log = ResultLog(str(tmp_path), segment_bytes=64)
+        reopened = LazyScanResults(log, cache_size=2)
+        assert log.scans()["scan-3"]["status"] == "completed"
+        with patch.object(log, "read", wraps=log.read) as read:
+            assert len(reopened) == 5 and "scan-4" in reopened
+            read.assert_not_called()
+            assert reopened["scan-3"]["results"][0]["url"] == "https://pastebin.com/scan-3"
+            reopened["scan-3"]
+        assert read.call_count == 1
+
+    def test_de_030_damaged_log_is_recovered(self, tmp_path):
+        """TC-DE-030: Torn index lines and corrupt records are dropped, not served"""
+        from scrapers.result_log import ResultLog, LazyScanResults, ResultLogError
+
+        log = ResultLog(str(tmp_path))
+        for i in range(3):
+            meta, results = self._scan(f"scan-{i}")
+            log.append(f"scan-{i}", meta, results)
+        segment = tmp_path / "segment-000001.log"
+        data = bytearray(segment.read_bytes())
+        data[log._index["scan-1"]["offset"] + 20] ^= 0xFF
+        segment.write_bytes(bytes(data[:log._index["scan-2"]["offset"] + 5]))
+        with open(tmp_path / "index.jsonl", "a") as f:
+            f.write('{"scan_id": "scan-3", "seg')
+
+        reopened = ResultLog(str(tmp_path))
+        assert sorted(reopened.scans()) == ["scan-0", "scan-1"]
+        assert (tmp_path / "index.jsonl").read_text().endswith("\n")
+        with pytest.raises(ResultLogError):
+            reopened.read("scan-1")
+        store = LazyScanResults(reopened)
+        assert store["scan-0"]["summary"]["total_results"] == 1
+        assert "scan-1" in store
+        with pytest.raises(KeyError):
+            store["scan-1"]
+
+
+    def test_be_017_late_screenshot_reaches_stored_finding(self, tmp_path):
+        """TC-BE-017: A capture finishing after its scan was logged amends the logged finding"""
+        from api import main
+        from scrapers.result_log import ResultLog, LazyScanResults
+
+        url = "https://pastebin.com/late0001"
+        finding = {"url": url, "relevance_score": 0.9, "emails": [], "target_emails": []}
+        results = {"summary": {"total_results": 1}, "results": [finding]}
+        store = LazyScanResults(ResultLog(str(tmp_path)))
+        screenshots = Mock()
+        screenshots.is_pending.return_value = True
+        main.active_scans["late-scan"] = {"scan_id": "late-scan", "status": "running"}
+        with patch.object(main, "scan_results", store), \
+             patch.object(main, "ENABLE_EVIDENCE_SCREENSHOTS", True), \
+             patch.object(main, "ENABLE_EXPOSURE_FILTER", False), \
+             patch.object(main, "ENABLE_DB_SINK", False), \
+             patch.object(main, "get_source_registry"), patch.object(main, "get_yield_history"), \
+             patch.object(main, "get_email_index"), \
+             patch("scrapers.evidence_screenshots.get_screenshot_queue", return_value=screenshots):
+            asyncio.run(main.complete_scan("late-scan", results, None, {}))
+            assert main.active_scans["late-scan"]["status"] == "completed"
+            assert "screenshot" not in ResultLog(str(tmp_path)).read("late-scan")["results"][0]
+            finding["screenshot"] = "ab/abcd.webp"
+            main.record_evidence(url, "ab/abcd.webp")
+
+        assert ResultLog(str(tmp_path)).read("late-scan")["results"][0]["screenshot"] == "ab/abcd.webp"
+        assert ResultLog(str(tmp_path)).scans()["late-scan"]["status"] == "completed"
+        assert url not in main.pending_evidence
+        del main.active_scans["late-scan"]
+
+
+    def test_be_018_database_outage_does_not_fail_scans(self, tmp_path):
+        """TC-BE-018: With Postgres down the scan still completes and its results are logged"""
+        import psycopg
+        from api import main
+        from scrapers.result_log import ResultLog, LazyScanResults
+
+        finding = {"url": "https://pastebin.com/dbdown01", "relevance_score": 0.5, "emails": [],
+                   "target_emails": []}
+        results = {"summary": {"total_results": 1}, "results": [finding]}
+        sink = Mock()
+        for method in (sink.record_scan, sink.add_many, sink.flush):
+            method.side_effect = psycopg.OperationalError("connection refused")
+        orchestrator = Mock()
+        orchestrator.run_full_discovery.return_value = results
+        store = LazyScanResults(ResultLog(str(tmp_path)))
+        main.active_scans["db-down"] = {"scan_id": "db-down", "status": "queued", "progress": 0.0}
+        with patch.object(main, "scan_results", store), \
+             patch.object(main, "ENABLE_DB_SINK", True), \
+             patch.object(main, "ENABLE_EXPOSURE_FILTER", False), \
+             patch.object(main, "ENABLE_EVIDENCE_SCREENSHOTS", False), \
+             patch("scrapers.db_sink.get_db_sink", return_value=sink), \
+             patch.object(main, "make_orchestrator", return_value=orchestrator), \
+             patch.object(main, "get_source_registry"), patch.object(main, "get_yield_history"), \
+             patch.object(main, "get_email_index"):
+            asyncio.run(main.run_scan_task("db-down", main.ScanRequest(urls=[finding["url"]])))
+
+        try:
+            assert main.active_scans["db-down"]["status"] == "completed"
+            assert sink.flush.called and sink.record_scan.call_count == 2
+            assert ResultLog(str(tmp_path)).read("db-down")["results"][0]["url"] == finding["url"]
+        finally:
+            del main.active_scans["db-down"]
+
+
+    def test_be_019_amendments_do_not_relog_scans(self, tmp_path):
+        """TC-BE-019: Late finding updates go to the side file, not new copies of the scan record"""
+        from scrapers.result_log import ResultLog, LazyScanResults
+
+        findings = [{"url": f"https://pastebin.com/amend{i:03d}", "relevance_score": 0.9,
+                     "emails": [], "target_emails": [], "content": "x" * 2000} for i in range(50)]
+        store = LazyScanResults(ResultLog(str(tmp_path)))
+        store["scan-a"] = {"summary": {"total_results": 50}, "results": findings}
+        store.persist("scan-a", {"scan_id": "scan-a", "status": "completed"})
+        segment = os.path.join(str(tmp_path), "segment-000001.log")
+        logged = os.path.getsize(segment)
+
+        for finding in findings:
+            store.amend("scan-a", finding["url"], screenshot=f"ab/{finding['url'][-3:]}.webp")
+
+        assert os.path.getsize(segment) == logged
+        with open(os.path.join(str(tmp_path), "index.jsonl")) as f:
+            assert len(f.readlines()) == 1
+        reopened = ResultLog(str(tmp_path))
+        assert [r["screenshot"] for r in reopened.read("scan-a")["results"]] == \
+            [f"ab/{i:03d}.webp" for i in range(50)]
+        assert reopened.scans()["scan-a"]["status"] == "completed"
+
+
+class TestMetrics:
+    """Test suite for the Prometheus metrics endpoint"""
+
+    def test_be_013_metrics_expose_requests_and_stages(self):
+        """TC-BE-013: /metrics reports per-host latency, bytes, retries and stage timings"""
+        import requests
+        from scrapers.source_registry import SourceRegistry
+
+        ok = Mock(status_code=200, content=b"x" * 1234)
+        failed = Mock(status_code=503)
+        failed.raise_for_status.side_effect = requests.HTTPError("503", response=failed)
+        engine = DiscoveryOrchestrator(source_registry=SourceRegistry(path=None))
+        with patch.object(engine.session, "get", side_effect=[failed, ok]), \
+             patch("scrapers.discovery_engine.time.sleep"):
+            assert engine._make_request("https://metrics.example/raw/a") is ok
+        engine.analyze_content("https://metrics.example/a", b"password dump admin@ui.ac.id:rahasia")
+
+        text = client.get("/metrics").text
+        assert 'next_request_duration_seconds_count{host="metrics.example",status="200"} 1.0' in text
+        assert 'next_request_duration_seconds_count{host="metrics.example",status="503"} 1.0' in text
+        assert 'next_fetched_bytes_total{host="metrics.example"} 1234.0' in text
+        assert 'next_request_retries_total{host="metrics.example"} 1.0' in text
+        assert 'next_analysis_stage_duration_seconds_count{stage="extract"}' in text
+        assert "next_websocket_clients 0.0" in text
+
+
+class TestTracing:
+    """Test suite for scan tracing spans and the sampling profiler"""
+
+    def test_de_031_spans_nest_per_scan(self):
+        """TC-DE-031: Stage spans join the scan's trace and export as OTLP/JSON"""
+        from scrapers import tracing
+        from scrapers.tracing import SpanExporter, span, stage, trace_id_for
+
+        exporter = SpanExporter(url="http://collector.invalid/v1/traces")
+        exporter.export = Mock()
+        scan_id = "7c9e6679-7425-40de-944b-e07fc1f98a11"
+        with patch.object(tracing, "ENABLE_TRACING", True), \
+             patch.object(tracing, "_span_exporter", exporter):
+            with span("run_scan_task", scan_id=scan_id):
+                with span("analyze_paste", url="https://pastebin.com/a"):
+                    with stage("fetch"):
+                        pass
+                    with pytest.raises(ValueError), stage("extract"):
+                        raise ValueError("bad")
+
+        spans = [c.args[0] for c in exporter.export.call_args_list]
+        assert [s.name for s in spans] == ["fetch", "extract", "analyze_paste", "run_scan_task"]
+        assert {s.trace_id for s in spans} == {trace_id_for(scan_id)} == {scan_id.replace("-", "")}
+        assert spans[0].path() == ["run_scan_task", "analyze_paste", "fetch"]
+
+        otlp = exporter.payload(spans)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert otlp[1]["status"] == {"code": 2, "message": "ValueError: bad"}
+        assert otlp[2]["parentSpanId"] == spans[3].span_id and "parentSpanId" not in otlp[3]
+        assert {"key": "url", "value": {"stringValue": "https://pastebin.com/a"}} in otlp[2]["attributes"]
+
+    def test_de_045_interleaved_coroutine_spans_stay_separate(self):
+        """TC-DE-045: Scans interleaving on the event loop neither mix spans nor leak them"""
+        import threading
+        from scrapers import tracing
+        from scrapers.tracing import SpanExporter, span, current_span
+
+        paths = {}
+
+        async def scan(scan_id, pause):
+            with span("run_scan_task", scan_id=scan_id):
+                await asyncio.sleep(pause)
+                with span("store_results"):
+                    await asyncio.sleep(pause)
+                    paths[scan_id] = current_span().path()
+
+        async def scans():
+            await asyncio.gather(scan("scan-a", 0), scan("scan-b", 0.02))
+
+        with patch.object(tracing, "ENABLE_TRACING", True), \
+             patch.object(tracing, "_span_exporter", SpanExporter(url="")):
+            asyncio.run(scans())
+            assert tracing._thread_spans == {}
+            with span("on_worker") as worker_span:
+                assert tracing._thread_spans[threading.get_ident()] is worker_span
+
+        assert paths == {s: ["run_scan_task", "store_results"] for s in ("scan-a", "scan-b")}
+        assert tracing._thread_spans == {}
+
+    def test_be_014_profile_endpoint_returns_folded_stacks(self):
+        """TC-BE-014: The admin profiler needs the token and returns folded stacks"""
+        import threading
+        import time
+
+        stop = threading.Event()
+
+        def busy_scan():
+            while not stop.is_set():
+                time.sleep(0.001)
+
+        worker = threading.Thread(target=busy_scan)
+        worker.start()
+        try:
+            with patch("api.main.ADMIN_TOKEN", "s3cret"):
+                denied = client.get("/api/admin/profile", params={"seconds": 0.2})
+                response = client.get("/api/admin/profile", params={"seconds": 0.2},
+                                      headers={"X-Admin-Token": "s3cret"})
+        finally:
+            stop.set()
+            worker.join()
+
+        assert denied.status_code == 403
+        assert response.status_code == 200
+        stack, count = response.text.splitlines()[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any("busy_scan (test_suite.py:" in line for line in response.text.splitlines())
+
+
+class TestLogSetup:
+    """Test suite for the queued logging pipeline"""
+
+    @staticmethod
+    def _record(msg, *args, level=logging.INFO, **extra):
+        record = logging.LogRecord("scrapers.discovery_engine", level, __file__, 1, msg, args, None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_de_032_records_are_queued_unformatted(self):
+        """TC-DE-032: The caller renders the message only; formatting happens in the listener as JSON"""
+        import queue
+        from scrapers.log_setup import EnqueueHandler, JsonFormatter
+
+        log_queue = queue.Queue(maxsize=2)
+        handler = EnqueueHandler(log_queue)
+        urls = ["https://pastebin.com/a"]
+        with patch.object(JsonFormatter, "format", side_effect=AssertionError("formatted")):
+            handler.emit(self._record("Analyzing paste: %s", urls, url=urls[0]))
+            try:
+                raise ValueError("bad paste")
+            except ValueError:
+                failed = self._record("Analysis failed", level=logging.ERROR)
+                failed.exc_info = sys.exc_info()
+                handler.emit(failed)
+            handler.emit(self._record("dropped"))
+        assert handler.dropped == 1
+        urls.append("https://pastebin.com/b")
+
+        record = log_queue.get_nowait()
+        assert record.args is None and record.msg == "Analyzing paste: ['https://pastebin.com/a']"
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "Analyzing paste: ['https://pastebin.com/a']"
+        assert entry["url"] == "https://pastebin.com/a" and entry["level"] == "INFO"
+
+        failed = log_queue.get_nowait()
+        assert failed.exc_info is None
+        assert "ValueError: bad paste" in json.loads(JsonFormatter().format(failed))["exc"]
+        assert "ValueError: bad paste" in logging.Formatter().format(failed)
+
+    def test_de_033_url_chatter_is_sampled_per_url(self):
+        """TC-DE-033: Sampling keeps or drops all INFO lines of a URL together"""
+        from scrapers.log_setup import UrlSampler
+
+        sampler = UrlSampler(0.25)
+        urls = [f"https://pastebin.com/{i:08d}" for i in range(2000)]
+        kept = [u for u in urls if sampler.filter(self._record("Analyzing %s", u, url=u))]
+        assert 350 < len(kept) < 650
+        assert all(sampler.filter(self._record("Found %s", u, url=u)) for u in kept)
+        assert sampler.filter(self._record("Request failed", level=logging.WARNING, url=urls[0]))
+        assert sampler.filter(self._record("Scan completed"))
+
+
+class TestFeedMonitor:
+    """Test suite for continuous monitoring of recent-paste feeds"""
+
+    def test_de_034_monitor_polls_only_new_pastes(self, tmp_path):
+        """TC-DE-034: Polls analyze pastes posted since the persisted cursor"""
+        import threading
+        from loadtest.paste_site import SiteConfig, serve
+        from scrapers.monitor import ContinuousMonitor, FeedEntry, SourceCursor
+        from scrapers.source_registry import SourceRegistry
+
+        cursor = SourceCursor(window=10)
+        cursor.last_seen = "u3"
+        cursor.mark_seen("u5")
+        feed = [FeedEntry(f"u{i}") for i in (6, 5, 4, 3, 2)]
+        assert [e.url for e in cursor.new_entries(feed)] == ["u6", "u4"]
+
+        config = SiteConfig(body_min=1024, body_max=1024, leak_rate=1.0, post_interval=1e9, archive_size=4)
+        server = serve(port=0, config=config)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        batches = []
+        path = str(tmp_path / "cursors.json")
+
+        def make_monitor():
+            return ContinuousMonitor(
+                sources=["pastebin"], path=path, on_results=lambda source, results: batches.append(results),
+                orchestrator_factory=lambda: DiscoveryOrchestrator(source_registry=SourceRegistry(path=None))
+            )
+
+        try:
+            with patch("scrapers.monitor.PASTEBIN_BASE_URL", base_url), \
+                 patch("scrapers.discovery_engine.PASTEBIN_BASE_URL", base_url), \
+                 patch("scrapers.discovery_engine.REQUEST_DELAY", 0):
+                monitor = make_monitor()
+                assert monitor.poll_once() == {"pastebin": 4}
+                assert monitor.poll_once() == {"pastebin": 0}
+                assert make_monitor().poll_once() == {"pastebin": 0}  # cursor survives a restart
+
+                config.post_interval = 1e3  # the feed moves on
+                assert make_monitor().poll_once() == {"pastebin": 4}
+        finally:
+            server.shutdown()
+
+        assert [len(batch["results"]) for batch in batches] == [4, 4]
+        assert batches[0]["metadata"]["monitor_source"] == "pastebin"
+        assert all(r["source"] == "pastebin" for r in batches[0]["results"])
+        status = make_monitor().status()["sources"]["pastebin"]
+        assert status["new_pastes"] == 8 and status["relevant"] == 8 and status["polls"] == 4
+
+        with pytest.raises(ValueError):
+            ContinuousMonitor(sources=["geocities"], path=None)
+
+    def test_de_046_unfetched_pastes_are_retried(self):
+        """TC-DE-046: A paste that could not be fetched is neither marked seen nor passed by the cursor"""
+        import threading
+        import requests
+        from loadtest.paste_site import SiteConfig, serve
+        from scrapers.monitor import ContinuousMonitor, PastebinArchiveAdapter
+        from scrapers.source_registry import SourceRegistry
+
+        config = SiteConfig(body_min=1024, body_max=1024, leak_rate=1.0, post_interval=1e9, archive_size=4)
+        server = serve(port=0, config=config)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        fetch = DiscoveryOrchestrator._fetch_paste_content
+        failing = set()
+
+        def flaky_fetch(orchestrator, paste_url, raw_url):
+            return None if paste_url in failing else fetch(orchestrator, paste_url, raw_url)
+
+        try:
+            with patch("scrapers.monitor.PASTEBIN_BASE_URL", base_url), \
+                 patch("scrapers.discovery_engine.PASTEBIN_BASE_URL", base_url), \
+                 patch("scrapers.discovery_engine.REQUEST_DELAY", 0), \
+                 patch.object(DiscoveryOrchestrator, "_fetch_paste_content", flaky_fetch):
+                entries = PastebinArchiveAdapter().parse(requests.get(f"{base_url}/archive", timeout=5))
+                monitor = ContinuousMonitor(
+                    sources=["pastebin"], path=None,
+                    orchestrator_factory=lambda: DiscoveryOrchestrator(source_registry=SourceRegistry(path=None))
+                )
+                failing.add(entries[1].url)
+                assert monitor.poll_once() == {"pastebin": 3}
+                cursor = monitor.cursors["pastebin"]
+                assert entries[1].url not in cursor.seen and cursor.last_seen == entries[2].url
+                assert cursor.last_error == "Could not fetch 1 pastes"
+
+                failing.clear()
+                assert monitor.poll_once() == {"pastebin": 1}
+                assert monitor.poll_once() == {"pastebin": 0}
+        finally:
+            server.shutdown()
+
+        status = monitor.status()["sources"]["pastebin"]
+        assert status["new_pastes"] == 4 and status["relevant"] == 4 and status["last_error"] is None
+
+    def test_be_016_monitor_endpoints_record_scans(self):
+        """TC-BE-016: Monitor status endpoints and monitor findings recorded as scans"""
+        import threading
+        import api.main as main
+
+        status = client.get("/api/monitor").json()
+        assert status["running"] is False
+        assert "pastebin" in status["sources"]
+        assert client.get("/api/monitor/findings").json() == []
+
+        engine = DiscoveryOrchestrator(monitored_domains=[])
+        finding = engine.analyze_content("https://pastebin.com/mmmmmmmm", TestFindings.CONTENT)
+        results = engine.package_results([finding])
+        storing_threads = []
+
+        async def poll_thread():
+            loop = asyncio.get_running_loop()
+            return await asyncio.to_thread(main.record_monitor_scan, "pastebin", results, loop)
+
+        with patch("api.main.get_email_index") as email_index, \
+             patch("api.main.get_source_registry"), patch("api.main.get_yield_history"):
+            email_index.return_value.add_scan.side_effect = \
+                lambda *args: storing_threads.append(threading.current_thread())
+            scan_id = asyncio.run(poll_thread())
+        try:
+            assert storing_threads and storing_threads[0] is not threading.main_thread()
+            assert main.active_scans[scan_id]["status"] == "completed"
+            assert main.active_scans[scan_id]["options"] == {"monitor_source": "pastebin"}
+            assert email_index.return_value.add_scan.call_args.args[0] == scan_id
+            body = client.get(f"/api/results/{scan_id}").json()
+            assert body["results"] == [finding.to_dict()]
+        finally:
+            main.active_scans.pop(scan_id)
+            main.scan_results.pop(scan_id)
+
+
+class TestFrontier:
+    """Test suite for best-first fetch ordering"""
+
+    def test_de_035_frontier_orders_by_predicted_relevance(self, tmp_path):
+        """TC-DE-035: Title, author history and source yield decide what is fetched first"""
+        from scrapers.frontier import Frontier, YieldHistory, url_shape
+        from scrapers.source_registry import SourceRegistry
+
+        assert url_shape("https://www.pastebin.com/AbCd1234") == "pastebin.com/*"
+        assert url_shape("https://paste.ee/p/x9Y8z") == "paste.ee/p/*"
+        assert url_shape("https://pastebin.com/u/leaker") == "pastebin.com/u/leaker"
+
+        history = YieldHistory(path=str(tmp_path / "yield.json"))
+        for _ in range(4):
+            history.record("https://pastebin.com/aaaaaaaa", relevant=True, author="leaker")
+            history.record("https://pastebin.com/bbbbbbbb", relevant=False, author="chatty")
+        history.save()
+        assert YieldHistory(path=str(tmp_path / "yield.json")).author_yield("leaker") == 5 / 6
+
+        frontier = Frontier(SourceRegistry(path=None), history)
+        frontier.push("https://pastebin.com/11111111", title="my holiday notes")
+        frontier.push("https://pastebin.com/22222222", title="chat log", author="chatty")
+        frontier.push("https://pastebin.com/33333333", title="untitled", author="leaker")
+        frontier.push("https://pastebin.com/44444444", title="ui.ac.id password dump")
+        assert not frontier.push("https://pastebin.com/44444444")
+        order = [frontier.pop().url[-8:] for _ in range(len(frontier))]
+        assert order == ["44444444", "33333333", "11111111", "22222222"]
+
+        # What a scan learns reorders URLs that are already queued
+        frontier.push("https://pastebin.com/55555555", author="newbie")
+        frontier.push("https://pastebin.com/66666666", title="misc")
+        for _ in range(3):
+            history.record("https://pastebin.com/cccccccc", relevant=True, author="newbie")
+        assert frontier.pop().url.endswith("55555555")
+
+    def test_de_036_discovery_spends_budget_best_first(self):
+        """TC-DE-036: run_full_discovery fetches best sources first, within the fetch budget"""
+        from scrapers.frontier import YieldHistory
+        from scrapers.source_registry import SourceRegistry
+
+        registry = SourceRegistry(path=None)
+        for _ in range(5):
+            registry.record_request("https://dead.example/a", 10.0, ok=False, error="timeout")
+        engine = DiscoveryOrchestrator(source_registry=registry, yield_history=YieldHistory(path=None))
+        urls = ["https://dead.example/x", "https://pastebin.com/aaaaaaaa", "https://paste.ee/p/bbbbb"]
+
+        with patch.object(engine, "analyze_paste", return_value=None) as analyze:
+            output = engine.run_full_discovery(clearnet_urls=urls, max_fetches=2)
+
+        assert [c.args[0] for c in analyze.call_args_list] == urls[1:]
+        assert output["results"] == []
+
+    def test_de_049_budget_counts_only_requested_pastes(self):
+        """TC-DE-049: Visited and dead-cached pastes do not use up the fetch budget"""
+        from scrapers.frontier import YieldHistory
+        from scrapers.source_registry import SourceRegistry
+
+        engine = DiscoveryOrchestrator(source_registry=SourceRegistry(path=None),
+                                       yield_history=YieldHistory(path=None))
+        urls = [f"https://pastebin.com/{c * 8}" for c in "abcde"]
+        engine.visited_urls.add(urls[0])
+        engine.retry_policy.dead_urls.add(engine._get_raw_url(urls[1]))
+
+        import requests
+
+        gone = requests.Response()
+        gone.status_code = 410
+        with patch.object(engine.session, "get", return_value=gone) as get:
+            engine.run_full_discovery(clearnet_urls=urls, max_fetches=2)
+
+        assert get.call_count == 2
+        assert len(engine.visited_urls) == 4
+
+
+class TestRetryPolicy:
+    """Test suite for error-aware retries"""
+
+    @staticmethod
+    def _failure(status, headers=None):
+        import requests
+
+        response = Mock(status_code=status, headers=headers or {})
+        response.raise_for_status.side_effect = requests.HTTPError(str(status), response=response)
+        return response
+
+    def test_de_037_dead_and_permanent_urls_cost_one_request(self):
+        """TC-DE-037: 404 is fetched once and negative-cached; 403 is not retried"""
+        from scrapers.retry_policy import RetryPolicy
+        from scrapers.source_registry import SourceRegistry
+
+        engine = DiscoveryOrchestrator(source_registry=SourceRegistry(path=None), retry_policy=RetryPolicy())
+        with patch.object(engine.session, "get", return_value=self._failure(404)) as get, \
+             patch("scrapers.discovery_engine.time.sleep") as sleep:
+            assert engine._make_request("https://retry.example/gone") is None
+            assert engine._make_request("https://retry.example/gone") is None
+        assert get.call_count == 1
+        sleep.assert_not_called()
+        assert engine.retry_policy.is_dead("https://retry.example/gone")
+
+        with patch.object(engine.session, "get", return_value=self._failure(403)) as get, \
+             patch("scrapers.discovery_engine.time.sleep"):
+            assert engine._make_request("https://retry.example/private") is None
+        assert get.call_count == 1
+        assert not engine.retry_policy.is_dead("https://retry.example/private")
+
+    def test_de_038_retry_after_and_host_budget(self):
+        """TC-DE-038: Retry-After sets the wait; an exhausted host budget stops retrying"""
+        from scrapers.retry_policy import RetryBudget, RetryPolicy, retry_after
+        from scrapers.source_registry import SourceRegistry
+
+        ok = Mock(status_code=200, content=b"ok")
+        policy = RetryPolicy(budget=RetryBudget(capacity=1, refill=0), max_delay=0.5)
+        engine = DiscoveryOrchestrator(source_registry=SourceRegistry(path=None), retry_policy=policy)
+        with patch.object(engine.session, "get",
+                          side_effect=[self._failure(429, {"Retry-After": "7"}), ok]), \
+             patch("scrapers.discovery_engine.time.sleep") as sleep:
+            assert engine._make_request("https://budget.example/a") is ok
+        assert sleep.call_args_list[0].args[0] >= 7
+
+        with patch.object(engine.session, "get", return_value=self._failure(503)) as get, \
+             patch("scrapers.discovery_engine.time.sleep"):
+            assert engine._make_request("https://budget.example/b") is None
+        assert get.call_count == 1
+
+        assert retry_after(Mock(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+        assert retry_after(Mock(headers={})) is None
+
+    def test_sc_020_onion_fetch_attempts_and_terminal_errors(self):
+        """TC-SC-020: An onion fetch is attempted at least once; parse errors are not retried"""
+        import requests
+        from scrapers.retry_policy import RetryPolicy
+        from scrapers.source_registry import SourceRegistry
+
+        session = Mock()
+        session.get.side_effect = requests.ConnectionError("circuit failed")
+        scraper = TorScraper(source_registry=SourceRegistry(path=None), retry_policy=RetryPolicy(),
+                             session=session)
+        scraper.is_connected = True
+        result = scraper.fetch_onion_site("http://abc.onion/", retries=0)
+        assert result["status"] == "error" and "circuit failed" in result["error"]
+        assert session.get.call_count == 1
+
+        session.get.reset_mock(side_effect=True)
+        session.get.return_value = Mock(status_code=200, content=b"<html></html>")
+        with patch("scrapers.tor_scraper.response_text", side_effect=ValueError("bad markup")), \
+             patch("scrapers.tor_scraper.time.sleep") as sleep:
+            result = scraper.fetch_onion_site("http://abc.onion/", retries=3)
+        assert result["error"] == "Unexpected error: bad markup"
+        assert session.get.call_count == 1
+        sleep.assert_not_called()
+
+
+class TestStartupBudget:
+    """Test suite for import-time cost of the API and the scraper registry"""
+
+    # Fresh-interpreter import budgets in seconds (FastAPI alone takes ~1s)
+    API_IMPORT_BUDGET = 4.0
+    SCRAPERS_IMPORT_BUDGET = 0.5
+
+    HEAVY_MODULES = ["bs4", "selenium", "requests", "numpy", "psycopg", "PIL",
+                     "scrapers.discovery_engine", "scrapers.tor_scraper", "scrapers.selenium_scraper"]
+
+    def _import_in_subprocess(self, statement: str) -> dict:
+        import subprocess
+        import textwrap
+
+        code = textwrap.dedent(f"""
+            import json, os, pathlib, sys, time
+            def refuse(*args, **kwargs):
+                raise AssertionError("directory created at import time")
+            os.makedirs = os.mkdir = pathlib.Path.mkdir = refuse
+            start = time.perf_counter()
+            {statement}
+            print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+        """)
+        backend = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=backend, capture_output=True, text=True, timeout=60, check=True
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def test_be_015_api_import_budget(self):
+        """TC-BE-015: Importing the API loads no scraper backend and stays within budget"""
+        startup = self._import_in_subprocess("import api.main")
+
+        assert not set(self.HEAVY_MODULES) & set(startup["modules"])
+        assert startup["seconds"] < self.API_IMPORT_BUDGET
+
+    def test_sc_016_scraper_registry_loads_on_first_use(self):
+        """TC-SC-016: Scraper backends are imported only when requested"""
+        startup = self._import_in_subprocess("import scrapers, config")
+        assert not set(self.HEAVY_MODULES) & set(startup["modules"])
+        assert startup["seconds"] < self.SCRAPERS_IMPORT_BUDGET
+
+        loaded = set(self._import_in_subprocess("import scrapers; scrapers.get_scraper('tor')")["modules"])
+        assert "scrapers.tor_scraper" in loaded
+        assert "scrapers.selenium_scraper" not in loaded
+
+        import scrapers
+        assert scrapers.get_scraper("clearnet") is DiscoveryOrchestrator
+        assert scrapers.SeleniumScraper is SeleniumScraper
+        with pytest.raises(KeyError):
+            scrapers.get_scraper("gopher")
+
+
 # ============================================================================
 # SCRAPER TESTS - TC-SC-001 to TC-SC-006
 # ============================================================================
@@ -362,6 +1720,295 @@ class TestScrapers:
         assert "password123" in content.text
 
 
+class TestTieredFetch:
+    """Test suite for the HTTP-first, browser-on-demand fetch path"""
+
+    @staticmethod
+    def _response(body, content_type="text/plain"):
+        response = Mock()
+        response.content = body.encode()
+        response.headers = {"Content-Type": content_type}
+        return response
+
+    def test_sc_007_plain_text_stays_on_http(self):
+        """TC-SC-007: Plain-text pastes are never escalated to a browser"""
+        pool = Mock()
+        engine = DiscoveryOrchestrator(browser_pool=pool)
+
+        with patch.object(engine, "_make_request",
+                          return_value=self._response("admin@ui.ac.id:secret")):
+            content = engine._fetch_paste_content(
+                "https://pastebin.com/abcdefgh", "https://pastebin.com/raw/abcdefgh"
+            )
+
+        assert content == b"admin@ui.ac.id:secret"
+        pool.render.assert_not_called()
+
+    def test_sc_008_script_shell_escalates_to_browser(self):
+        """TC-SC-008: Script-rendered shells are rendered in the browser pool"""
+        shell = "<html><head><script src='app.js'></script></head><body><div id='app'></div></body></html>"
+        pool = Mock()
+        pool.render.return_value = {"status": "success", "element_text": "decrypted paste", "text": ""}
+        engine = DiscoveryOrchestrator(browser_pool=pool)
+
+        with patch.object(engine, "_make_request",
+                          return_value=self._response(shell, "text/html; charset=utf-8")):
+            content = engine._fetch_paste_content(
+                "https://privatebin.net/?abc#key", "https://privatebin.net/?abc#key"
+            )
+
+        assert content == b"decrypted paste"
+        assert pool.render.call_args.kwargs["wait_for_selector"] == "#prettymessage"
+        assert engine.browser_renders == 1
+
+    def test_sc_009_failed_render_falls_back_to_http_body(self):
+        """TC-SC-009: A failed browser render keeps the plain HTTP body"""
+        pool = Mock()
+        pool.render.return_value = None
+        engine = DiscoveryOrchestrator(browser_pool=pool)
+
+        with patch.object(engine, "_make_request",
+                          return_value=self._response("", "text/html")):
+            content = engine._fetch_paste_content("https://justpaste.it/x", "https://justpaste.it/x")
+
+        assert content == b""
+        assert engine.browser_renders == 0
+
+
+    def test_sc_018_browser_pool_recovers_from_failures(self):
+        """TC-SC-018: A failed browser start cools down instead of disabling rendering; wedged browsers close once"""
+        from scrapers import selenium_scraper
+        from scrapers.selenium_scraper import BrowserPool
+
+        browser = Mock()
+        browser.scrape_dynamic_content.return_value = {"status": "error", "error": "chrome not reachable"}
+        starts = [RuntimeError("driver download failed"), browser]
+
+        def start(**kwargs):
+            outcome = starts.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        pool = BrowserPool(size=1, retry_cooldown=30)
+        with patch.object(selenium_scraper, "SeleniumScraper", side_effect=start):
+            assert pool.render("https://privatebin.net/?a") is None
+            assert not pool.available
+            pool._retry_at -= 31  # the cooldown passes
+            assert pool.available
+            assert pool.render("https://privatebin.net/?a")["status"] == "error"
+
+        browser.close.assert_called_once()
+        assert pool._created == 0 and pool._idle.empty()
+
+
+class TestEvidenceScreenshots:
+    """Test suite for the background evidence screenshot pipeline"""
+
+    @staticmethod
+    def _png(color, noise=False):
+        import io
+        from PIL import Image, ImageDraw
+        image = Image.new("RGB", (200, 120), "white")
+        ImageDraw.Draw(image).rectangle([10, 10, 120, 60], fill=color)
+        if noise:
+            image.putpixel((199, 119), (250, 250, 250))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def test_sc_010_store_dedups_identical_captures(self, tmp_path):
+        """TC-SC-010: Identical captures are stored once as WebP; differing ones never share a file"""
+        import io
+        from PIL import Image, ImageDraw
+        from scrapers.evidence_screenshots import ScreenshotStore
+
+        store = ScreenshotStore(root=str(tmp_path))
+        first = store.put(self._png("black"), "https://pastebin.com/a")
+        second = store.put(self._png("black"), "https://pastebin.com/b")
+        third = store.put(self._png("black", noise=True), "https://pastebin.com/c")
+
+        assert first == second != third
+        assert first.endswith(".webp")
+        assert len(list(tmp_path.rglob("*.webp"))) == 2
+
+        # Text-only pastes look alike at thumbnail scale
+        paths = set()
+        for text in ("admin@ui.ac.id:hunter2", "admin@ui.ac.id:s3cretXY"):
+            image = Image.new("RGB", (400, 40), "white")
+            ImageDraw.Draw(image).text((5, 12), text, fill="black")
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            paths.add(store.put(buffer.getvalue(), "https://pastebin.com/text"))
+        assert len(paths) == 2
+        assert ScreenshotStore(root=str(tmp_path)).put(self._png("black"), "https://pastebin.com/d") == first
+
+    def test_sc_011_queue_captures_in_background(self, tmp_path):
+        """TC-SC-011: Queued captures complete on a worker thread"""
+        from contextlib import contextmanager
+        from scrapers.evidence_screenshots import ScreenshotQueue, ScreenshotStore
+
+        scraper = Mock()
+        scraper.screenshot_element.return_value = self._png("red")
+        pool = Mock(available=True)
+        pool.acquire = contextmanager(lambda timeout=None: (yield scraper))
+
+        screenshots = ScreenshotQueue(browser_pool=pool, store=ScreenshotStore(root=str(tmp_path)))
+        captured = []
+        future = screenshots.submit("https://pastebin.com/abcdefgh", on_done=captured.append)
+
+        assert future.result(timeout=10).endswith(".webp")
+        screenshots.stop()
+        assert captured == [future.result()]
+        assert scraper.screenshot_element.call_args.args == ("https://pastebin.com/abcdefgh", ".source")
+
+
+    def test_sc_019_concurrent_submits_start_workers_once(self, tmp_path):
+        """TC-SC-019: Scans submitting at the same moment share one set of capture workers"""
+        import threading
+        import time
+        from scrapers import evidence_screenshots
+        from scrapers.evidence_screenshots import ScreenshotQueue, ScreenshotStore
+
+        def slow_store():
+            time.sleep(0.05)  # widen the window between the check and the start
+            return ScreenshotStore(root=str(tmp_path))
+
+        screenshots = ScreenshotQueue(browser_pool=Mock(available=False), workers=2)
+        barrier = threading.Barrier(8)
+
+        def submit(i):
+            barrier.wait()
+            screenshots.submit(f"https://pastebin.com/{i:08d}")
+
+        with patch.object(evidence_screenshots, "ScreenshotStore", side_effect=slow_store):
+            submitters = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+            for thread in submitters:
+                thread.start()
+            for thread in submitters:
+                thread.join()
+        workers = [t for t in threading.enumerate() if t.name.startswith("screenshot-worker-")]
+        screenshots.stop()
+
+        assert len(workers) == 2
+
+
+class TestSourceRegistry:
+    """Test suite for per-source statistics and fetch ordering"""
+
+    def test_sc_012_rank_prefers_fast_productive_sources(self):
+        """TC-SC-012: Fast, high-yield sources are fetched first"""
+        from scrapers.source_registry import SourceRegistry
+
+        registry = SourceRegistry(path=None)
+        for _ in range(5):
+            registry.record_request("https://slow.example/a", 4.0, ok=True, nbytes=100)
+            registry.record_hit("https://slow.example/a", relevant=False)
+            registry.record_request("https://pastebin.com/raw/a", 0.2, ok=True, nbytes=100)
+            registry.record_hit("https://pastebin.com/a", relevant=True)
+        registry.record_request("https://dead.example/a", 10.0, ok=False, error="timeout")
+
+        urls = ["https://dead.example/x", "https://slow.example/x", "https://www.pastebin.com/x"]
+        assert registry.rank(urls)[0] == "https://www.pastebin.com/x"
+        assert registry.rank(urls)[-1] == "https://dead.example/x"
+
+        stats = {s["source"]: s for s in registry.snapshot()}
+        assert stats["pastebin.com"]["yield_rate"] == 1.0
+        assert stats["dead.example"]["error_rate"] == 1.0
+        assert stats["slow.example"]["latency_p50"] == 4.0
+
+    def test_sc_013_registry_persists_across_restarts(self, tmp_path):
+        """TC-SC-013: Statistics survive a save/load cycle"""
+        from scrapers.source_registry import SourceRegistry
+
+        path = str(tmp_path / "stats.json")
+        registry = SourceRegistry(path=path)
+        registry.record_request("https://paste.ee/r/a", 0.5, ok=True, nbytes=2048)
+        registry.record_hit("https://paste.ee/p/a", relevant=True)
+        registry.save()
+
+        restored = SourceRegistry(path=path).snapshot()[0]
+        assert restored["source"] == "paste.ee"
+        assert restored["bytes_per_hit"] == 2048
+        assert restored["latency_p50"] == 0.5
+
+    def test_sc_014_sources_endpoint(self):
+        """TC-SC-014: GET /api/sources exposes the statistics"""
+        response = client.get("/api/sources")
+
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+
+class TestTransport:
+    """Test suite for the shared HTTP transport"""
+
+    def test_sc_017_pools_and_dns_are_shared(self):
+        """TC-SC-017: Orchestrators share pooled connections but not sessions; lookups are cached"""
+        import socket
+        from scrapers.transport import DnsCache, build_adapters, build_session, get_session
+
+        first, second = DiscoveryOrchestrator(), DiscoveryOrchestrator()
+        assert first.session is not second.session
+        assert first.session.cookies is not second.session.cookies
+        assert first.session.get_adapter("https://pastebin.com/") is \
+            second.session.get_adapter("https://pastebin.com/")
+        assert TorScraper().session.get_adapter("https://x.onion/") is \
+            get_session("tor").get_adapter("https://x.onion/")
+        assert get_session("tor").proxies["https"].startswith("socks5h://")
+
+        session = build_session(adapters=build_adapters(pool_maxsize=24, pool_sizes={"pastebin.com": 64}))
+        assert session.get_adapter("https://pastebin.com/raw/a")._pool_maxsize == 64
+        assert session.get_adapter("https://paste.ee/r/a")._pool_maxsize == 24
+
+        # Only the pools resolve through the cache; the process-wide resolver is untouched
+        resolver = socket.getaddrinfo
+        cache = DnsCache(ttl=60)
+        session = build_session(adapters=build_adapters(pool_sizes={}, dns_cache=cache))
+        assert socket.getaddrinfo is resolver
+        pool = session.get_adapter("http://paste.example/").poolmanager.connection_from_url("http://paste.example:1/")
+        addresses = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 1))]
+        with patch("socket.getaddrinfo", return_value=addresses) as resolve:
+            for _ in range(3):
+                with pytest.raises(Exception, match="Failed to establish"):
+                    pool._new_conn().connect()
+        assert [c.args[0] for c in resolve.call_args_list].count("paste.example") == 1
+        assert (cache.hits, cache.misses) == (2, 1)
+
+
+class TestPasteSiteSimulator:
+    """Test suite for the load-test paste-site simulator"""
+
+    def test_sc_015_engine_scrapes_simulator(self):
+        """TC-SC-015: The engine parses simulator pages, raw bodies and profiles"""
+        import threading
+        from loadtest.paste_site import SiteConfig, serve, paste_author, paste_ids
+        from scrapers.discovery_engine import DiscoveryOrchestrator
+        from scrapers.source_registry import SourceRegistry
+
+        config = SiteConfig(body_min=2048, body_max=2048, leak_rate=1.0, pastes_per_user=3)
+        server = serve(port=0, config=config)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        paste_id = paste_ids("test", 1)[0]
+        try:
+            with patch('scrapers.discovery_engine.PASTEBIN_BASE_URL', base_url), \
+                 patch('scrapers.discovery_engine.REQUEST_DELAY', 0):
+                engine = DiscoveryOrchestrator(source_registry=SourceRegistry(path=None))
+                assert engine._get_raw_url(f"{base_url}/{paste_id}") == f"{base_url}/raw/{paste_id}"
+
+                result = engine.analyze_paste(f"{base_url}/{paste_id}")
+                assert result is not None
+                assert result['source'] == 'pastebin'
+                assert result['author'] == paste_author(paste_id, config)
+                assert result['has_credentials']
+
+                crawled = engine.crawl_user_pastes(result['author'])
+                assert len(crawled) == 3
+        finally:
+            server.shutdown()
+
+
 # ============================================================================
 # INTEGRATION TESTS - TC-INT-001 to TC-INT-005
 # ============================================================================
@@ -44,9 +44,13 @@ CREATE TABLE IF NOT EXISTS scan_results (
   emails TEXT[] DEFAULT ARRAY[]::TEXT[],
   target_emails TEXT[] DEFAULT ARRAY[]::TEXT[],
   timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  screenshot TEXT,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Evidence screenshot path (added after the first release)
+ALTER TABLE scan_results ADD COLUMN IF NOT EXISTS screenshot TEXT;
+
 -- Alerts Table
 CREATE TABLE IF NOT EXISTS alerts (
   id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),